@@ -104,10 +104,10 @@ class DemandForecaster:
         
         # Aggregate target variable
         if target_variable in data.columns:
-            aggregated = data.groupby("period")[target_variable].sum().reset_index()
+            aggregated = data.groupby("period", observed=True)[target_variable].sum().reset_index()
         else:
             # If target variable not found, use count as default
-            aggregated = data.groupby("period").size().reset_index(name=target_variable)
+            aggregated = data.groupby("period", observed=True).size().reset_index(name=target_variable)
         
         # Rename columns for consistency
         aggregated.columns = ["ds", "y"]
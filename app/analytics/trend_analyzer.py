@@ -61,7 +61,7 @@ class TrendAnalyzer:
         if dimension == "time":
             grouped_data = self._group_by_time(data, time_col)
         else:
-            grouped_data = data.groupby([time_col, dimension]).agg({
+            grouped_data = data.groupby([time_col, dimension], observed=True).agg({
                 "volume_ml": ["sum", "count", "mean"],
                 "donor_id": "nunique" if "donor_id" in data.columns else lambda x: len(x)
             }).reset_index()
@@ -105,7 +105,7 @@ class TrendAnalyzer:
     
     def _group_by_time(self, data: pd.DataFrame, time_col: pd.Series) -> pd.DataFrame:
         """Group data by time periods"""
-        return data.groupby(time_col).agg({
+        return data.groupby(time_col, observed=True).agg({
             "volume_ml": ["sum", "count", "mean"],
             "donor_id": "nunique" if "donor_id" in data.columns else lambda x: len(x)
         }).reset_index()
@@ -265,7 +265,7 @@ class TrendAnalyzer:
         
         if dimension == "blood_type" and "blood_type" in data.columns:
             # Find most and least common blood types
-            blood_type_counts = data.groupby("blood_type")["volume_ml"].sum() if "volume_ml" in data.columns else data.groupby("blood_type").size()
+            blood_type_counts = data.groupby("blood_type", observed=True)["volume_ml"].sum() if "volume_ml" in data.columns else data.groupby("blood_type", observed=True).size()
             if not blood_type_counts.empty:
                 most_common = blood_type_counts.idxmax()
                 least_common = blood_type_counts.idxmin()
@@ -274,20 +274,20 @@ class TrendAnalyzer:
         
         elif dimension == "age_group" and "age_group" in data.columns:
             # Age group analysis
-            age_group_counts = data.groupby("age_group")["volume_ml"].sum() if "volume_ml" in data.columns else data.groupby("age_group").size()
+            age_group_counts = data.groupby("age_group", observed=True)["volume_ml"].sum() if "volume_ml" in data.columns else data.groupby("age_group", observed=True).size()
             if not age_group_counts.empty:
                 top_age_group = age_group_counts.idxmax()
                 insights.append(f"Most active age group: {top_age_group}")
         
         elif dimension == "gender" and "gender" in data.columns:
             # Gender distribution
-            gender_counts = data.groupby("gender")["volume_ml"].sum() if "volume_ml" in data.columns else data.groupby("gender").size()
+            gender_counts = data.groupby("gender", observed=True)["volume_ml"].sum() if "volume_ml" in data.columns else data.groupby("gender", observed=True).size()
             if not gender_counts.empty:
                 insights.append(f"Gender distribution: {dict(gender_counts)}")
         
         elif dimension == "donation_type" and "donation_type" in data.columns:
             # Donation type analysis
-            type_counts = data.groupby("donation_type")["volume_ml"].sum() if "volume_ml" in data.columns else data.groupby("donation_type").size()
+            type_counts = data.groupby("donation_type", observed=True)["volume_ml"].sum() if "volume_ml" in data.columns else data.groupby("donation_type", observed=True).size()
             if not type_counts.empty:
                 popular_type = type_counts.idxmax()
                 insights.append(f"Most popular donation type: {popular_type}")
@@ -349,7 +349,7 @@ class TrendAnalyzer:
             return {"error": "donor_id column required for donor profiling"}
         
         # Aggregate donor data
-        donor_profiles = data.groupby("donor_id").agg({
+        donor_profiles = data.groupby("donor_id", observed=True).agg({
             "volume_ml": ["sum", "mean", "count"],
             "donation_date": ["min", "max"],
             "blood_type": "first",
@@ -2,25 +2,49 @@
 
 from __future__ import annotations
 
-import io
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from uuid import uuid4
 
 import pandas as pd
-from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi import BackgroundTasks, FastAPI, File, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from .analytics.trend_analyzer import TrendAnalyzer
 from .analytics.demand_forecaster import DemandForecaster
+from .config import Config
 from .data_processing.batch_processor import BatchDataProcessor
+from .data_processing.compaction import compact_dataframe, expand_dataframe
+from .data_processing.dataset_catalog import get_dataset_catalog
+from .data_processing.dataset_query import DatasetIndexes, frame_records, query_dataframe
+from .data_processing.dataset_store import DatasetStore, read_frame
+from .data_processing.dataset_versions import DATASET_VERSIONS, assemble_version, share_unchanged_columns
+from .data_processing.compression import detect_compression, detect_file_format, open_decompressed, read_decompressed
+from .data_processing.import_handlers import ColumnarImporter, close_http_session, dispose_engines
 from .data_mining.pattern_mining import PatternMiningEngine
 from .data_mining.association_analyzer import AssociationAnalyzer
+from .models.validation import ValidationFailureTable
 
 
-DATASETS: Dict[str, pd.DataFrame] = {}
+# Dataset versions in memory, keyed by _dataset_key; cold ones are reloaded from their catalog files
+DATASETS = DatasetStore()
+# Column indexes for /query, per dataset version and keyed like DATASETS
+INDEXES = DatasetIndexes()
+# Failure tables of recently processed datasets; all of them are kept in the catalog
+VALIDATION_FAILURES: "OrderedDict[str, ValidationFailureTable]" = OrderedDict()
+_VALIDATION_FAILURES_LOCK = threading.Lock()
+# Progress of the uploads this process is parsing; the parse status itself lives in the catalog
+UPLOADS: Dict[str, Dict[str, Any]] = {}
+_UPLOADS_LOCK = threading.Lock()
+
+# Version names accepted for backwards compatibility
+VERSION_ALIASES = {"processed": "transformed"}
+
+UPLOAD_FORMATS = ["csv", "tsv", "xlsx", "xls", "xlsm", "json", "jsonl", "ndjson", "parquet", "pq", "feather", "arrow", "ipc"]
 
 
 def _ensure_upload_dir() -> str:
@@ -41,14 +65,23 @@ app.add_middleware(
 )
 
 
+@app.on_event("shutdown")
+async def close_import_connections() -> None:
+    """Release the pooled database and HTTP connections shared by the importers"""
+    await close_http_session()
+    dispose_engines()
+
+
 class AnalyzeRequest(BaseModel):
     dataset_id: str
+    version: Optional[str] = None
     granularity: str = "monthly"
     time_period_days: int = 365
 
 
 class ForecastRequest(BaseModel):
     dataset_id: str
+    version: Optional[str] = None
     forecast_horizon_days: int = 30
     granularity: str = "daily"
     target_variable: str = "volume_ml"
@@ -57,111 +90,400 @@ class ForecastRequest(BaseModel):
 
 class MiningRequest(BaseModel):
     dataset_id: str
+    version: Optional[str] = None
     pattern_types: Optional[list[str]] = None
 
 
 class AssociationRequest(BaseModel):
     dataset_id: str
+    version: Optional[str] = None
     min_support: float = 0.1
     min_confidence: float = 0.7
     min_lift: float = 1.0
     algorithm: str = "apriori"
 
 
-@app.get("/api/v1/health")
-def health() -> Dict[str, Any]:
-    return {"status": "ok", "time": datetime.now().isoformat()}
+class QueryFilter(BaseModel):
+    column: str
+    op: str = "="
+    value: Any = None
 
 
-@app.post("/api/v1/datasets/upload")
-async def upload_dataset(file: UploadFile = File(...)) -> Dict[str, Any]:
-    """Upload CSV/Excel/JSON and register it as an in-memory dataset."""
-    filename = file.filename or "upload"
-    ext = filename.split(".")[-1].lower() if "." in filename else ""
+class QuerySort(BaseModel):
+    column: str
+    descending: bool = False
 
-    content = await file.read()
-    if not content:
-        raise HTTPException(status_code=400, detail="Empty file")
 
-    # Parse into DataFrame
-    try:
-        if ext in ("csv", "tsv"):
-            df = pd.read_csv(io.BytesIO(content))
-        elif ext in ("xlsx", "xls", "xlsm"):
-            df = pd.read_excel(io.BytesIO(content))
-        elif ext in ("json", "jsonl", "ndjson"):
-            df = pd.read_json(io.BytesIO(content), lines=ext in ("jsonl", "ndjson"))
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported file extension: {ext}")
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Failed to parse file: {str(e)}")
+class QueryRequest(BaseModel):
+    version: Optional[str] = None
+    columns: Optional[List[str]] = None
+    filters: List[QueryFilter] = []
+    sort: List[QuerySort] = []
+    limit: int = Field(100, ge=1, le=Config.QUERY_MAX_LIMIT)
+    cursor: Optional[str] = None
+
 
-    # Normalize column names
-    df.columns = [str(c).strip() for c in df.columns]
+@app.get("/api/v1/health")
+def health() -> Dict[str, Any]:
+    return {"status": "ok", "time": datetime.now().isoformat()}
 
+
+@app.post("/api/v1/datasets/upload")
+async def upload_dataset(background_tasks: BackgroundTasks, file: UploadFile = File(...)) -> Dict[str, Any]:
+    """Spool an upload to disk and parse it into an in-memory dataset in the background.
+
+    The body is written to the upload directory in chunks and rejected with
+    413 once it exceeds MAX_FILE_SIZE. The response is returned as soon as
+    the file is stored; poll the dataset endpoint until its status is ready.
+    """
+    filename = os.path.basename(file.filename or "upload") or "upload"
     dataset_id = str(uuid4())
-    DATASETS[dataset_id] = df
+    raw_path = os.path.join(_ensure_upload_dir(), f"{dataset_id}_{filename}")
 
-    # Persist the raw upload to disk (optional, for re-use)
-    upload_dir = _ensure_upload_dir()
-    raw_path = os.path.join(upload_dir, f"{dataset_id}_{filename}")
+    size = 0
     try:
         with open(raw_path, "wb") as f:
-            f.write(content)
-    except Exception:
-        pass
+            while True:
+                chunk = await file.read(Config.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > Config.MAX_FILE_SIZE:
+                    raise HTTPException(status_code=413,
+                                        detail=f"File exceeds the {Config.MAX_FILE_SIZE // (1024 * 1024)} MB upload limit")
+                f.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty file")
+
+        try:
+            file_format = detect_file_format(raw_path)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Failed to read file: {str(e)}")
+        if file_format not in UPLOAD_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Unsupported file extension: {file_format}")
+    except BaseException:
+        os.remove(raw_path)
+        raise
+    finally:
+        await file.close()
+
+    get_dataset_catalog().register(dataset_id, filename, file_format, upload_path=raw_path, size_bytes=size)
+    _start_parse(background_tasks, dataset_id, raw_path, file_format)
 
     return {
         "dataset_id": dataset_id,
         "filename": filename,
-        "rows": int(df.shape[0]),
-        "cols": int(df.shape[1]),
-        "columns": df.columns.tolist(),
+        "format": file_format,
+        "size_bytes": size,
+        "status": "parsing",
     }
 
 
+def _iter_upload_chunks(path: str, file_format: str) -> Iterator[pd.DataFrame]:
+    """Parse a spooled upload in row chunks; compressed files are decompressed as they are read"""
+    chunksize = Config.UPLOAD_PARSE_CHUNKSIZE
+    if file_format in ("csv", "tsv"):
+        with open_decompressed(path) as stream:
+            with pd.read_csv(stream, sep="\t" if file_format == "tsv" else ",", chunksize=chunksize) as reader:
+                yield from reader
+    elif file_format in ("jsonl", "ndjson"):
+        with open_decompressed(path) as stream:
+            with pd.read_json(stream, lines=True, chunksize=chunksize) as reader:
+                yield from reader
+    elif file_format == "json":
+        with open_decompressed(path) as stream:
+            yield pd.read_json(stream)
+    elif file_format in ("xlsx", "xls", "xlsm"):
+        # Workbooks need random access, so compressed ones are decompressed in memory
+        yield pd.read_excel(read_decompressed(path) if detect_compression(path) else path)
+    else:
+        yield from ColumnarImporter().iter_chunks(path, chunksize=chunksize)
+
+
+def _start_parse(background_tasks: BackgroundTasks, dataset_id: str, path: str, file_format: str) -> None:
+    with _UPLOADS_LOCK:
+        UPLOADS[dataset_id] = {"rows_parsed": 0}
+    background_tasks.add_task(_parse_upload, dataset_id, path, file_format)
+
+
+def _parse_upload(dataset_id: str, path: str, file_format: str) -> None:
+    """Background task: parse a spooled upload and register it as the dataset's raw version"""
+    catalog = get_dataset_catalog()
+    progress = UPLOADS[dataset_id]
+    try:
+        chunks = []
+        for chunk in _iter_upload_chunks(path, file_format):
+            chunks.append(chunk)
+            progress["rows_parsed"] += len(chunk)
+        df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+        del chunks
+
+        # Normalize column names
+        df.columns = [str(c).strip() for c in df.columns]
+        _register_version(dataset_id, "raw", df)
+        catalog.set_status(dataset_id, "ready")
+    except Exception as e:
+        catalog.set_status(dataset_id, "failed", error=f"Failed to parse file: {str(e)}")
+    finally:
+        with _UPLOADS_LOCK:
+            UPLOADS.pop(dataset_id, None)
+
+
+def _dataset_key(dataset_id: str, version: str) -> str:
+    return f"{dataset_id}@{version}"
+
+
+def _register_version(dataset_id: str, version: str, df: pd.DataFrame, parent: Optional[str] = None,
+                      make_current: bool = True) -> Dict[str, Any]:
+    """Compact a dataset version, persist it to the catalog and keep it in memory; returns the compaction report
+
+    Columns left unchanged from the ``parent`` version share its buffers,
+    in memory and on disk, instead of being stored again.
+    """
+    df, compaction = compact_dataframe(df)
+    inherited = []
+    if parent is not None:
+        df, inherited = share_unchanged_columns(df, _require_dataset(dataset_id, parent))
+    record = get_dataset_catalog().save_version(dataset_id, version, df, make_current=make_current,
+                                                compaction=compaction, parent_version=parent,
+                                                inherited_columns=inherited)
+    DATASETS.store(_dataset_key(dataset_id, version), df, source=_version_loader(dataset_id, record))
+    if _analysis_key(dataset_id, version) in DATASETS:
+        del DATASETS[_analysis_key(dataset_id, version)]
+    INDEXES.discard(_dataset_key(dataset_id, version))
+    return {**compaction, "shared_columns": inherited}
+
+
+def _version_loader(dataset_id: str, record: Dict[str, Any]) -> Any:
+    """How to load a catalog version: its own file, plus the parent's columns it inherits"""
+    if not record["parent_version"]:
+        return record["data_path"]
+
+    def load() -> pd.DataFrame:
+        parent = _require_dataset(dataset_id, record["parent_version"])
+        return assemble_version(parent, read_frame(record["data_path"]), record["columns"], record["inherited_columns"])
+
+    return load
+
+
+def _memory_report(compaction: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if compaction is None:
+        return None
+    return {key: compaction[key] for key in ("bytes_before", "bytes_after", "bytes_saved", "compression_ratio")
+            if key in compaction}
+
+
+def _require_dataset(dataset_id: str, version: Optional[str] = None) -> pd.DataFrame:
+    """A dataset version (the current one by default), loaded from the catalog on first access
+
+    Versions are raw, cleaned and transformed (see DATASET_VERSIONS). Raises
+    409 while the upload is still parsing and 422 if parsing failed.
+    """
+    record = _require_version_record(dataset_id, version)
+    key = _dataset_key(dataset_id, record["version"])
+    if key not in DATASETS:
+        DATASETS.attach(key, _version_loader(dataset_id, record))
+    return DATASETS[key]
+
+
+def _require_analysis_dataset(dataset_id: str, version: Optional[str] = None) -> pd.DataFrame:
+    """A dataset version for the analytics engines, kept in DATASETS next to the version itself
+
+    Categoricals stay categorical without their unused vocabulary
+    categories, and narrowed numbers get back their original width (see
+    expand_dataframe), so results match the uncompacted data at a fraction
+    of its memory. The engines add and replace columns of the frame they
+    get, so each call gets its own shallow copy.
+    """
+    record = _require_version_record(dataset_id, version)
+    key = _analysis_key(dataset_id, record["version"])
+    if key not in DATASETS:
+        def load() -> pd.DataFrame:
+            return expand_dataframe(_require_dataset(dataset_id, record["version"]),
+                                    dtypes=_compacted_dtypes(record), keep_categoricals=True)
+
+        DATASETS.attach(key, load)
+    return DATASETS[key].copy(deep=False)
+
+
+def _require_expanded_dataset(dataset_id: str, version: Optional[str] = None) -> pd.DataFrame:
+    """A dataset version with compaction fully undone, for the processing pipeline
+
+    The pipeline assigns values outside a column's categories and relies on
+    the original dtypes. The frame is built for each run and not cached.
+    """
+    record = _require_version_record(dataset_id, version)
+    return expand_dataframe(_require_dataset(dataset_id, record["version"]), dtypes=_compacted_dtypes(record))
+
+
+def _compacted_dtypes(record: Dict[str, Any]) -> Dict[str, str]:
+    """Original dtypes of the columns compact_dataframe changed in a version"""
+    return {column: change["from"] for column, change in ((record["compaction"] or {}).get("columns", {})).items()}
+
+
+def _analysis_key(dataset_id: str, version: str) -> str:
+    return f"{_dataset_key(dataset_id, version)}#analysis"
+
+
+def _require_version_record(dataset_id: str, version: Optional[str] = None) -> Dict[str, Any]:
+    """Catalog record of a ready dataset's version, with the same errors as _require_dataset"""
+    catalog = get_dataset_catalog()
+    entry = catalog.get(dataset_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    if entry["status"] == "parsing":
+        raise HTTPException(status_code=409, detail="Dataset is still being parsed")
+    if entry["status"] == "failed":
+        raise HTTPException(status_code=422, detail=entry["error"])
+
+    record = catalog.get_version(dataset_id, version)
+    if record is None and version in VERSION_ALIASES:
+        record = catalog.get_version(dataset_id, VERSION_ALIASES[version])
+    if record is None:
+        if version is not None and version not in DATASET_VERSIONS and version not in VERSION_ALIASES:
+            raise HTTPException(status_code=400, detail=f"Unknown dataset version: {version}. Versions: {DATASET_VERSIONS}")
+        raise HTTPException(status_code=404, detail=f"Dataset version not found: {version or entry['current_version']}")
+    return record
+
+
 @app.get("/api/v1/datasets/{dataset_id}")
-def get_dataset_info(dataset_id: str) -> Dict[str, Any]:
-    df = DATASETS.get(dataset_id)
-    if df is None:
+def get_dataset_info(dataset_id: str, background_tasks: BackgroundTasks, version: Optional[str] = None) -> Dict[str, Any]:
+    entry = get_dataset_catalog().get(dataset_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
+    if entry["status"] != "ready":
+        progress = UPLOADS.get(dataset_id)
+        if entry["status"] == "parsing" and progress is None and entry["upload_path"] and os.path.exists(entry["upload_path"]):
+            # The parse was interrupted by a restart; start it again from the spooled file
+            _start_parse(background_tasks, dataset_id, entry["upload_path"], entry["format"])
+            progress = UPLOADS.get(dataset_id)
+        return {
+            "dataset_id": dataset_id,
+            "filename": entry["filename"],
+            "status": entry["status"],
+            "rows_parsed": progress["rows_parsed"] if progress else 0,
+            "error": entry["error"],
+        }
+
+    df = _require_dataset(dataset_id, version)
+    versions = get_dataset_catalog().list_versions(dataset_id)
+    version = VERSION_ALIASES.get(version, version) or entry["current_version"]
+    current = next((record for record in versions if record["version"] == version), None)
     return {
         "dataset_id": dataset_id,
+        "filename": entry["filename"],
+        "status": "ready",
+        "version": version,
+        "current_version": entry["current_version"],
+        "versions": [record["version"] for record in versions],
+        "shared_columns": current["inherited_columns"] if current else [],
+        "memory": _memory_report(current["compaction"]) if current else None,
         "rows": int(df.shape[0]),
         "cols": int(df.shape[1]),
         "columns": df.columns.tolist(),
-        "preview": df.head(20).to_dict(orient="records"),
+        "preview": frame_records(df.head(20)),
     }
 
 
+@app.post("/api/v1/datasets/{dataset_id}/query")
+def query_dataset(dataset_id: str, req: QueryRequest) -> Dict[str, Any]:
+    """Filter, project, sort and page through a dataset version on the server
+
+    Pass the returned ``next_cursor`` back with the same query for the next
+    page. Filters and sorts on INDEXED_COLUMNS use indexes built on first use.
+    """
+    df = _require_dataset(dataset_id, req.version)
+    version = VERSION_ALIASES.get(req.version, req.version) or get_dataset_catalog().get(dataset_id)["current_version"]
+    try:
+        page = query_dataframe(df, columns=req.columns,
+                               filters=[(f.column, f.op, f.value) for f in req.filters],
+                               sort=[(s.column, s.descending) for s in req.sort],
+                               limit=req.limit, cursor=req.cursor,
+                               indexes=INDEXES, index_key=_dataset_key(dataset_id, version))
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"dataset_id": dataset_id, "version": version, **page}
+
+
 @app.post("/api/v1/process")
 async def process_dataset(payload: Dict[str, Any]) -> Dict[str, Any]:
     dataset_id = payload.get("dataset_id")
     if not dataset_id:
         raise HTTPException(status_code=400, detail="dataset_id is required")
 
-    df = DATASETS.get(dataset_id)
-    if df is None:
-        raise HTTPException(status_code=404, detail="Dataset not found")
+    # Always from the raw upload, so processing twice does not clean already processed data
+    df = _require_expanded_dataset(dataset_id, "raw")
 
     processor = BatchDataProcessor()
-    processed_df, stats = await processor._process_dataset(df)  # uses cleaner/transformer/validator
-    DATASETS[dataset_id] = processed_df
+    # Columnar validation keeps only failures, so the response stays small for large datasets
+    processed_df, stats = await processor._process_dataset(df, {"validation_mode": "columnar", "keep_stage_outputs": True})
+    del df
+
+    memory = {}
+    cleaned_df = processor.last_stage_outputs.pop("cleaned", None)
+    if cleaned_df is not None:
+        memory["cleaned"] = _memory_report(_register_version(dataset_id, "cleaned", cleaned_df, parent="raw",
+                                                             make_current=False))
+        del cleaned_df
+    memory["transformed"] = _memory_report(_register_version(dataset_id, "transformed", processed_df,
+                                                             parent="cleaned" if "cleaned" in memory else "raw"))
+    # Replaces (or clears) the failures of any earlier run
+    failures = processor.last_validation_result.failures if processor.last_validation_result is not None else None
+    get_dataset_catalog().save_validation_failures(dataset_id, "transformed", failures)
+    _cache_validation_failures(dataset_id, failures)
 
     return {
         "dataset_id": dataset_id,
         "final_rows": int(processed_df.shape[0]),
         "final_cols": int(processed_df.shape[1]),
         "stats": stats,
+        "versions": list(memory),
+        "memory": memory,
     }
 
 
+@app.get("/api/v1/datasets/{dataset_id}/validation/failures")
+def get_validation_failures(dataset_id: str, offset: int = 0, limit: int = 100,
+                            rule_name: Optional[str] = None) -> Dict[str, Any]:
+    """Page through the validation failures recorded by the last /process run."""
+    failures = _validation_failures(dataset_id)
+    if failures is None:
+        raise HTTPException(status_code=404, detail="No validation results for dataset")
+
+    page = failures.page(offset=max(offset, 0), limit=min(max(limit, 1), 1000), rule_name=rule_name)
+    return {"dataset_id": dataset_id, **page}
+
+
+def _validation_failures(dataset_id: str) -> Optional[ValidationFailureTable]:
+    """The failures of the last /process run, from memory or else from the catalog"""
+    with _VALIDATION_FAILURES_LOCK:
+        if dataset_id in VALIDATION_FAILURES:
+            VALIDATION_FAILURES.move_to_end(dataset_id)
+            return VALIDATION_FAILURES[dataset_id]
+
+    record = get_dataset_catalog().get_validation_failures(dataset_id, "transformed")
+    if record is None:
+        return None
+    # Failures point at rows of the transformed version they were found in
+    index = _require_dataset(dataset_id, "transformed").index
+    failures = ValidationFailureTable.from_frame(record["rules"], read_frame(record["data_path"]), index)
+    _cache_validation_failures(dataset_id, failures)
+    return failures
+
+
+def _cache_validation_failures(dataset_id: str, failures: Optional[ValidationFailureTable]) -> None:
+    with _VALIDATION_FAILURES_LOCK:
+        VALIDATION_FAILURES.pop(dataset_id, None)
+        if failures is not None:
+            VALIDATION_FAILURES[dataset_id] = failures
+        while len(VALIDATION_FAILURES) > Config.VALIDATION_FAILURE_CACHE_SIZE:
+            VALIDATION_FAILURES.popitem(last=False)
+
+
 @app.post("/api/v1/analyze/trends")
 def analyze_trends(req: AnalyzeRequest) -> Dict[str, Any]:
-    df = DATASETS.get(req.dataset_id)
-    if df is None:
-        raise HTTPException(status_code=404, detail="Dataset not found")
+    df = _require_analysis_dataset(req.dataset_id, req.version)
 
     analyzer = TrendAnalyzer()
     results = analyzer.analyze_donation_trends(
@@ -178,9 +500,7 @@ def analyze_trends(req: AnalyzeRequest) -> Dict[str, Any]:
 
 @app.post("/api/v1/analyze/forecast")
 def analyze_forecast(req: ForecastRequest) -> Dict[str, Any]:
-    df = DATASETS.get(req.dataset_id)
-    if df is None:
-        raise HTTPException(status_code=404, detail="Dataset not found")
+    df = _require_analysis_dataset(req.dataset_id, req.version)
 
     forecaster = DemandForecaster()
     forecasts = forecaster.forecast_demand(
@@ -200,9 +520,7 @@ def analyze_forecast(req: ForecastRequest) -> Dict[str, Any]:
 
 @app.post("/api/v1/mine/patterns")
 def mine_patterns(req: MiningRequest) -> Dict[str, Any]:
-    df = DATASETS.get(req.dataset_id)
-    if df is None:
-        raise HTTPException(status_code=404, detail="Dataset not found")
+    df = _require_analysis_dataset(req.dataset_id, req.version)
 
     engine = PatternMiningEngine()
     results = engine.discover_donor_patterns(df, pattern_types=req.pattern_types)
@@ -212,9 +530,7 @@ def mine_patterns(req: MiningRequest) -> Dict[str, Any]:
 
 @app.post("/api/v1/mine/associations")
 def mine_associations(req: AssociationRequest) -> Dict[str, Any]:
-    df = DATASETS.get(req.dataset_id)
-    if df is None:
-        raise HTTPException(status_code=404, detail="Dataset not found")
+    df = _require_analysis_dataset(req.dataset_id, req.version)
 
     analyzer = AssociationAnalyzer()
     results = analyzer.discover_association_rules(
@@ -11,7 +11,7 @@ class Config:
     
     # Data processing settings
     MAX_BATCH_SIZE = 1000000  # 1 million records per batch
-    SUPPORTED_FORMATS = ["csv", "excel", "json", "sql", "api"]
+    SUPPORTED_FORMATS = ["csv", "excel", "json", "sql", "api", "parquet", "feather"]
     
     # Blood type standards
     BLOOD_TYPES = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
@@ -37,6 +37,38 @@ class Config:
     # File upload settings
     UPLOAD_FOLDER = "uploads"
     MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # bytes read from the request per write
+    UPLOAD_PARSE_CHUNKSIZE = 50000  # rows parsed per chunk from the spooled file
+    
+    # In-memory dataset store settings
+    DATASET_MEMORY_BUDGET_MB = int(os.getenv("DATASET_MEMORY_BUDGET_MB", "1024"))
+    DATASET_SPILL_DIR = os.getenv("DATASET_SPILL_DIR", os.path.join(UPLOAD_FOLDER, "spill"))
+    DATASET_CATALOG_PATH = os.getenv("DATASET_CATALOG_PATH", os.path.join(UPLOAD_FOLDER, "catalog.sqlite3"))
+    DATASET_DATA_DIR = os.getenv("DATASET_DATA_DIR", os.path.join(UPLOAD_FOLDER, "datasets"))
+    VALIDATION_FAILURE_CACHE_SIZE = 16  # datasets whose failure tables stay in memory; the catalog keeps the rest
+    
+    # Dataset query settings
+    QUERY_MAX_LIMIT = 1000  # rows per page of /datasets/{id}/query
+    QUERY_INDEX_CACHE_VERSIONS = int(os.getenv("QUERY_INDEX_CACHE_VERSIONS", "16"))  # dataset versions with column indexes kept
+    
+    # Import schema inference settings
+    SCHEMA_SAMPLE_ROWS = 10000
+    SCHEMA_CACHE_PATH = os.getenv("SCHEMA_CACHE_PATH")  # JSON file the schema cache persists to; unset keeps it in memory
+    SCHEMA_CACHE_MAX_ENTRIES = int(os.getenv("SCHEMA_CACHE_MAX_ENTRIES", "500"))  # most recently used source/header schemas kept
+    
+    # Incremental import settings
+    WATERMARK_STORE_PATH = os.getenv("WATERMARK_STORE_PATH", os.path.join(UPLOAD_FOLDER, "watermarks.json"))
+    
+    # API import settings
+    API_MAX_CONCURRENCY = 8
+    API_CONNECTION_LIMIT = 32
+    API_MAX_RETRIES = 3
+    API_BACKOFF_SECONDS = 0.5
+    
+    # Multi-file ingestion settings
+    MULTI_FILE_MEMORY_BUDGET_MB = int(os.getenv("MULTI_FILE_MEMORY_BUDGET_MB", "2048"))
+    FILE_MEMORY_EXPANSION = 5  # in-memory DataFrame size per byte of uncompressed input
+    COMPRESSED_FILE_EXPANSION = 5  # assumed decompression ratio of compressed inputs
     
     @classmethod
     def get_validation_rules(cls) -> Dict[str, Any]:
@@ -6,16 +6,23 @@ from .batch_processor import BatchDataProcessor
 from .data_cleaner import DataCleaner
 from .data_transformer import DataTransformer
 from .data_validator import DataValidator
-from .import_handlers import CSVImporter, ExcelImporter, JSONImporter, SQLImporter, APIImporter
+from .dataset_catalog import DatasetCatalog
+from .dataset_query import DatasetIndexes
+from .dataset_store import DatasetStore
+from .import_handlers import CSVImporter, ExcelImporter, JSONImporter, SQLImporter, APIImporter, ColumnarImporter
 
 __all__ = [
     "BatchDataProcessor",
     "DataCleaner", 
     "DataTransformer",
     "DataValidator",
+    "DatasetCatalog",
+    "DatasetIndexes",
+    "DatasetStore",
     "CSVImporter",
     "ExcelImporter", 
     "JSONImporter",
     "SQLImporter",
-    "APIImporter"
+    "APIImporter",
+    "ColumnarImporter"
 ]
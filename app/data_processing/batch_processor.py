@@ -5,31 +5,65 @@ Batch data processing engine for blood domain
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Dict, List, Any, Optional, Tuple, Union, Iterable, Iterator, AsyncIterator
 import logging
 from pathlib import Path
 import asyncio
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
+from collections import deque
+import multiprocessing
+import os
+import pickle
 import json
 
+# Arrow IPC for low-overhead chunk transfer to worker processes
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 from .data_cleaner import DataCleaner
 from .data_transformer import DataTransformer
 from .data_validator import DataValidator
+from .category_vocabulary import CategoryVocabulary
+from .compression import detect_compression, detect_file_format
+from .dedup_index import DuplicateKeyIndex
+from .global_statistics import GlobalStatistics, collect_global_statistics
 from .import_handlers import ImportHandlerFactory
+from .stage_memory import StageMemoryTracker, track_stage
+from .streaming_export import StreamingExporter, merge_streaming_output
+from .watermarks import get_watermark_store
 from ..models.donor import BatchDonationData
 from ..models.validation import BatchValidationResult
 from ..config import Config
 
+EXECUTOR_BACKENDS = ["thread", "process"]
+
 class BatchDataProcessor:
     """High-performance batch data processing engine"""
     
-    def __init__(self, max_workers: int = 4, batch_size: int = 10000):
+    def __init__(self, max_workers: Optional[int] = None, batch_size: int = 10000, executor_backend: str = "thread"):
+        if executor_backend not in EXECUTOR_BACKENDS:
+            raise ValueError(f"Unsupported executor backend: {executor_backend}. Supported backends: {EXECUTOR_BACKENDS}")
+        
+        # Threads share the GIL, so only the process backend defaults to every core
+        if max_workers is None:
+            max_workers = (os.cpu_count() or 1) if executor_backend == "process" else 4
+        
         self.max_workers = max_workers
         self.batch_size = batch_size
+        self.executor_backend = executor_backend
         self.cleaner = DataCleaner()
         self.transformer = DataTransformer()
         self.validator = DataValidator()
         self.import_factory = ImportHandlerFactory()
+        self.last_validation_result: Optional[BatchValidationResult] = None
+        # Intermediate frames of the last single-frame run with "keep_stage_outputs", by stage ("cleaned")
+        self.last_stage_outputs: Dict[str, pd.DataFrame] = {}
+        # Shared by every chunk and every load of this processor when cross_chunk_dedup is enabled
+        self.dedup_index: Optional[DuplicateKeyIndex] = None
+        self.last_dedup_stats: Optional[Dict[str, Any]] = None
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
@@ -51,7 +85,7 @@ class BatchDataProcessor:
         try:
             # Determine file format if not specified
             if file_format is None:
-                file_format = Path(file_path).suffix.lower().replace(".", "")
+                file_format = detect_file_format(file_path)
             
             # Import data
             self.logger.info(f"Importing data from {file_path}")
@@ -94,30 +128,131 @@ class BatchDataProcessor:
             }
     
     async def process_multiple_files(self, file_paths: List[str], 
-                                   processing_options: Dict[str, Any] = None) -> List[Dict[str, Any]]:
-        """Process multiple files concurrently"""
-        tasks = []
-        
-        for file_path in file_paths:
-            task = self.process_batch_file(file_path, processing_options=processing_options)
-            tasks.append(task)
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Convert exceptions to error results
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append({
-                    "success": False,
-                    "file_path": file_paths[i],
-                    "error": str(result),
-                    "processed_at": datetime.now().isoformat()
-                })
-            else:
-                processed_results.append(result)
+                                   processing_options: Dict[str, Any] = None,
+                                   memory_budget_mb: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Process multiple files in parallel on the executor backend; results are in input order"""
+        results = {}
+        async for result in self.iter_multiple_files(file_paths, processing_options, memory_budget_mb):
+            results[result["file_index"]] = result
+        return [results[i] for i in range(len(file_paths))]
+    
+    async def iter_multiple_files(self, file_paths: List[str], 
+                                  processing_options: Dict[str, Any] = None,
+                                  memory_budget_mb: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Process files in parallel and yield each file's result as soon as it finishes
+        
+        Files run on worker processes with the process backend and on threads
+        with the thread backend. They are scheduled largest first, sized by
+        their bytes on disk. A file is only started while the estimated
+        in-memory size of the files in flight stays within ``memory_budget_mb``
+        (Config.MULTI_FILE_MEMORY_BUDGET_MB by default); a file larger than the
+        whole budget runs on its own. Every result carries ``file_index``, its
+        position in ``file_paths``.
+        
+        With ``cross_chunk_dedup`` this processor's index is the only one
+        written. Threads share it, so duplicates across files are dropped
+        from whichever file is processed later. Worker processes start from
+        a copy of it, drop keys seen before the run or earlier in the same
+        worker, and send back the keys they added, which are merged into it;
+        it is saved once all files are done.
+        """
+        budget = (memory_budget_mb or Config.MULTI_FILE_MEMORY_BUDGET_MB) * 1024 * 1024
+        queue = deque(sorted(((index, path, self._estimate_file_memory(path)) for index, path in enumerate(file_paths)),
+                             key=lambda item: item[2], reverse=True))
+        if not queue:
+            return
+        
+        loop = asyncio.get_running_loop()
+        max_workers = min(self.max_workers, len(queue))
+        self.logger.info(f"Processing {len(queue)} files on {max_workers} worker "
+                         f"{'processes' if self.executor_backend == 'process' else 'threads'} "
+                         f"(memory budget {budget / (1024 * 1024):.0f} MB)")
         
-        return processed_results
+        # Written once here, so workers only ever read the vocabulary file
+        self._prepare_category_vocabulary(processing_options)
+        dedup_index = self._get_dedup_index(processing_options)
+        worker_options = self._concurrent_pipeline_options(processing_options, max_workers)
+        if dedup_index is not None:
+            # Workers never save the index; their keys are merged into this processor's one
+            worker_options = {**worker_options, "dedup_index_path": None}
+        
+        running = {}
+        in_flight_bytes = 0
+        with self._create_file_executor(max_workers, dedup_index) as executor:
+            while queue or running:
+                # Start the largest file that fits; with nothing running the next file always starts
+                while queue and len(running) < max_workers:
+                    fitting = next((item for item in queue if in_flight_bytes + item[2] <= budget), None)
+                    if fitting is None:
+                        if running:
+                            break
+                        fitting = queue[0]
+                    queue.remove(fitting)
+                    index, path, estimate = fitting
+                    if self.executor_backend == "process":
+                        future = loop.run_in_executor(executor, _process_file_in_worker, path, worker_options)
+                    else:
+                        future = loop.run_in_executor(executor, self._process_file_in_thread, path, worker_options)
+                    running[future] = fitting
+                    in_flight_bytes += estimate
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    index, path, estimate = running.pop(future)
+                    in_flight_bytes -= estimate
+                    try:
+                        result = future.result()
+                        added_keys = result.pop("dedup_added_keys", None)
+                        if added_keys is not None:
+                            dedup_index.add(added_keys)
+                    except Exception as e:
+                        self.logger.error(f"Error processing batch file {path}: {str(e)}")
+                        result = {
+                            "success": False,
+                            "file_path": path,
+                            "error": str(e),
+                            "processed_at": datetime.now().isoformat()
+                        }
+                    self._update_global_stats(result)
+                    result["file_index"] = index
+                    result["estimated_memory_mb"] = estimate / (1024 * 1024)
+                    yield result
+        
+        if dedup_index is not None:
+            self._save_dedup_index(processing_options)
+    
+    def _create_file_executor(self, max_workers: int,
+                              dedup_index: Optional[DuplicateKeyIndex]) -> Union[ThreadPoolExecutor, ProcessPoolExecutor]:
+        """Executor for whole files: worker processes get copies of the components and the dedup index"""
+        if self.executor_backend == "process":
+            return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                                       initializer=_init_chunk_worker,
+                                       initargs=(self.cleaner, self.transformer, self.validator, self.batch_size,
+                                                 dedup_index))
+        return ThreadPoolExecutor(max_workers=max_workers)
+    
+    def _process_file_in_thread(self, file_path: str, processing_options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Import and process one whole file on a pool thread
+        
+        Each file gets its own processor, so per-run state does not mix,
+        sharing this one's components and dedup index.
+        """
+        processor = BatchDataProcessor(max_workers=1, batch_size=self.batch_size)
+        processor.cleaner = self.cleaner
+        processor.transformer = self.transformer
+        processor.validator = self.validator
+        processor.dedup_index = self.dedup_index
+        return asyncio.run(processor.process_batch_file(file_path, processing_options=processing_options))
+    
+    def _estimate_file_memory(self, file_path: str) -> int:
+        """Rough in-memory size of a file once imported, from its size on disk"""
+        try:
+            size = Path(file_path).stat().st_size
+        except OSError:
+            return 0
+        if detect_compression(file_path):
+            size *= Config.COMPRESSED_FILE_EXPANSION
+        return size * Config.FILE_MEMORY_EXPANSION
     
     async def _import_data(self, file_path: str, file_format: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Import data using appropriate handler"""
@@ -127,11 +262,28 @@ class BatchDataProcessor:
     async def _process_dataset(self, data: pd.DataFrame, 
                             processing_options: Dict[str, Any] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Process a dataset with all cleaning, transformation, and validation steps"""
+        self._prepare_category_vocabulary(processing_options)
+        dedup_index = self._get_dedup_index(processing_options)
+        if dedup_index is None:
+            return self._run_pipeline(data, processing_options)
+        
+        data, dedup_stats = dedup_index.deduplicate(data)
+        self._save_dedup_index(processing_options)
+        self.last_dedup_stats = {**dedup_stats, "index": dedup_index.summary()}
+        
+        processed_data, processing_stats = self._run_pipeline(data, processing_options)
+        processing_stats["cross_chunk_deduplication"] = self.last_dedup_stats
+        return processed_data, processing_stats
+    
+    def _run_pipeline(self, data: pd.DataFrame, 
+                      processing_options: Dict[str, Any] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Synchronous cleaning, transformation and validation of one dataset or chunk"""
         if processing_options is None:
             processing_options = {
                 "clean_data": True,
                 "transform_data": True,
                 "validate_data": True,
+                "validation_mode": "row",
                 "generate_reports": True
             }
         
@@ -142,13 +294,29 @@ class BatchDataProcessor:
             "data_quality_score": 0
         }
         
-        current_data = data.copy()
+        # Ownership transfer: with "inplace" the caller hands the frame over and stages modify it
+        # instead of copying. Otherwise the first stage copies once and later stages own that copy.
+        owns_data = processing_options.get("inplace", False)
+        memory_tracker = StageMemoryTracker() if processing_options.get("memory_report", False) else None
+        current_data = data
+        
+        # Two-pass mode: cleaning and normalization use frozen dataset-wide statistics
+        statistics = processing_options.get("global_statistics")
+        if statistics is None and processing_options.get("two_pass", False):
+            statistics = self._collect_statistics([data])
         
         # Step 1: Data Cleaning
         if processing_options.get("clean_data", True):
             self.logger.info("Starting data cleaning...")
-            cleaned_data, cleaning_stats = self.cleaner.clean_dataset(current_data)
+            with track_stage(memory_tracker, "data_cleaning"):
+                cleaned_data, cleaning_stats = self.cleaner.clean_dataset(
+                    current_data, statistics=statistics, inplace=owns_data, memory_tracker=memory_tracker)
             current_data = cleaned_data
+            owns_data = True
+            if processing_options.get("keep_stage_outputs", False):
+                # Handed to the caller, so the next stage has to copy it instead of modifying it
+                self.last_stage_outputs = {"cleaned": cleaned_data}
+                owns_data = False
             processing_stats["steps_completed"].append("data_cleaning")
             processing_stats["records_at_each_step"]["after_cleaning"] = len(current_data)
             processing_stats["cleaning_stats"] = cleaning_stats
@@ -156,8 +324,12 @@ class BatchDataProcessor:
         # Step 2: Data Transformation
         if processing_options.get("transform_data", True):
             self.logger.info("Starting data transformation...")
-            transformed_data, transformation_stats = self.transformer.transform_dataset(current_data)
+            with track_stage(memory_tracker, "data_transformation"):
+                transformed_data, transformation_stats = self.transformer.transform_dataset(
+                    current_data, processing_options.get("transformation_options"),
+                    statistics=statistics, inplace=owns_data, memory_tracker=memory_tracker)
             current_data = transformed_data
+            owns_data = True
             processing_stats["steps_completed"].append("data_transformation")
             processing_stats["records_at_each_step"]["after_transformation"] = len(current_data)
             processing_stats["transformation_stats"] = transformation_stats
@@ -166,10 +338,22 @@ class BatchDataProcessor:
         if processing_options.get("validate_data", True):
             self.logger.info("Starting data validation...")
             batch_id = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            validation_result = self.validator.validate_batch(current_data, batch_id)
+            validation_mode = processing_options.get("validation_mode", "row")
+            with track_stage(memory_tracker, "data_validation"):
+                validation_result = self.validator.validate_batch(current_data, batch_id, mode=validation_mode)
             processing_stats["steps_completed"].append("data_validation")
             processing_stats["validation_results"] = validation_result.dict()
-            processing_stats["data_quality_score"] = self.validator.get_quality_metrics(validation_result.validation_results).get("overall_score", 0)
+            if validation_result.failures is not None:
+                processing_stats["validation_failures"] = validation_result.failures.summary()
+            self.last_validation_result = validation_result
+            processing_stats["data_quality_score"] = self.validator.get_batch_quality_metrics(validation_result).get("overall_score", 0)
+        
+        if not owns_data:
+            # No stage ran (or the last one's output was kept), so the result is not ours to return yet
+            current_data = current_data.copy()
+        
+        if memory_tracker is not None:
+            processing_stats["memory_report"] = memory_tracker.report()
         
         # Step 4: Generate processing reports
         if processing_options.get("generate_reports", True):
@@ -180,52 +364,332 @@ class BatchDataProcessor:
     async def _process_large_dataset(self, data: pd.DataFrame, 
                                    processing_options: Dict[str, Any] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Process large dataset in chunks"""
-        self.logger.info(f"Processing large dataset with {len(data)} records in chunks of {self.batch_size}")
+        self.logger.info(f"Processing large dataset with {len(data)} records in chunks of {self.batch_size} "
+                         f"({self.executor_backend} backend, {self.max_workers} workers)")
+        
+        chunks = (data[i:i + self.batch_size] for i in range(0, len(data), self.batch_size))
+        
+        statistics = None
+        if processing_options and processing_options.get("two_pass", False):
+            # First pass: freeze dataset-wide statistics so every chunk is cleaned the same way
+            statistics = self._collect_statistics(data[i:i + self.batch_size] for i in range(0, len(data), self.batch_size))
+            processing_options = {**processing_options, "global_statistics": statistics}
         
-        chunks = [data[i:i + self.batch_size] for i in range(0, len(data), self.batch_size)]
         processed_chunks = []
         chunk_stats = []
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all chunks for processing
-            future_to_chunk = {
-                executor.submit(self._process_chunk_sync, chunk, processing_options): i 
-                for i, chunk in enumerate(chunks)
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_chunk):
-                chunk_idx = future_to_chunk[future]
-                try:
-                    processed_chunk, stats = future.result()
-                    processed_chunks.append(processed_chunk)
-                    chunk_stats.append(stats)
-                except Exception as e:
-                    self.logger.error(f"Error processing chunk {chunk_idx}: {str(e)}")
-                    # Add original chunk if processing failed
-                    processed_chunks.append(chunks[chunk_idx])
-                    chunk_stats.append({"error": str(e)})
+        for processed_chunk, stats in self._iter_processed_chunks(chunks, processing_options):
+            processed_chunks.append(processed_chunk)
+            chunk_stats.append(stats)
         
         # Combine all processed chunks
-        final_data = pd.concat(processed_chunks, ignore_index=True)
+        final_data = pd.concat(processed_chunks, ignore_index=True) if processed_chunks else data.iloc[0:0]
         
         # Aggregate statistics
         aggregated_stats = self._aggregate_chunk_stats(chunk_stats)
-        aggregated_stats["chunks_processed"] = len(chunks)
+        self._add_dedup_stats(aggregated_stats, processing_options)
+        aggregated_stats["chunks_processed"] = len(chunk_stats)
         aggregated_stats["chunk_size"] = self.batch_size
+        aggregated_stats["executor_backend"] = self.executor_backend
+        if statistics is not None:
+            aggregated_stats["global_statistics"] = statistics.summary()
         
         return final_data, aggregated_stats
     
+    async def process_batch_file_streaming(self, file_path: str, output_path: str, output_format: str = "parquet",
+                                           file_format: str = None, processing_options: Dict[str, Any] = None,
+                                           import_options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Process a file chunk by chunk from import to export
+        
+        Chunks are read lazily, processed with the configured backend and
+        appended to ``output_path`` (CSV or Parquet row groups) in input order,
+        so memory stays bounded by the chunks in flight rather than the file size.
+        """
+        start_time = datetime.now()
+        
+        try:
+            if file_format is None:
+                file_format = detect_file_format(file_path)
+            
+            handler = self.import_factory.get_handler(file_format)
+            processing_stats, export_stats, columns = self._stream_to_file(
+                handler, file_path, output_path, output_format, processing_options, import_options)
+            
+            end_time = datetime.now()
+            result = {
+                "success": True,
+                "file_path": file_path,
+                "file_format": file_format,
+                "processing_time_seconds": (end_time - start_time).total_seconds(),
+                "processing_stats": processing_stats,
+                "export_stats": export_stats,
+                "final_data_shape": (export_stats["records_exported"], len(columns)),
+                "data_quality_score": processing_stats.get("average_quality_score", 0),
+                "processed_at": end_time.isoformat()
+            }
+            
+            self._update_global_stats(result)
+            
+            return result
+        
+        except Exception as e:
+            self.logger.error(f"Error streaming batch file {file_path}: {str(e)}")
+            return {
+                "success": False,
+                "file_path": file_path,
+                "error": str(e),
+                "processed_at": datetime.now().isoformat()
+            }
+    
+    async def process_incremental(self, source: str, output_path: str, output_format: str = "parquet",
+                                  file_format: str = None, processing_options: Dict[str, Any] = None,
+                                  import_options: Dict[str, Any] = None, merge_keys: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Process only the rows added to a source since the last run and merge them into ``output_path``
+        
+        The source's high-water mark (a byte offset for append-only CSV/JSON
+        Lines files, a row count for JSON documents, or the highest
+        ``watermark_column`` value in ``import_options`` for SQL, paired with
+        the ``watermark_key`` value when one is given) is read from
+        the watermark store and saved again once the delta has been merged.
+        New rows are appended to the processed output; with ``merge_keys``
+        existing rows with the same key are replaced. Without an existing
+        output the whole source is loaded.
+        """
+        start_time = datetime.now()
+        
+        try:
+            if file_format is None:
+                file_format = detect_file_format(source)
+            
+            handler = self.import_factory.get_handler(file_format)
+            import_options = dict(import_options or {})
+            source_id = handler.watermark_source_id(source, **import_options)
+            store = get_watermark_store()
+            previous_watermark = store.get(source_id) if Path(output_path).exists() else None
+            
+            self.logger.info(f"Incremental load of {source} from watermark {previous_watermark}")
+            delta_path = f"{output_path}.delta"
+            processing_stats, export_stats, columns = self._stream_to_file(
+                handler, source, delta_path, output_format, processing_options,
+                {**import_options, "incremental": True, "watermark": previous_watermark})
+            
+            if export_stats["records_exported"] > 0:
+                merge_stats = merge_streaming_output(output_path, delta_path, output_format, merge_keys)
+            else:
+                merge_stats = {"records_added": 0, "records_replaced": 0, "total_records": None}
+            if Path(delta_path).exists():
+                os.remove(delta_path)
+            
+            # Only after the merge, so a failed run is retried from the same watermark
+            if handler.last_watermark is not None:
+                store.set(source_id, handler.last_watermark)
+            
+            end_time = datetime.now()
+            result = {
+                "success": True,
+                "file_path": source,
+                "file_format": file_format,
+                "output_path": output_path,
+                "processing_time_seconds": (end_time - start_time).total_seconds(),
+                "processing_stats": processing_stats,
+                "merge_stats": merge_stats,
+                "final_data_shape": (export_stats["records_exported"], len(columns)),
+                "watermark": {"previous": previous_watermark, "current": handler.last_watermark},
+                "data_quality_score": processing_stats.get("average_quality_score", 0),
+                "processed_at": end_time.isoformat()
+            }
+            
+            self._update_global_stats(result)
+            
+            return result
+        
+        except Exception as e:
+            self.logger.error(f"Error in incremental load of {source}: {str(e)}")
+            return {
+                "success": False,
+                "file_path": source,
+                "error": str(e),
+                "processed_at": datetime.now().isoformat()
+            }
+    
+    def _stream_to_file(self, handler: Any, source: str, output_path: str, output_format: str,
+                        processing_options: Dict[str, Any] = None,
+                        import_options: Dict[str, Any] = None) -> Tuple[Dict[str, Any], Dict[str, Any], List[str]]:
+        """Process the handler's chunks of ``source`` and append them to ``output_path``
+        
+        The exporter keeps the first chunk's columns, so one-hot encoding
+        defaults to the stable category vocabulary ("uint8"), which gives
+        every chunk the same columns. With "dense" encoding a chunk bringing
+        a category the first chunk did not have fails instead of losing it.
+        """
+        processing_options = self._with_stable_encoding(processing_options)
+        statistics = None
+        if processing_options and processing_options.get("two_pass", False):
+            # First pass over the source only collects statistics; the second pass processes
+            self.logger.info(f"Collecting global statistics from {source}")
+            statistics = self._collect_statistics(
+                handler.iter_chunks(source, chunksize=self.batch_size, **(import_options or {})))
+            processing_options = {**processing_options, "global_statistics": statistics}
+        
+        self.logger.info(f"Streaming {source} in chunks of {self.batch_size} to {output_path}")
+        chunks = handler.iter_chunks(source, chunksize=self.batch_size, **(import_options or {}))
+        
+        chunk_stats = []
+        one_hot_prefixes = [f"{field}_" for field in self.transformer.category_vocabulary.fields]
+        with StreamingExporter(output_path, output_format, protected_prefixes=one_hot_prefixes) as exporter:
+            for processed_chunk, stats in self._iter_processed_chunks(chunks, processing_options):
+                exporter.write(processed_chunk)
+                chunk_stats.append(stats)
+            export_stats = exporter.close()
+        
+        processing_stats = self._aggregate_chunk_stats(chunk_stats)
+        self._add_dedup_stats(processing_stats, processing_options)
+        processing_stats["chunks_processed"] = len(chunk_stats)
+        processing_stats["chunk_size"] = self.batch_size
+        processing_stats["executor_backend"] = self.executor_backend
+        if statistics is not None:
+            processing_stats["global_statistics"] = statistics.summary()
+        return processing_stats, export_stats, exporter.columns or []
+    
+    def _with_stable_encoding(self, processing_options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Processing options with "uint8" one-hot encoding unless an encoding was chosen"""
+        processing_options = dict(processing_options or {})
+        transformation_options = processing_options.get("transformation_options")
+        if transformation_options is None or "encoding" not in transformation_options:
+            processing_options["transformation_options"] = {**(transformation_options or {}), "encoding": "uint8"}
+        return processing_options
+    
+    def _collect_statistics(self, chunks: Iterable[pd.DataFrame]) -> GlobalStatistics:
+        """First pass: dataset-wide statistics for the fields the cleaner and transformer estimate"""
+        strategies = self.cleaner.MISSING_STRATEGIES
+        numeric_fields = [field for field, strategy in strategies.items() if strategy["strategy"] == "median"]
+        for field in self.cleaner.OUTLIER_FIELDS + self.transformer.NORMALIZATION_FIELDS:
+            if field not in numeric_fields:
+                numeric_fields.append(field)
+        categorical_fields = [field for field, strategy in strategies.items() if strategy["strategy"] == "mode"]
+        return collect_global_statistics(chunks, numeric_fields, categorical_fields)
+    
+    def _iter_processed_chunks(self, chunks: Iterable[pd.DataFrame], 
+                               processing_options: Dict[str, Any] = None) -> Iterator[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """Process chunks concurrently and yield the results in input order
+        
+        At most two chunks per worker are read ahead, so the input iterable can
+        be a lazy reader. A chunk that fails is passed through unprocessed with
+        an ``error`` entry in its stats.
+        """
+        max_in_flight = self.max_workers * 2
+        pending = deque()
+        processing_options = self._concurrent_pipeline_options(processing_options, self.max_workers)
+        
+        # Before the executor exists, so process workers receive the same vocabulary
+        self._prepare_category_vocabulary(processing_options)
+        dedup_index = self._get_dedup_index(processing_options)
+        if dedup_index is not None:
+            chunks = self._deduplicate_chunks(chunks, dedup_index)
+        
+        with self._create_executor() as executor:
+            for chunk in chunks:
+                pending.append((chunk, self._submit_chunk(executor, chunk, processing_options)))
+                if len(pending) >= max_in_flight:
+                    yield self._collect_chunk(*pending.popleft())
+            
+            while pending:
+                yield self._collect_chunk(*pending.popleft())
+        
+        if dedup_index is not None:
+            self._save_dedup_index(processing_options)
+    
+    def _concurrent_pipeline_options(self, processing_options: Optional[Dict[str, Any]],
+                                     workers: int) -> Optional[Dict[str, Any]]:
+        """Options for pipelines running side by side, without memory_report when they share the process
+        
+        tracemalloc traces the whole process, so pipelines on concurrent
+        threads would count each other's allocations and frees in their stage
+        peaks. Worker processes and a single thread measure exactly.
+        """
+        if (processing_options and processing_options.get("memory_report", False)
+                and self.executor_backend == "thread" and workers > 1):
+            self.logger.warning("memory_report is disabled with the thread backend and more than one worker; "
+                                "use the process backend or max_workers=1 for per-stage memory")
+            return {**processing_options, "memory_report": False}
+        return processing_options
+    
+    def _prepare_category_vocabulary(self, processing_options: Dict[str, Any] = None) -> None:
+        """Load the one-hot vocabulary from disk, or save the current one so later runs match it"""
+        vocabulary_path = (processing_options or {}).get("category_vocabulary_path")
+        if not vocabulary_path:
+            return
+        if Path(vocabulary_path).exists():
+            self.transformer.category_vocabulary = CategoryVocabulary.load(vocabulary_path)
+        else:
+            self.transformer.category_vocabulary.save(vocabulary_path)
+    
+    def _get_dedup_index(self, processing_options: Dict[str, Any] = None) -> Optional[DuplicateKeyIndex]:
+        """Return the shared key index when cross-chunk deduplication is enabled"""
+        if not processing_options or not processing_options.get("cross_chunk_dedup", False):
+            return None
+        if self.dedup_index is None:
+            index_path = processing_options.get("dedup_index_path")
+            if index_path and Path(index_path).exists():
+                self.dedup_index = DuplicateKeyIndex.load(index_path)
+            else:
+                self.dedup_index = DuplicateKeyIndex()
+        return self.dedup_index
+    
+    def _save_dedup_index(self, processing_options: Dict[str, Any]) -> None:
+        index_path = processing_options.get("dedup_index_path")
+        if index_path and self.dedup_index is not None:
+            self.dedup_index.save(index_path)
+    
+    def _deduplicate_chunks(self, chunks: Iterable[pd.DataFrame], 
+                            dedup_index: DuplicateKeyIndex) -> Iterator[pd.DataFrame]:
+        """Drop rows whose key was already seen, in input order so the first occurrence always wins"""
+        self.last_dedup_stats = {"duplicates_removed": 0, "within_chunk": 0, "across_chunks": 0}
+        for chunk in chunks:
+            chunk, stats = dedup_index.deduplicate(chunk)
+            for key, value in stats.items():
+                self.last_dedup_stats[key] += value
+            if not chunk.empty:
+                yield chunk
+        self.last_dedup_stats["index"] = dedup_index.summary()
+    
+    def _add_dedup_stats(self, aggregated_stats: Dict[str, Any], processing_options: Dict[str, Any] = None) -> None:
+        if processing_options and processing_options.get("cross_chunk_dedup", False) and self.last_dedup_stats:
+            aggregated_stats["cross_chunk_deduplication"] = self.last_dedup_stats
+            aggregated_stats["total_records_removed"] += self.last_dedup_stats["duplicates_removed"]
+    
+    def _create_executor(self) -> Union[ThreadPoolExecutor, ProcessPoolExecutor]:
+        """Create the executor for the configured backend"""
+        if self.executor_backend == "process":
+            # Workers get copies of this processor's components, so custom rules carry over
+            return ProcessPoolExecutor(max_workers=self.max_workers,
+                                       mp_context=multiprocessing.get_context("spawn"),
+                                       initializer=_init_chunk_worker,
+                                       initargs=(self.cleaner, self.transformer, self.validator))
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+    
+    def _submit_chunk(self, executor: Union[ThreadPoolExecutor, ProcessPoolExecutor], chunk: pd.DataFrame, 
+                      processing_options: Dict[str, Any] = None) -> Future:
+        """Submit one chunk; process workers receive it as an Arrow IPC buffer"""
+        if self.executor_backend == "process":
+            return executor.submit(_process_chunk_in_worker, _serialize_chunk(chunk), processing_options)
+        return executor.submit(self._process_chunk_sync, chunk, processing_options)
+    
+    def _collect_chunk(self, chunk: pd.DataFrame, future: Future) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Wait for a chunk result, falling back to the original chunk on failure"""
+        try:
+            processed_chunk, stats = future.result()
+            if self.executor_backend == "process":
+                processed_chunk = _deserialize_chunk(processed_chunk)
+            return processed_chunk, stats
+        except Exception as e:
+            self.logger.error(f"Error processing chunk: {str(e)}")
+            # Add original chunk if processing failed
+            return chunk, {"error": str(e)}
+    
     def _process_chunk_sync(self, chunk: pd.DataFrame, 
                           processing_options: Dict[str, Any] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Synchronous chunk processing for ThreadPoolExecutor"""
-        # This is a wrapper around the async processing method
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._process_dataset(chunk, processing_options))
-        finally:
-            loop.close()
+        return self._run_pipeline(chunk, processing_options)
     
     def _aggregate_chunk_stats(self, chunk_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Aggregate statistics from multiple chunks"""
@@ -262,6 +726,14 @@ class BatchDataProcessor:
         if quality_scores:
             aggregated["average_quality_score"] = sum(quality_scores) / len(quality_scores)
         
+        # Worst chunk per stage
+        stage_peaks = {}
+        for stats in chunk_stats:
+            for record in stats.get("memory_report", []):
+                stage_peaks[record["stage"]] = max(stage_peaks.get(record["stage"], 0), record["peak_mb"])
+        if stage_peaks:
+            aggregated["memory_report"] = [{"stage": stage, "max_peak_mb": peak} for stage, peak in stage_peaks.items()]
+        
         return aggregated
     
     def _generate_processing_report(self, stats: Dict[str, Any]) -> Dict[str, Any]:
@@ -333,6 +805,9 @@ class BatchDataProcessor:
                 data.to_json(output_path, orient="records", date_format="iso")
             elif format.lower() == "parquet":
                 data.to_parquet(output_path, index=False)
+            elif format.lower() == "feather":
+                # Uncompressed, so ColumnarImporter can memory-map it without decompressing
+                data.reset_index(drop=True).to_feather(output_path, compression="uncompressed")
             else:
                 raise ValueError(f"Unsupported export format: {format}")
             
@@ -351,3 +826,67 @@ class BatchDataProcessor:
                 "error": str(e),
                 "exported_at": datetime.now().isoformat()
             }
+
+
+def _serialize_chunk(data: pd.DataFrame) -> Tuple[str, bytes]:
+    """Serialize a chunk for transfer between processes (Arrow IPC, pickle fallback)"""
+    if PYARROW_AVAILABLE:
+        try:
+            table = pa.Table.from_pandas(data, preserve_index=True)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return "arrow", sink.getvalue().to_pybytes()
+        except (pa.ArrowException, TypeError, ValueError):
+            # Mixed-type object columns cannot be represented in Arrow
+            pass
+    return "pickle", pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _deserialize_chunk(payload: Tuple[str, bytes]) -> pd.DataFrame:
+    """Inverse of _serialize_chunk"""
+    encoding, body = payload
+    if encoding == "pickle":
+        return pickle.loads(body)
+    
+    data = pa.ipc.open_stream(body).read_all().to_pandas()
+    # Arrow nulls come back as None in object columns; pandas readers use NaN
+    for column in data.columns[data.dtypes == object]:
+        if data[column].isna().any():
+            data[column] = data[column].where(data[column].notna(), np.nan)
+    return data
+
+
+_WORKER_PROCESSOR: Optional[BatchDataProcessor] = None
+
+
+def _init_chunk_worker(cleaner: DataCleaner, transformer: DataTransformer, validator: DataValidator,
+                       batch_size: int = 10000, dedup_index: Optional[DuplicateKeyIndex] = None) -> None:
+    """Process pool initializer: build one processor per worker process"""
+    global _WORKER_PROCESSOR
+    _WORKER_PROCESSOR = BatchDataProcessor(max_workers=1, batch_size=batch_size)
+    _WORKER_PROCESSOR.cleaner = cleaner
+    _WORKER_PROCESSOR.transformer = transformer
+    _WORKER_PROCESSOR.validator = validator
+    _WORKER_PROCESSOR.dedup_index = dedup_index
+
+
+def _process_chunk_in_worker(payload: Tuple[str, bytes], 
+                             processing_options: Dict[str, Any] = None) -> Tuple[Tuple[str, bytes], Dict[str, Any]]:
+    """Run the pipeline on one serialized chunk inside a worker process"""
+    processed, stats = _WORKER_PROCESSOR._run_pipeline(_deserialize_chunk(payload), processing_options)
+    return _serialize_chunk(processed), stats
+
+
+def _process_file_in_worker(file_path: str, processing_options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Import and process one whole file inside a worker process; only the result summary is sent back
+    
+    With a dedup index, the keys this file added to the worker's copy are
+    sent back too, as ``dedup_added_keys``, for the parent to merge.
+    """
+    dedup_index = _WORKER_PROCESSOR.dedup_index
+    before = dedup_index.hashes if dedup_index is not None else None
+    result = asyncio.run(_WORKER_PROCESSOR.process_batch_file(file_path, processing_options=processing_options))
+    if dedup_index is not None:
+        result["dedup_added_keys"] = dedup_index.added_since(before)
+    return result
@@ -0,0 +1,124 @@
+"""
+Stable category vocabulary for one-hot encoding of blood domain fields
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .file_locks import atomic_write
+from ..config import Config
+
+ENCODING_MODES = ["dense", "uint8", "sparse"]
+
+# Fields one-hot encoded by DataTransformer, with the categories known up front
+DEFAULT_CATEGORIES: Dict[str, List[str]] = {
+    "gender": ["male", "female", "other"],
+    "donation_type": list(Config.DONATION_TYPES),
+    "category": list(Config.DONOR_CATEGORIES),
+    "age_group": ["18-25", "26-35", "36-45", "46-55", "56-65", "65+"],
+    "volume_category": ["Low", "Standard", "High"],
+    "hemoglobin_status": ["Low", "Normal", "High"],
+    "blood_pressure_category": ["Normal", "Elevated", "High", "Very High", "Unknown"],
+    "season": ["Winter", "Spring", "Summer", "Fall"],
+    "day_of_week": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+}
+
+
+class CategoryVocabulary:
+    """Ordered categories per field, mapped to fixed one-hot column positions
+
+    Values outside the vocabulary are encoded in a trailing ``<field>_unseen``
+    column instead of adding columns, so chunks processed in parallel, and
+    later runs that load the saved vocabulary, share one design matrix
+    layout. ``learn`` only appends categories; existing columns never
+    change their order.
+    """
+
+    OTHER_LABEL = "unseen"
+
+    def __init__(self, categories: Optional[Dict[str, List[str]]] = None):
+        source = DEFAULT_CATEGORIES if categories is None else categories
+        self.categories: Dict[str, List[str]] = {field: list(values) for field, values in source.items()}
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self.categories)
+
+    def learn(self, data: pd.DataFrame) -> Dict[str, List[str]]:
+        """Append unseen values of the encoded fields; returns what was added per field
+
+        Call this on a representative sample before processing chunks in
+        parallel, so every chunk sees the same vocabulary.
+        """
+        added = {}
+        for field, known in self.categories.items():
+            if field not in data.columns:
+                continue
+            values = data[field].dropna().astype(str).unique()
+            new_values = sorted(set(values) - set(known) - {self.OTHER_LABEL})
+            if new_values:
+                known.extend(new_values)
+                added[field] = new_values
+        return added
+
+    def column_names(self, field: str) -> List[str]:
+        return [f"{field}_{category}" for category in self.categories[field] + [self.OTHER_LABEL]]
+
+    def design_matrix(self, data: pd.DataFrame) -> Tuple[sparse.csr_matrix, List[str]]:
+        """One-hot encode all vocabulary fields present in ``data`` as a CSR matrix"""
+        rows, cols, columns = [], [], []
+        offset = 0
+        for field in self.fields:
+            if field not in data.columns:
+                continue
+            values = data[field]
+            # Categorical columns (e.g. from pd.cut) stringify NaN as 'nan', so mask nulls first
+            labels = values.astype(str).where(values.notna())
+            codes = pd.Categorical(labels, categories=self.categories[field]).codes.astype(np.int64)
+            codes[(codes == -1) & values.notna().to_numpy()] = len(self.categories[field])
+
+            present = np.flatnonzero(codes >= 0)
+            rows.append(present)
+            cols.append(codes[present] + offset)
+
+            names = self.column_names(field)
+            columns.extend(names)
+            offset += len(names)
+
+        row_index = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        col_index = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        matrix = sparse.csr_matrix((np.ones(len(row_index), dtype=np.uint8), (row_index, col_index)),
+                                   shape=(len(data), offset))
+        return matrix, columns
+
+    def encode(self, data: pd.DataFrame, mode: str = "uint8") -> pd.DataFrame:
+        """One-hot columns for ``data`` as a DataFrame of uint8 or sparse uint8 columns"""
+        if mode not in ("uint8", "sparse"):
+            raise ValueError(f"Unsupported encoding mode: {mode}. Supported modes: ['uint8', 'sparse']")
+
+        matrix, columns = self.design_matrix(data)
+        if mode == "sparse":
+            encoded = pd.DataFrame.sparse.from_spmatrix(matrix.tocsc(), index=data.index, columns=columns)
+            return encoded.astype(pd.SparseDtype(np.uint8, 0))
+        return pd.DataFrame(matrix.toarray(), index=data.index, columns=columns)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"categories": self.categories}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "CategoryVocabulary":
+        return cls(payload["categories"])
+
+    def save(self, path: str) -> None:
+        """Persist the vocabulary as JSON"""
+        with atomic_write(path, encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "CategoryVocabulary":
+        with open(path, "r", encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle))
@@ -0,0 +1,137 @@
+"""
+Memory compaction of registered datasets: categoricals and numeric downcasting
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import Config
+from .category_vocabulary import DEFAULT_CATEGORIES
+
+# String fields with a known vocabulary; values outside it are appended as extra categories
+COMPACTION_VOCABULARIES: Dict[str, List[str]] = {
+    "blood_type": list(Config.BLOOD_TYPES),
+    "donation_type": list(Config.DONATION_TYPES),
+    "category": list(Config.DONOR_CATEGORIES),
+    "gender": list(DEFAULT_CATEGORIES["gender"])
+}
+
+# Other string columns become categorical when distinct values are at most this share of the rows
+CATEGORICAL_MAX_UNIQUE_RATIO = 0.05
+
+
+def compact_dataframe(data: pd.DataFrame, vocabularies: Optional[Dict[str, List[str]]] = None,
+                      max_unique_ratio: float = CATEGORICAL_MAX_UNIQUE_RATIO) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Shrink a frame in memory without changing any value
+
+    String columns in ``vocabularies`` (COMPACTION_VOCABULARIES by default)
+    become categoricals whose categories start with the vocabulary, so every
+    dataset shares one category order. Other string columns become
+    categoricals when they have few distinct values. Integers are downcast
+    to the smallest type that holds them, and floats to float32 only when
+    every value survives the round trip exactly.
+    """
+    vocabularies = COMPACTION_VOCABULARIES if vocabularies is None else vocabularies
+    bytes_before = int(data.memory_usage(index=True, deep=True).sum())
+    compacted = {}
+    column_stats = {}
+
+    for column in data.columns:
+        values = data[column]
+        if pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype):
+            converted = _to_categorical(values, vocabularies.get(column), max_unique_ratio)
+        elif pd.api.types.is_integer_dtype(values.dtype) and not pd.api.types.is_extension_array_dtype(values.dtype):
+            converted = pd.to_numeric(values, downcast="integer")
+        elif pd.api.types.is_float_dtype(values.dtype) and values.dtype == np.float64:
+            converted = _downcast_float(values)
+        else:
+            converted = None
+
+        if converted is None or converted.dtype == values.dtype:
+            continue
+        saved = int(values.memory_usage(index=False, deep=True) - converted.memory_usage(index=False, deep=True))
+        if saved <= 0:
+            continue
+        compacted[column] = converted
+        column_stats[column] = {"from": str(values.dtype), "to": str(converted.dtype), "bytes_saved": saved}
+
+    if compacted:
+        # Shallow copy: the caller's frame keeps its columns, untouched columns share their buffers
+        data = data.copy(deep=False)
+        for column, values in compacted.items():
+            data[column] = values
+
+    bytes_after = int(data.memory_usage(index=True, deep=True).sum())
+    return data, {
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "bytes_saved": bytes_before - bytes_after,
+        "compression_ratio": round(bytes_before / bytes_after, 2) if bytes_after else None,
+        "columns": column_stats
+    }
+
+
+def expand_dataframe(data: pd.DataFrame, dtypes: Optional[Dict[str, str]] = None,
+                     keep_categoricals: bool = False) -> pd.DataFrame:
+    """Undo compaction: strings back to object columns, numbers back to their original width
+
+    ``dtypes`` are the original dtypes of the compacted columns, as listed
+    (``"from"``) in the report of compact_dataframe; they are restored
+    exactly. Without them categoricals become object columns and narrowed
+    numbers 64-bit ones. The processing pipeline assigns values outside a
+    column's categories, so it gets the fully expanded frame.
+
+    With ``keep_categoricals`` only numbers are widened; categoricals stay
+    categorical, keeping the memory saved, but lose the vocabulary
+    categories no row uses, so value counts and groupbys report only values
+    present in the data, as they would for the original strings.
+    """
+    expanded = {}
+    for column in data.columns:
+        dtype = data[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and keep_categoricals:
+            if len(data[column].cat.categories) > data[column].nunique(dropna=True):
+                expanded[column] = data[column].cat.remove_unused_categories()
+        elif dtypes is not None:
+            if column in dtypes and str(dtype) != dtypes[column]:
+                expanded[column] = data[column].astype(dtypes[column])
+        elif isinstance(dtype, pd.CategoricalDtype):
+            expanded[column] = data[column].astype(object)
+        elif dtype == np.float32:
+            expanded[column] = data[column].astype(np.float64)
+        elif pd.api.types.is_integer_dtype(dtype) and not pd.api.types.is_extension_array_dtype(dtype) and dtype.itemsize < 8:
+            expanded[column] = data[column].astype(np.int64)
+    if not expanded:
+        return data
+
+    data = data.copy(deep=False)
+    for column, values in expanded.items():
+        data[column] = values
+    return data
+
+
+def _to_categorical(values: pd.Series, vocabulary: Optional[List[str]], max_unique_ratio: float) -> Optional[pd.Series]:
+    # Mixed-type columns would turn into categories of mixed types; leave them alone
+    if pd.api.types.infer_dtype(values, skipna=True) != "string":
+        return None
+
+    observed = values.dropna().unique()
+    if vocabulary is None and len(observed) > max_unique_ratio * len(values):
+        return None
+
+    known = list(vocabulary or [])
+    known_set = set(known)
+    categories = known + sorted(value for value in observed if value not in known_set)
+    return pd.Series(pd.Categorical(values, categories=categories), index=values.index, name=values.name)
+
+
+def _downcast_float(values: pd.Series) -> Optional[pd.Series]:
+    narrowed = values.to_numpy().astype(np.float32)
+    original = values.to_numpy()
+    with np.errstate(invalid="ignore"):
+        exact = (narrowed.astype(np.float64) == original) | np.isnan(original)
+    if not exact.all():
+        return None
+    return pd.Series(narrowed, index=values.index, name=values.name)
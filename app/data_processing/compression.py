@@ -0,0 +1,186 @@
+"""
+Compressed input detection and streaming decompression for import handlers
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import zipfile
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+# Arrow decompresses gzip, bz2 and zstd natively, outside the GIL
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+    ".zip": "zip"
+}
+
+MAGIC_BYTES = [
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+    (b"PK\x03\x04", "zip")
+]
+
+# Formats that are zip containers themselves, so a zip signature does not mean a compressed input
+ZIP_CONTAINER_EXTENSIONS = [".xlsx", ".xlsm"]
+
+ARROW_CODECS = {"gzip", "bz2", "zstd"}
+
+
+def detect_compression(file_path: str) -> Optional[str]:
+    """Compression of a file from its extension, or else from its leading magic bytes
+
+    Raises ImportError for zstd input when neither pyarrow's zstd codec nor
+    the zstandard package is installed, before anything tries to read it.
+    """
+    compression = _detect_compression(file_path)
+    if compression == "zstd" and not _arrow_codec_available("zstd") and not ZSTANDARD_AVAILABLE:
+        raise ImportError(f"Reading zstd-compressed {file_path} requires pyarrow built with zstd "
+                          f"or the zstandard package (pip install zstandard)")
+    return compression
+
+
+def _detect_compression(file_path: str) -> Optional[str]:
+    suffixes = [suffix.lower() for suffix in Path(file_path).suffixes]
+    if suffixes and suffixes[-1] in COMPRESSION_EXTENSIONS:
+        return COMPRESSION_EXTENSIONS[suffixes[-1]]
+
+    if not Path(file_path).is_file():
+        return None
+    with open(file_path, "rb") as handle:
+        head = handle.read(8)
+    for signature, compression in MAGIC_BYTES:
+        if head.startswith(signature):
+            if compression == "zip" and suffixes and suffixes[-1] in ZIP_CONTAINER_EXTENSIONS:
+                return None
+            return compression
+    return None
+
+
+def _arrow_codec_available(compression: str) -> bool:
+    return PYARROW_AVAILABLE and compression in ARROW_CODECS and pa.Codec.is_available(compression)
+
+
+def split_compression(file_path: str) -> Tuple[str, Optional[str]]:
+    """Extension of the data inside a possibly compressed file, and its compression
+
+    ``donors.csv.gz`` gives ``(".csv", "gzip")``. For zip archives the
+    extension comes from the archive member, so ``march.zip`` holding
+    ``march.xlsx`` gives ``(".xlsx", "zip")``.
+    """
+    compression = detect_compression(file_path)
+    path = Path(file_path)
+    if compression is None:
+        return path.suffix.lower(), None
+    if compression == "zip":
+        return Path(zip_member(file_path)).suffix.lower(), compression
+
+    name = path.name
+    if path.suffix.lower() in COMPRESSION_EXTENSIONS:
+        name = path.stem
+    return Path(name).suffix.lower(), compression
+
+
+def detect_file_format(file_path: str) -> str:
+    """Import format name of a file, looking through compression: 'csv' for donors.csv.gz"""
+    return split_compression(file_path)[0].replace(".", "")
+
+
+def zip_member(file_path: str) -> str:
+    """The data file inside a zip archive: its first regular, non-metadata member"""
+    with zipfile.ZipFile(file_path) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and not info.filename.startswith("__MACOSX/"):
+                return info.filename
+    raise ValueError(f"Zip archive {file_path} contains no files")
+
+
+class _StreamAdapter(io.RawIOBase):
+    """Raw IO view of an object that only has ``read(size)``, such as an Arrow input stream
+
+    ``owner`` (e.g. the zip archive a member stream was opened from) is
+    closed together with the stream.
+    """
+
+    def __init__(self, stream: Any, owner: Any = None):
+        super().__init__()
+        self._stream = stream
+        self._owner = owner
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if self._owner is not None:
+                self._owner.close()
+            super().close()
+
+
+def open_decompressed(file_path: str, compression: Optional[str] = None, native: bool = False) -> Any:
+    """Binary stream of the decompressed contents; nothing is written to disk
+
+    The result is a buffered reader (with ``readline`` and line iteration)
+    unless ``native`` is set, in which case gzip, bz2 and zstd inputs come
+    back as Arrow input streams for Arrow's own readers.
+    """
+    compression = compression or detect_compression(file_path)
+    if compression is None:
+        return open(file_path, "rb")
+
+    if compression == "zip":
+        archive = zipfile.ZipFile(file_path)
+        try:
+            member = archive.open(zip_member(file_path))
+        except BaseException:
+            archive.close()
+            raise
+        return io.BufferedReader(_StreamAdapter(member, owner=archive), buffer_size=1024 * 1024)
+
+    if _arrow_codec_available(compression):
+        stream = pa.input_stream(file_path, compression=compression)
+        return stream if native else io.BufferedReader(_StreamAdapter(stream), buffer_size=1024 * 1024)
+    if compression == "gzip":
+        return gzip.open(file_path, "rb")
+    if compression == "bz2":
+        return bz2.open(file_path, "rb")
+    if compression == "xz":
+        return lzma.open(file_path, "rb")
+    if compression == "zstd":
+        if not ZSTANDARD_AVAILABLE:
+            raise ImportError("pyarrow or zstandard is required to read zstd-compressed files")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(file_path, "rb"), closefd=True))
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def read_decompressed(file_path: str, compression: Optional[str] = None) -> io.BytesIO:
+    """Decompressed contents in memory, for readers that need random access (e.g. zipped workbooks)"""
+    with open_decompressed(file_path, compression) as stream:
+        return io.BytesIO(stream.read())
@@ -7,16 +7,52 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from ..config import Config
+from .dedup_index import DEDUP_KEY_FIELDS, hash_key_fields
+from .global_statistics import GlobalStatistics
+from .stage_memory import StageMemoryTracker, track_stage
 
 class DataCleaner:
     """Comprehensive data cleaning and preprocessing engine"""
     
+    # Missing value strategies for different field types
+    MISSING_STRATEGIES = {
+        "name": {"strategy": "remove", "threshold": 0.1},  # Remove if >10% missing
+        "age": {"strategy": "median", "threshold": 0.3},
+        "blood_type": {"strategy": "mode", "threshold": 0.2},
+        "contact_number": {"strategy": "remove", "threshold": 0.1},
+        "email": {"strategy": "remove", "threshold": 0.3},
+        "donation_date": {"strategy": "remove", "threshold": 0.05},
+        "volume_ml": {"strategy": "median", "threshold": 0.2},
+        "hemoglobin_level": {"strategy": "median", "threshold": 0.4},
+        "blood_pressure_systolic": {"strategy": "median", "threshold": 0.4},
+        "blood_pressure_diastolic": {"strategy": "median", "threshold": 0.4}
+    }
+    
+    # Numeric fields to check for outliers
+    OUTLIER_FIELDS = ["age", "volume_ml", "hemoglobin_level", "blood_pressure_systolic", "blood_pressure_diastolic", "pulse_rate", "temperature"]
+    
     def __init__(self):
         self.cleaning_stats = {}
         self.duplicate_threshold = 0.95  # Similarity threshold for duplicate detection
     
-    def clean_dataset(self, data: pd.DataFrame, cleaning_options: Dict[str, Any] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
-        """Perform comprehensive data cleaning"""
+    def clean_dataset(self, data: pd.DataFrame, cleaning_options: Dict[str, Any] = None,
+                      statistics: Optional[GlobalStatistics] = None, inplace: bool = False,
+                      memory_tracker: Optional[StageMemoryTracker] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Perform comprehensive data cleaning
+        
+        When frozen dataset-wide ``statistics`` are given, missing-value fills
+        and outlier bounds use them instead of values computed from ``data``.
+        
+        The frame is copied once up front and every step then works on that
+        copy. With ``inplace=True`` the caller hands ``data`` over instead:
+        it is not copied and may be modified.
+        
+        Duplicate, missing-value and outlier removal only mark rows in one
+        boolean keep mask; the marked rows are dropped by a single take after
+        the outlier step, which is the one copy left besides the up-front one.
+        Statistics and change counts of the steps in between only look at
+        kept rows, so results are the same as dropping rows step by step.
+        """
         if cleaning_options is None:
             cleaning_options = {
                 "remove_duplicates": True,
@@ -26,108 +62,120 @@ class DataCleaner:
                 "validate_data_types": True
             }
         
-        cleaned_data = data.copy()
+        cleaned_data = data if inplace else data.copy()
+        keep = np.ones(len(cleaned_data), dtype=bool)
         stats = {
             "original_records": len(data),
             "cleaning_steps": [],
             "records_removed": 0,
             "records_modified": 0
         }
+        # Taken before any step can modify a frame handed over in place
+        completeness_score = self._calculate_completeness_score(data)
         
         # Step 1: Remove exact duplicates
         if cleaning_options.get("remove_duplicates", True):
-            cleaned_data, duplicate_stats = self._remove_duplicates(cleaned_data)
+            with track_stage(memory_tracker, "remove_duplicates"):
+                keep, duplicate_stats = self._remove_duplicates(cleaned_data)
             stats["cleaning_steps"].append(f"Removed {duplicate_stats['duplicates_removed']} duplicates")
-            stats["records_removed"] += duplicate_stats["duplicates_removed"]
+            stats["records_removed"] += int(duplicate_stats["duplicates_removed"])
         
         # Step 2: Handle missing values
         if cleaning_options.get("handle_missing", True):
-            cleaned_data, missing_stats = self._handle_missing_values(cleaned_data)
+            with track_stage(memory_tracker, "handle_missing_values"):
+                cleaned_data, keep, missing_stats = self._handle_missing_values(cleaned_data, statistics,
+                                                                                inplace=True, keep=keep)
             stats["cleaning_steps"].append(f"Handled missing values in {missing_stats['fields_processed']} fields")
-            stats["records_modified"] += missing_stats["records_modified"]
+            stats["records_modified"] += int(missing_stats["records_modified"])
         
         # Step 3: Standardize formats
         if cleaning_options.get("standardize_formats", True):
-            cleaned_data, format_stats = self._standardize_formats(cleaned_data)
+            with track_stage(memory_tracker, "standardize_formats"):
+                cleaned_data, format_stats = self._standardize_formats(cleaned_data, inplace=True, keep=keep)
             stats["cleaning_steps"].append(f"Standardized formats for {format_stats['fields_processed']} fields")
-            stats["records_modified"] += format_stats["records_modified"]
+            stats["records_modified"] += int(format_stats["records_modified"])
         
         # Step 4: Remove outliers
         if cleaning_options.get("remove_outliers", True):
-            cleaned_data, outlier_stats = self._remove_outliers(cleaned_data)
+            with track_stage(memory_tracker, "remove_outliers"):
+                keep, outlier_stats = self._remove_outliers(cleaned_data, statistics, keep=keep)
             stats["cleaning_steps"].append(f"Removed {outlier_stats['outliers_removed']} outliers")
-            stats["records_removed"] += outlier_stats["outliers_removed"]
+            stats["records_removed"] += int(outlier_stats["outliers_removed"])
+        
+        # Drop every row marked by the steps above in one take
+        if not keep.all():
+            with track_stage(memory_tracker, "drop_removed_rows"):
+                cleaned_data = cleaned_data.take(np.flatnonzero(keep))
         
         # Step 5: Validate and fix data types
         if cleaning_options.get("validate_data_types", True):
-            cleaned_data, type_stats = self._validate_and_fix_types(cleaned_data)
+            with track_stage(memory_tracker, "validate_and_fix_types"):
+                cleaned_data, type_stats = self._validate_and_fix_types(cleaned_data, inplace=True)
             stats["cleaning_steps"].append(f"Fixed data types for {type_stats['fields_processed']} fields")
-            stats["records_modified"] += type_stats["records_modified"]
-        
+            stats["records_modified"] += int(type_stats["records_modified"])
+    
         stats["final_records"] = len(cleaned_data)
-        stats["data_quality_score"] = self._calculate_quality_score(data, cleaned_data)
+        stats["data_quality_score"] = self._calculate_quality_score(data, cleaned_data, completeness_score)
         
         return cleaned_data, stats
     
-    def _remove_duplicates(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, int]]:
-        """Remove duplicate records"""
-        original_count = len(data)
-        
+    def _remove_duplicates(self, data: pd.DataFrame) -> Tuple[np.ndarray, Dict[str, int]]:
+        """Mask of the rows to keep after removing duplicate records"""
         # Remove exact duplicates
-        data_deduped = data.drop_duplicates()
-        exact_duplicates_removed = original_count - len(data_deduped)
+        keep = ~data.duplicated().to_numpy()
+        exact_duplicates_removed = int((~keep).sum())
         
         # Remove near-duplicates based on key fields
-        key_fields = ["name", "contact_number", "email", "blood_type"]
-        available_key_fields = [field for field in key_fields if field in data.columns]
+        available_key_fields = [field for field in DEDUP_KEY_FIELDS if field in data.columns]
         
         if available_key_fields:
-            # Create a composite key for duplicate detection
-            data_deduped["duplicate_key"] = data_deduped[available_key_fields].astype(str).agg('|'.join, axis=1)
-            near_duplicates_removed = len(data_deduped) - len(data_deduped.drop_duplicates(subset=["duplicate_key"]))
-            data_deduped = data_deduped.drop_duplicates(subset=["duplicate_key"])
-            data_deduped = data_deduped.drop(columns=["duplicate_key"])
+            # Hash the composite key instead of building joined strings row by row. An exact
+            # duplicate hashes like its kept first occurrence, so masking with keep counts only
+            # the near-duplicates
+            duplicated = pd.Series(hash_key_fields(data, available_key_fields)).duplicated().to_numpy() & keep
+            near_duplicates_removed = int(duplicated.sum())
+            keep &= ~duplicated
         else:
             near_duplicates_removed = 0
         
         total_duplicates_removed = exact_duplicates_removed + near_duplicates_removed
         
-        return data_deduped, {
+        return keep, {
             "duplicates_removed": total_duplicates_removed,
             "exact_duplicates": exact_duplicates_removed,
             "near_duplicates": near_duplicates_removed
         }
     
-    def _handle_missing_values(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
-        """Handle missing values based on field importance and data type"""
-        cleaned_data = data.copy()
+    def _handle_missing_values(self, data: pd.DataFrame, statistics: Optional[GlobalStatistics] = None,
+                               inplace: bool = False, keep: Optional[np.ndarray] = None
+                               ) -> Tuple[pd.DataFrame, np.ndarray, Dict[str, Any]]:
+        """Handle missing values based on field importance and data type
+        
+        Only rows set in ``keep`` are considered; rows to remove are cleared
+        in the returned copy of the mask rather than dropped.
+        """
+        cleaned_data = data if inplace else data.copy()
+        keep = np.ones(len(cleaned_data), dtype=bool) if keep is None else keep.copy()
         records_modified = 0
         fields_processed = 0
         
-        # Define strategies for different field types
-        missing_strategies = {
-            "name": {"strategy": "remove", "threshold": 0.1},  # Remove if >10% missing
-            "age": {"strategy": "median", "threshold": 0.3},
-            "blood_type": {"strategy": "mode", "threshold": 0.2},
-            "contact_number": {"strategy": "remove", "threshold": 0.1},
-            "email": {"strategy": "remove", "threshold": 0.3},
-            "donation_date": {"strategy": "remove", "threshold": 0.05},
-            "volume_ml": {"strategy": "median", "threshold": 0.2},
-            "hemoglobin_level": {"strategy": "median", "threshold": 0.4},
-            "blood_pressure_systolic": {"strategy": "median", "threshold": 0.4},
-            "blood_pressure_diastolic": {"strategy": "median", "threshold": 0.4}
-        }
+        missing_strategies = self.MISSING_STRATEGIES
         
         for column in cleaned_data.columns:
             if column not in missing_strategies:
                 continue
             
-            missing_ratio = cleaned_data[column].isna().sum() / len(cleaned_data)
+            missing = cleaned_data[column].isna().to_numpy()
+            missing_ratio = missing[keep].sum() / keep.sum()
             strategy = missing_strategies[column]
+            global_ratio = statistics.missing_ratio(column) if statistics is not None else None
             
-            if missing_ratio > strategy["threshold"]:
+            if (global_ratio if global_ratio is not None else missing_ratio) > strategy["threshold"]:
                 # Too many missing values, remove column
-                cleaned_data = cleaned_data.drop(columns=[column])
+                if inplace:
+                    del cleaned_data[column]
+                else:
+                    cleaned_data = cleaned_data.drop(columns=[column])
                 fields_processed += 1
                 continue
             
@@ -138,37 +186,43 @@ class DataCleaner:
             
             if strategy["strategy"] == "remove":
                 # Remove rows with missing values in critical fields
-                before_count = len(cleaned_data)
-                cleaned_data = cleaned_data.dropna(subset=[column])
-                records_modified += before_count - len(cleaned_data)
+                records_modified += int((missing & keep).sum())
+                keep &= ~missing
             
             elif strategy["strategy"] == "mode":
                 # Fill with most frequent value
-                mode_value = cleaned_data[column].mode()
+                if statistics is not None and statistics.mode(column) is not None:
+                    mode_value = pd.Series([statistics.mode(column)])
+                else:
+                    mode_value = cleaned_data[column][keep].mode()
                 if not mode_value.empty:
                     cleaned_data[column] = cleaned_data[column].fillna(mode_value[0])
-                    records_modified += cleaned_data[column].isna().sum()
+                    records_modified += cleaned_data[column].isna().to_numpy()[keep].sum()
             
             elif strategy["strategy"] == "median":
                 # Fill with median value for numeric fields
                 if cleaned_data[column].dtype in ['int64', 'float64']:
-                    median_value = cleaned_data[column].median()
+                    median_value = statistics.median(column) if statistics is not None else None
+                    if median_value is None:
+                        median_value = cleaned_data[column][keep].median()
                     cleaned_data[column] = cleaned_data[column].fillna(median_value)
-                    records_modified += cleaned_data[column].isna().sum()
+                    records_modified += cleaned_data[column].isna().to_numpy()[keep].sum()
             
             elif strategy["strategy"] == "forward_fill":
                 # Forward fill for time series data
-                cleaned_data[column] = cleaned_data[column].fillna(method='ffill')
-                records_modified += cleaned_data[column].isna().sum()
+                # Rows already marked for removal must not carry their values forward
+                cleaned_data[column] = cleaned_data[column].where(keep).fillna(method='ffill')
+                records_modified += cleaned_data[column].isna().to_numpy()[keep].sum()
         
-        return cleaned_data, {
+        return cleaned_data, keep, {
             "fields_processed": fields_processed,
             "records_modified": records_modified
         }
     
-    def _standardize_formats(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
-        """Standardize data formats across fields"""
-        cleaned_data = data.copy()
+    def _standardize_formats(self, data: pd.DataFrame, inplace: bool = False,
+                             keep: Optional[np.ndarray] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Standardize data formats across fields; only rows set in ``keep`` are counted as modified"""
+        cleaned_data = data if inplace else data.copy()
         records_modified = 0
         fields_processed = 0
         
@@ -188,7 +242,7 @@ class DataCleaner:
                 "O NEGATIVE": "O-", "O NEG": "O-", "O-": "O-"
             }
             cleaned_data["blood_type"] = cleaned_data["blood_type"].map(blood_type_mapping).fillna(cleaned_data["blood_type"])
-            records_modified += sum(before != cleaned_data["blood_type"])
+            records_modified += self._count_changed(before, cleaned_data["blood_type"], keep)
             fields_processed += 1
         
         # Standardize phone numbers
@@ -198,14 +252,14 @@ class DataCleaner:
             cleaned_data["contact_number"] = cleaned_data["contact_number"].astype(str).str.replace(r'[^\d]', '', regex=True)
             # Standardize length (assuming 10-digit numbers)
             cleaned_data["contact_number"] = cleaned_data["contact_number"].str[-10:]
-            records_modified += sum(before != cleaned_data["contact_number"])
+            records_modified += self._count_changed(before, cleaned_data["contact_number"], keep)
             fields_processed += 1
         
         # Standardize email format
         if "email" in cleaned_data.columns:
             before = cleaned_data["email"].copy()
             cleaned_data["email"] = cleaned_data["email"].astype(str).str.lower().str.strip()
-            records_modified += sum(before != cleaned_data["email"])
+            records_modified += self._count_changed(before, cleaned_data["email"], keep)
             fields_processed += 1
         
         # Standardize gender
@@ -217,7 +271,7 @@ class DataCleaner:
                 "O": "other", "OTHER": "other"
             }
             cleaned_data["gender"] = cleaned_data["gender"].astype(str).str.upper().map(gender_mapping).fillna(cleaned_data["gender"])
-            records_modified += sum(before != cleaned_data["gender"])
+            records_modified += self._count_changed(before, cleaned_data["gender"], keep)
             fields_processed += 1
         
         # Standardize date formats
@@ -227,7 +281,7 @@ class DataCleaner:
                 try:
                     before = cleaned_data[field].copy()
                     cleaned_data[field] = pd.to_datetime(cleaned_data[field], errors='coerce')
-                    records_modified += sum(before != cleaned_data[field])
+                    records_modified += self._count_changed(before, cleaned_data[field], keep)
                     fields_processed += 1
                 except:
                     continue
@@ -237,41 +291,49 @@ class DataCleaner:
             "records_modified": records_modified
         }
     
-    def _remove_outliers(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, int]]:
-        """Remove outliers using IQR method"""
-        cleaned_data = data.copy()
+    @staticmethod
+    def _count_changed(before: pd.Series, after: pd.Series, keep: Optional[np.ndarray] = None) -> int:
+        changed = (before != after).to_numpy()
+        return int(changed[keep].sum() if keep is not None else changed.sum())
+    
+    def _remove_outliers(self, data: pd.DataFrame, statistics: Optional[GlobalStatistics] = None,
+                         keep: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Dict[str, int]]:
+        """Mask of the rows in ``keep`` that are not outliers, using IQR method"""
+        keep = np.ones(len(data), dtype=bool) if keep is None else keep.copy()
         outliers_removed = 0
         
-        # Numeric fields to check for outliers
-        numeric_fields = ["age", "volume_ml", "hemoglobin_level", "blood_pressure_systolic", "blood_pressure_diastolic", "pulse_rate", "temperature"]
-        
-        for field in numeric_fields:
-            if field not in cleaned_data.columns or cleaned_data[field].dtype not in ['int64', 'float64']:
+        for field in self.OUTLIER_FIELDS:
+            if field not in data.columns or data[field].dtype not in ['int64', 'float64']:
                 continue
             
-            Q1 = cleaned_data[field].quantile(0.25)
-            Q3 = cleaned_data[field].quantile(0.75)
+            if statistics is not None and statistics.has_field(field):
+                # Frozen dataset-wide quartiles keep every chunk on the same bounds
+                Q1 = statistics.quantile(field, 0.25)
+                Q3 = statistics.quantile(field, 0.75)
+            else:
+                Q1 = data[field][keep].quantile(0.25)
+                Q3 = data[field][keep].quantile(0.75)
             IQR = Q3 - Q1
             
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
             
             # Identify outliers
-            outliers = (cleaned_data[field] < lower_bound) | (cleaned_data[field] > upper_bound)
+            outliers = ((data[field] < lower_bound) | (data[field] > upper_bound)).to_numpy() & keep
             outliers_count = outliers.sum()
             
             if outliers_count > 0:
                 # Remove outliers
-                cleaned_data = cleaned_data[~outliers]
+                keep &= ~outliers
                 outliers_removed += outliers_count
         
-        return cleaned_data, {
+        return keep, {
             "outliers_removed": outliers_removed
         }
     
-    def _validate_and_fix_types(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    def _validate_and_fix_types(self, data: pd.DataFrame, inplace: bool = False) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Validate and fix data types"""
-        cleaned_data = data.copy()
+        cleaned_data = data if inplace else data.copy()
         records_modified = 0
         fields_processed = 0
         
@@ -317,13 +379,21 @@ class DataCleaner:
             "records_modified": records_modified
         }
     
-    def _calculate_quality_score(self, original_data: pd.DataFrame, cleaned_data: pd.DataFrame) -> float:
+    def _calculate_completeness_score(self, data: pd.DataFrame) -> float:
+        """Percentage of non-missing cells"""
+        if data.empty:
+            return 0.0
+        return 100 - (data.isna().sum().sum() / (len(data) * len(data.columns)) * 100)
+    
+    def _calculate_quality_score(self, original_data: pd.DataFrame, cleaned_data: pd.DataFrame,
+                                 completeness_score: Optional[float] = None) -> float:
         """Calculate overall data quality score"""
         if original_data.empty:
             return 0.0
         
         # Factors affecting quality score
-        completeness_score = 100 - (original_data.isna().sum().sum() / (len(original_data) * len(original_data.columns)) * 100)
+        if completeness_score is None:
+            completeness_score = self._calculate_completeness_score(original_data)
         consistency_score = 95.0  # Placeholder for consistency checks
         validity_score = 90.0   # Placeholder for validity checks
         
@@ -334,4 +404,4 @@ class DataCleaner:
         overall_score = (completeness_score * 0.3 + consistency_score * 0.2 + 
                         validity_score * 0.3 + dedup_score * 0.2)
         
-        return round(overall_score, 2)
+        return round(float(overall_score), 2)
@@ -7,17 +7,41 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from ..config import Config
+from .category_vocabulary import ENCODING_MODES, CategoryVocabulary
+from .global_statistics import GlobalStatistics
+from .stage_memory import StageMemoryTracker, track_stage
 
 class DataTransformer:
     """Data transformation and feature engineering engine"""
     
-    def __init__(self):
+    # Fields to normalize
+    NORMALIZATION_FIELDS = ["age", "volume_ml", "hemoglobin_level", "blood_pressure_systolic", 
+                            "blood_pressure_diastolic", "pulse_rate", "temperature", "days_since_last_donation",
+                            "days_since_registration", "eligibility_score"]
+    
+    # Known value ranges used for normalization with global statistics
+    NORMALIZATION_RANGES = {
+        "eligibility_score": (0, 100)
+    }
+    
+    def __init__(self, category_vocabulary: Optional[CategoryVocabulary] = None):
         self.transformation_log = []
+        self.category_vocabulary = category_vocabulary or CategoryVocabulary()
     
-    def transform_dataset(self, data: pd.DataFrame, transformation_config: Dict[str, Any] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
-        """Perform comprehensive data transformation"""
+    def transform_dataset(self, data: pd.DataFrame, transformation_config: Dict[str, Any] = None,
+                          statistics: Optional[GlobalStatistics] = None, inplace: bool = False,
+                          memory_tracker: Optional[StageMemoryTracker] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Perform comprehensive data transformation
+        
+        When frozen dataset-wide ``statistics`` are given, min-max normalization
+        uses their ranges instead of the ranges found in ``data``.
+        
+        As in DataCleaner.clean_dataset, ``inplace=True`` skips the up-front
+        copy and lets the steps add columns to ``data`` directly.
+        """
         if transformation_config is None:
             transformation_config = {
+                "encoding": "dense",
                 "create_derived_fields": True,
                 "normalize_data": True,
                 "aggregate_data": False,
@@ -25,47 +49,59 @@ class DataTransformer:
                 "create_time_features": True
             }
         
-        transformed_data = data.copy()
+        encoding = transformation_config.get("encoding", "dense")
+        if encoding not in ENCODING_MODES:
+            raise ValueError(f"Unsupported encoding mode: {encoding}. Supported modes: {ENCODING_MODES}")
+        
+        original_shape = data.shape
+        original_columns = list(data.columns)
+        transformed_data = data if inplace else data.copy()
         transformations_applied = []
         
         # Step 1: Create derived fields
         if transformation_config.get("create_derived_fields", True):
-            transformed_data = self._create_derived_fields(transformed_data)
+            with track_stage(memory_tracker, "create_derived_fields"):
+                transformed_data = self._create_derived_fields(transformed_data, inplace=True)
             transformations_applied.append("Created derived fields")
         
         # Step 2: Encode categorical variables
         if transformation_config.get("encode_categorical", True):
-            transformed_data = self._encode_categorical_variables(transformed_data)
+            with track_stage(memory_tracker, "encode_categorical_variables"):
+                transformed_data = self._encode_categorical_variables(transformed_data, inplace=True,
+                                                                      encoding=encoding)
             transformations_applied.append("Encoded categorical variables")
         
         # Step 3: Create time-based features
         if transformation_config.get("create_time_features", True):
-            transformed_data = self._create_time_features(transformed_data)
+            with track_stage(memory_tracker, "create_time_features"):
+                transformed_data = self._create_time_features(transformed_data, inplace=True)
             transformations_applied.append("Created time-based features")
         
         # Step 4: Normalize/standardize numerical fields
         if transformation_config.get("normalize_data", True):
-            transformed_data = self._normalize_numerical_fields(transformed_data)
+            with track_stage(memory_tracker, "normalize_numerical_fields"):
+                transformed_data = self._normalize_numerical_fields(transformed_data, statistics, inplace=True)
             transformations_applied.append("Normalized numerical fields")
         
         # Step 5: Aggregate data if requested
         if transformation_config.get("aggregate_data", False):
-            transformed_data = self._aggregate_data(transformed_data, transformation_config.get("aggregation_level", "daily"))
+            with track_stage(memory_tracker, "aggregate_data"):
+                transformed_data = self._aggregate_data(transformed_data, transformation_config.get("aggregation_level", "daily"))
             transformations_applied.append(f"Aggregated data to {transformation_config.get('aggregation_level', 'daily')} level")
-        
+    
         transformation_summary = {
-            "original_shape": data.shape,
+            "original_shape": original_shape,
             "transformed_shape": transformed_data.shape,
             "transformations_applied": transformations_applied,
-            "new_features": self._get_new_features(data, transformed_data),
+            "new_features": self._get_new_features(original_columns, transformed_data),
             "transformation_timestamp": datetime.now()
         }
         
         return transformed_data, transformation_summary
     
-    def _create_derived_fields(self, data: pd.DataFrame) -> pd.DataFrame:
+    def _create_derived_fields(self, data: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """Create derived fields for blood domain analysis"""
-        transformed_data = data.copy()
+        transformed_data = data if inplace else data.copy()
         
         # Age groups
         if "age" in transformed_data.columns:
@@ -96,21 +132,18 @@ class DataTransformer:
         
         # Blood pressure categories
         if all(col in transformed_data.columns for col in ["blood_pressure_systolic", "blood_pressure_diastolic"]):
-            def bp_category(row):
-                systolic = row["blood_pressure_systolic"]
-                diastolic = row["blood_pressure_diastolic"]
-                if pd.isna(systolic) or pd.isna(diastolic):
-                    return "Unknown"
-                if systolic < 120 and diastolic < 80:
-                    return "Normal"
-                elif systolic < 140 and diastolic < 90:
-                    return "Elevated"
-                elif systolic < 180 and diastolic < 120:
-                    return "High"
-                else:
-                    return "Very High"
-            
-            transformed_data["blood_pressure_category"] = transformed_data.apply(bp_category, axis=1)
+            systolic = transformed_data["blood_pressure_systolic"].astype("float64")
+            diastolic = transformed_data["blood_pressure_diastolic"].astype("float64")
+            transformed_data["blood_pressure_category"] = np.select(
+                [
+                    systolic.isna() | diastolic.isna(),
+                    (systolic < 120) & (diastolic < 80),
+                    (systolic < 140) & (diastolic < 90),
+                    (systolic < 180) & (diastolic < 120)
+                ],
+                ["Unknown", "Normal", "Elevated", "High"],
+                default="Very High"
+            ).astype(object)
         
         # BMI calculation (if height and weight available)
         if all(col in transformed_data.columns for col in ["height_cm", "weight_kg"]):
@@ -141,9 +174,14 @@ class DataTransformer:
         
         return transformed_data
     
-    def _encode_categorical_variables(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Encode categorical variables for machine learning"""
-        transformed_data = data.copy()
+    def _encode_categorical_variables(self, data: pd.DataFrame, inplace: bool = False,
+                                      encoding: str = "dense") -> pd.DataFrame:
+        """Encode categorical variables for machine learning
+        
+        ``encoding`` is "dense" (per-field get_dummies), or "uint8"/"sparse"
+        for one compact design matrix laid out by ``self.category_vocabulary``.
+        """
+        transformed_data = data if inplace else data.copy()
         
         # Blood type encoding (Rh factor and ABO group)
         if "blood_type" in transformed_data.columns:
@@ -151,6 +189,11 @@ class DataTransformer:
             transformed_data["abo_group"] = transformed_data["blood_type"].astype(str).str.replace("+", "").replace("-", "")
         
         # One-hot encode categorical variables
+        if encoding != "dense":
+            # One pass over the stable vocabulary, attached with a single concat
+            encoded = self.category_vocabulary.encode(transformed_data, mode=encoding)
+            return pd.concat([transformed_data, encoded], axis=1)
+        
         categorical_fields = ["gender", "donation_type", "category", "age_group", "volume_category", 
                             "hemoglobin_status", "blood_pressure_category", "season", "day_of_week"]
         
@@ -161,9 +204,9 @@ class DataTransformer:
         
         return transformed_data
     
-    def _create_time_features(self, data: pd.DataFrame) -> pd.DataFrame:
+    def _create_time_features(self, data: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """Create time-based features for analysis"""
-        transformed_data = data.copy()
+        transformed_data = data if inplace else data.copy()
         
         if "donation_date" in transformed_data.columns:
             donation_dates = pd.to_datetime(transformed_data["donation_date"])
@@ -202,20 +245,21 @@ class DataTransformer:
         
         return transformed_data
     
-    def _normalize_numerical_fields(self, data: pd.DataFrame) -> pd.DataFrame:
+    def _normalize_numerical_fields(self, data: pd.DataFrame, statistics: Optional[GlobalStatistics] = None,
+                                    inplace: bool = False) -> pd.DataFrame:
         """Normalize numerical fields for analysis"""
-        transformed_data = data.copy()
+        transformed_data = data if inplace else data.copy()
         
-        # Fields to normalize
-        numerical_fields = ["age", "volume_ml", "hemoglobin_level", "blood_pressure_systolic", 
-                           "blood_pressure_diastolic", "pulse_rate", "temperature", "days_since_last_donation",
-                           "days_since_registration", "eligibility_score"]
-        
-        for field in numerical_fields:
+        for field in self.NORMALIZATION_FIELDS:
             if field in transformed_data.columns and transformed_data[field].dtype in ['int64', 'float64']:
                 # Min-max normalization
-                min_val = transformed_data[field].min()
-                max_val = transformed_data[field].max()
+                if statistics is not None and field in self.NORMALIZATION_RANGES:
+                    min_val, max_val = self.NORMALIZATION_RANGES[field]
+                elif statistics is not None and statistics.min(field) is not None:
+                    min_val, max_val = statistics.min(field), statistics.max(field)
+                else:
+                    min_val = transformed_data[field].min()
+                    max_val = transformed_data[field].max()
                 if max_val != min_val:
                     transformed_data[f"{field}_normalized"] = (transformed_data[field] - min_val) / (max_val - min_val)
                 else:
@@ -266,59 +310,50 @@ class DataTransformer:
         return data
     
     def _calculate_eligibility_score(self, data: pd.DataFrame) -> pd.Series:
-        """Calculate donor eligibility score based on various factors"""
-        scores = []
-        
-        for _, row in data.iterrows():
-            score = 100  # Start with perfect score
-            
-            # Age factor
-            if "age" in data.columns and pd.notna(row["age"]):
-                age = row["age"]
-                if age < 20 or age > 60:
-                    score -= 20
-                elif age < 25 or age > 55:
-                    score -= 10
-            
-            # Hemoglobin factor
-            if "hemoglobin_level" in data.columns and pd.notna(row["hemoglobin_level"]):
-                hgb = row["hemoglobin_level"]
-                if hgb < 12.5 or hgb > 16.0:
-                    score -= 15
-                elif hgb < 13.0 or hgb > 15.5:
-                    score -= 5
-            
-            # Blood pressure factor
-            if all(col in data.columns and pd.notna(row[col]) for col in ["blood_pressure_systolic", "blood_pressure_diastolic"]):
-                systolic = row["blood_pressure_systolic"]
-                diastolic = row["blood_pressure_diastolic"]
-                if systolic > 140 or diastolic > 90:
-                    score -= 15
-                elif systolic > 130 or diastolic > 85:
-                    score -= 5
-            
-            # Recent donation factor
-            if "days_since_last_donation" in data.columns and pd.notna(row["days_since_last_donation"]):
-                days_since = row["days_since_last_donation"]
-                if days_since < 56:
-                    score -= 50  # Not eligible
-                elif days_since < 90:
-                    score -= 10  # Recently donated
-            
-            scores.append(max(0, score))
-        
-        return pd.Series(scores)
+        """Calculate donor eligibility score based on various factors
+        
+        The scores carry ``data``'s index, so assigning them back lines up
+        with rows that survived cleaning (the row-wise version returned a
+        RangeIndex and misplaced scores on any other index).
+        """
+        score = np.full(len(data), 100)  # Start with perfect score
+        
+        # Age factor
+        if "age" in data.columns:
+            age = data["age"].astype("float64")
+            score -= np.select([(age < 20) | (age > 60), (age < 25) | (age > 55)], [20, 10], default=0)
+        
+        # Hemoglobin factor
+        if "hemoglobin_level" in data.columns:
+            hgb = data["hemoglobin_level"].astype("float64")
+            score -= np.select([(hgb < 12.5) | (hgb > 16.0), (hgb < 13.0) | (hgb > 15.5)], [15, 5], default=0)
+        
+        # Blood pressure factor, only when both readings are present
+        if all(col in data.columns for col in ["blood_pressure_systolic", "blood_pressure_diastolic"]):
+            systolic = data["blood_pressure_systolic"].astype("float64")
+            diastolic = data["blood_pressure_diastolic"].astype("float64")
+            both_known = (systolic.notna() & diastolic.notna()).to_numpy()
+            score -= np.select([both_known & ((systolic > 140) | (diastolic > 90)).to_numpy(),
+                                both_known & ((systolic > 130) | (diastolic > 85)).to_numpy()], [15, 5], default=0)
+        
+        # Recent donation factor
+        if "days_since_last_donation" in data.columns:
+            days_since = data["days_since_last_donation"].astype("float64")
+            score -= np.select([days_since < 56, days_since < 90], [50, 10], default=0)  # Not eligible / recently donated
+        
+        # Comparisons with NaN are False, so missing values never cost points
+        return pd.Series(np.maximum(score, 0), index=data.index)
     
-    def _get_new_features(self, original_data: pd.DataFrame, transformed_data: pd.DataFrame) -> List[str]:
+    def _get_new_features(self, original_columns: List[str], transformed_data: pd.DataFrame) -> List[str]:
         """Get list of new features created during transformation"""
-        original_columns = set(original_data.columns)
+        original_columns = set(original_columns)
         transformed_columns = set(transformed_data.columns)
         new_features = transformed_columns - original_columns
         return sorted(list(new_features))
     
     def create_unified_schema(self, datasets: List[pd.DataFrame], source_names: List[str]) -> pd.DataFrame:
         """Create unified schema from multiple blood center datasets"""
-        unified_data = pd.DataFrame()
+        standardized = []
         
         for i, (data, source_name) in enumerate(zip(datasets, source_names)):
             data_copy = data.copy()
@@ -327,14 +362,10 @@ class DataTransformer:
             
             # Standardize field names across systems
             field_mapping = self._get_field_mapping(data_copy.columns)
-            data_copy = data_copy.rename(columns=field_mapping)
-            
-            if unified_data.empty:
-                unified_data = data_copy
-            else:
-                unified_data = pd.concat([unified_data, data_copy], ignore_index=True)
+            standardized.append(data_copy.rename(columns=field_mapping))
         
-        return unified_data
+        # One concat instead of one per source, which copied the growing result every time
+        return pd.concat(standardized, ignore_index=True) if standardized else pd.DataFrame()
     
     def _get_field_mapping(self, columns: List[str]) -> Dict[str, str]:
         """Get field mapping for standardization across systems"""
@@ -3,15 +3,24 @@ Data validation engine for blood domain data
 """
 
 import re
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
-from ..models.validation import DataRule, ValidationResult, BatchValidationResult, ValidationSeverity, BLOOD_DOMAIN_RULES, BLOOD_CONSISTENCY_RULES
+from ..models.validation import DataRule, ConsistencyRule, ValidationResult, BatchValidationResult, ValidationFailureTable, ValidationSeverity, BLOOD_DOMAIN_RULES, BLOOD_CONSISTENCY_RULES
 from ..config import Config
+from .rule_expressions import compile_rule_expression
 
 class DataValidator:
     """Comprehensive data validation engine"""
     
+    SEVERITY_WEIGHTS = {
+        ValidationSeverity.CRITICAL: 1.0,
+        ValidationSeverity.ERROR: 0.8,
+        ValidationSeverity.WARNING: 0.5,
+        ValidationSeverity.INFO: 0.2
+    }
+    
     def __init__(self):
         self.rules = BLOOD_DOMAIN_RULES.copy()
         self.consistency_rules = BLOOD_CONSISTENCY_RULES.copy()
@@ -21,14 +30,32 @@ class DataValidator:
         """Add a custom validation rule"""
         self.custom_rules.append(rule)
     
-    def validate_batch(self, data: pd.DataFrame, batch_id: str) -> BatchValidationResult:
-        """Validate entire batch of data"""
+    def validate_batch(self, data: pd.DataFrame, batch_id: str, mode: str = "row") -> BatchValidationResult:
+        """Validate entire batch of data
+        
+        ``mode="row"`` builds one ValidationResult per rule per record.
+        ``mode="columnar"`` evaluates each rule as a single vectorized mask over
+        its column and only fills the summary counts.
+        """
+        if mode == "columnar":
+            return self._validate_batch_columnar(data, batch_id)
+        if mode != "row":
+            raise ValueError(f"Unsupported validation mode: {mode}")
+        
         start_time = datetime.now()
         all_results = []
         
+        # Consistency rules run once over whole columns, then are reported per record
+        consistency_checks = [
+            (rule, *self._evaluate_consistency_rule(data, rule))
+            for rule in self.consistency_rules if rule.is_active
+        ]
+        
         # Validate each record
-        for idx, row in data.iterrows():
-            record_results = self.validate_record(row, str(idx))
+        for position, (idx, row) in enumerate(data.iterrows()):
+            record_results = self._apply_field_rules(row, str(idx))
+            for rule, mask, error in consistency_checks:
+                record_results.append(self._consistency_result(row, str(idx), rule, bool(mask[position]), error))
             all_results.extend(record_results)
         
         # Calculate summary statistics
@@ -66,8 +93,201 @@ class DataValidator:
             processing_time_seconds=processing_time
         )
     
+    def _validate_batch_columnar(self, data: pd.DataFrame, batch_id: str) -> BatchValidationResult:
+        """Validate a batch column-at-a-time, keeping only the failures"""
+        start_time = datetime.now()
+        total_records = len(data)
+        failures = self.build_failure_table(data)
+        
+        # Summaries come straight from the failure arrays; passing checks are only counted
+        failed_by_rule = failures.counts_by_rule()
+        severity_summary = {}
+        rule_summary = {}
+        for rule in failures.rules:
+            # Same semantics as row mode: every check is counted under its severity
+            severity_summary[rule["severity"]] = severity_summary.get(rule["severity"], 0) + total_records
+            rule_summary.setdefault(rule["rule_name"], {"valid": 0, "invalid": 0})
+            rule_summary[rule["rule_name"]]["valid"] += total_records
+        for rule_name, failed in failed_by_rule.items():
+            rule_summary[rule_name]["valid"] -= failed
+            rule_summary[rule_name]["invalid"] += failed
+        
+        invalid_records = failures.failed_row_count()
+        processing_time = (datetime.now() - start_time).total_seconds()
+        
+        return BatchValidationResult(
+            batch_id=batch_id,
+            total_records=total_records,
+            valid_records=total_records - invalid_records,
+            invalid_records=invalid_records,
+            validation_results=[],
+            summary_by_severity=severity_summary,
+            summary_by_rule=rule_summary,
+            processing_time_seconds=processing_time,
+            failures=failures
+        )
+    
+    def build_failure_table(self, data: pd.DataFrame) -> ValidationFailureTable:
+        """Evaluate all active rules column-wise into a failure-only table"""
+        rules = []
+        masks = []
+        for rule, severity, mask in self._iter_rule_masks(data):
+            if isinstance(rule, ConsistencyRule):
+                field_name = ", ".join(rule.fields_involved)
+                message = f"Consistency rule '{rule.name}' failed: {rule.error_message}"
+            else:
+                field_name = rule.field_name
+                message = f"Rule '{rule.name}' failed: {rule.description}"
+            
+            rules.append({
+                "rule_id": rule.id or "unknown",
+                "rule_name": rule.name,
+                "field_name": field_name,
+                "severity": severity.value,
+                "message": message
+            })
+            masks.append(mask)
+        
+        return ValidationFailureTable.from_masks(rules, masks, data.index)
+    
+    def find_rule_failures(self, data: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """Evaluate all active rules column-wise and report failures per rule
+        
+        Returns a mapping of rule name to its rule id and severity, failure
+        count and the index labels of the offending rows. Rules sharing a
+        name are reported under the first one's id and severity.
+        """
+        failures = self.build_failure_table(data)
+        # Failures grouped by rule in evaluation order, each rule's rows in row order
+        order = np.argsort(failures.rule_codes, kind="stable")
+        bounds = np.searchsorted(failures.rule_codes[order], np.arange(len(failures.rules) + 1))
+        
+        report = {}
+        for code, rule in enumerate(failures.rules):
+            positions = failures.row_positions[order[bounds[code]:bounds[code + 1]]]
+            entry = report.setdefault(rule["rule_name"], {
+                "rule_id": rule["rule_id"],
+                "severity": rule["severity"],
+                "failed": 0,
+                "row_indices": []
+            })
+            entry["failed"] += len(positions)
+            entry["row_indices"].extend(failures.index[positions].tolist())
+        return report
+    
+    def _iter_rule_masks(self, data: pd.DataFrame):
+        """Yield (rule, severity, failure mask) for every active rule, in row-mode order"""
+        for rule in self.rules + self.custom_rules:
+            if rule.is_active:
+                yield rule, rule.severity, self._rule_failure_mask(data, rule)
+        
+        for rule in self.consistency_rules:
+            if rule.is_active:
+                yield rule, rule.severity, self._consistency_failure_mask(data, rule)
+    
+    def _rule_failure_mask(self, data: pd.DataFrame, rule: DataRule) -> np.ndarray:
+        """Vectorized equivalent of _apply_rule: True where the record fails"""
+        if rule.field_name not in data.columns:
+            # Missing fields read as null in row mode, which always passes
+            return np.zeros(len(data), dtype=bool)
+        
+        column = data[rule.field_name]
+        present = column.notna().to_numpy()
+        
+        try:
+            if rule.rule_type.value == "data_type":
+                return self._data_type_failure_mask(column, present, rule)
+            elif rule.rule_type.value == "range_check":
+                return self._range_failure_mask(column, present, rule)
+            elif rule.rule_type.value == "format_validation":
+                return self._format_failure_mask(column, present, rule)
+        except Exception:
+            # Row mode reports a validation error as an invalid result
+            return np.ones(len(data), dtype=bool)
+        
+        return np.zeros(len(data), dtype=bool)
+    
+    def _data_type_failure_mask(self, column: pd.Series, present: np.ndarray, rule: DataRule) -> np.ndarray:
+        """Vectorized data type check"""
+        expected_type = rule.expected_value
+        dtype = column.dtype
+        
+        if expected_type in ("integer", "float") and pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            return np.zeros(len(column), dtype=bool)
+        if expected_type == "datetime" and pd.api.types.is_datetime64_any_dtype(dtype):
+            return np.zeros(len(column), dtype=bool)
+        if expected_type == "boolean" and pd.api.types.is_bool_dtype(dtype):
+            return np.zeros(len(column), dtype=bool)
+        
+        # Anything else (object, categorical, ...): scalar check on non-null values only
+        mask = np.zeros(len(column), dtype=bool)
+        mask[present] = ~column[present].map(lambda value: self._validate_data_type(value, rule)).to_numpy(dtype=bool)
+        return mask
+    
+    def _range_failure_mask(self, column: pd.Series, present: np.ndarray, rule: DataRule) -> np.ndarray:
+        """Vectorized range check"""
+        if pd.api.types.is_datetime64_any_dtype(column.dtype) or pd.api.types.is_timedelta64_dtype(column.dtype):
+            return present.copy()
+        
+        numeric = pd.to_numeric(column, errors="coerce").astype("float64").to_numpy()
+        unparsed = present & np.isnan(numeric)
+        if unparsed.any():
+            # Retry leftovers with float() so strings such as "nan" behave as in row mode
+            retried = column[unparsed].map(_to_float).to_numpy(dtype=object)
+            numeric[unparsed] = [np.nan if value is None else value for value in retried]
+            unparsed[unparsed] = [value is None for value in retried]
+        
+        mask = unparsed
+        with np.errstate(invalid="ignore"):
+            if rule.min_value is not None:
+                mask |= numeric < rule.min_value
+            if rule.max_value is not None:
+                mask |= numeric > rule.max_value
+        return mask
+    
+    def _format_failure_mask(self, column: pd.Series, present: np.ndarray, rule: DataRule) -> np.ndarray:
+        """Vectorized allowed-values / regex format check"""
+        mask = np.zeros(len(column), dtype=bool)
+        if not rule.allowed_values and not rule.pattern:
+            return mask
+        
+        values = column[present].astype(str)
+        if rule.allowed_values:
+            passed = values.isin(rule.allowed_values)
+        else:
+            passed = values.str.match(rule.pattern)
+        
+        mask[present] = ~passed.to_numpy(dtype=bool)
+        return mask
+    
+    def _consistency_failure_mask(self, data: pd.DataFrame, rule: ConsistencyRule) -> np.ndarray:
+        """Vectorized evaluation of one consistency rule: True where the record fails"""
+        return self._evaluate_consistency_rule(data, rule)[0]
+    
+    def _evaluate_consistency_rule(self, data: pd.DataFrame, rule: ConsistencyRule) -> Tuple[np.ndarray, Optional[str]]:
+        """Run a rule's compiled expression over whole columns
+        
+        Returns the failure mask and, if evaluation raised, the error message
+        (every record is then reported as failing, as in row mode).
+        """
+        try:
+            compiled = compile_rule_expression(rule.rule_expression)
+            return compiled.failure_mask(data), None
+        except Exception as e:
+            return np.ones(len(data), dtype=bool), str(e)
+    
     def validate_record(self, record: pd.Series, record_id: str) -> List[ValidationResult]:
         """Validate a single record against all rules"""
+        results = self._apply_field_rules(record, record_id)
+        
+        # Apply consistency rules
+        consistency_results = self._apply_consistency_rules(record, record_id)
+        results.extend(consistency_results)
+        
+        return results
+    
+    def _apply_field_rules(self, record: pd.Series, record_id: str) -> List[ValidationResult]:
+        """Apply all active field-level rules to a record"""
         results = []
         all_rules = self.rules + self.custom_rules
         
@@ -78,10 +298,6 @@ class DataValidator:
             result = self._apply_rule(record, rule, record_id)
             results.append(result)
         
-        # Apply consistency rules
-        consistency_results = self._apply_consistency_rules(record, record_id)
-        results.extend(consistency_results)
-        
         return results
     
     def _apply_rule(self, record: pd.Series, rule: DataRule, record_id: str) -> ValidationResult:
@@ -188,62 +404,42 @@ class DataValidator:
     def _apply_consistency_rules(self, record: pd.Series, record_id: str) -> List[ValidationResult]:
         """Apply cross-field consistency rules"""
         results = []
+        frame = pd.DataFrame([record.to_dict()]).infer_objects()
         
         for rule in self.consistency_rules:
             if not rule.is_active:
                 continue
             
-            is_valid = True
-            message = "Consistency check passed"
-            error_details = None
-            
-            try:
-                if rule.name == "Donation Date Logic":
-                    registration_date = record.get("registration_date")
-                    donation_date = record.get("donation_date")
-                    
-                    if pd.notna(registration_date) and pd.notna(donation_date):
-                        if donation_date < registration_date:
-                            is_valid = False
-                            error_details = {
-                                "registration_date": str(registration_date),
-                                "donation_date": str(donation_date)
-                            }
-                
-                elif rule.name == "Donation Interval Check":
-                    last_donation = record.get("last_donation_date")
-                    current_donation = record.get("donation_date")
-                    
-                    if pd.notna(last_donation) and pd.notna(current_donation):
-                        interval_days = (current_donation - last_donation).days
-                        if interval_days < 56:
-                            is_valid = False
-                            error_details = {
-                                "interval_days": interval_days,
-                                "minimum_required": 56
-                            }
-                
-                if not is_valid:
-                    message = f"Consistency rule '{rule.name}' failed: {rule.error_message}"
-                    
-            except Exception as e:
-                is_valid = False
-                message = f"Consistency check error: {str(e)}"
-                error_details = {"exception": str(e)}
-            
-            results.append(ValidationResult(
-                rule_id=rule.id or "unknown",
-                rule_name=rule.name,
-                field_name=", ".join(rule.fields_involved),
-                record_id=record_id,
-                is_valid=is_valid,
-                severity=rule.severity,
-                message=message,
-                error_details=error_details
-            ))
+            mask, error = self._evaluate_consistency_rule(frame, rule)
+            results.append(self._consistency_result(record, record_id, rule, bool(mask[0]), error))
         
         return results
     
+    def _consistency_result(self, record: pd.Series, record_id: str, rule: ConsistencyRule,
+                            failed: bool, error: Optional[str] = None) -> ValidationResult:
+        """Build the ValidationResult for one consistency rule on one record"""
+        is_valid = not failed
+        message = "Consistency check passed"
+        error_details = None
+        
+        if error is not None:
+            message = f"Consistency check error: {error}"
+            error_details = {"exception": error}
+        elif not is_valid:
+            message = f"Consistency rule '{rule.name}' failed: {rule.error_message}"
+            error_details = {field: str(record.get(field)) for field in rule.fields_involved}
+        
+        return ValidationResult(
+            rule_id=rule.id or "unknown",
+            rule_name=rule.name,
+            field_name=", ".join(rule.fields_involved),
+            record_id=record_id,
+            is_valid=is_valid,
+            severity=rule.severity,
+            message=message,
+            error_details=error_details
+        )
+    
     def get_quality_metrics(self, validation_results: List[ValidationResult]) -> Dict[str, float]:
         """Calculate data quality metrics"""
         if not validation_results:
@@ -253,12 +449,7 @@ class DataValidator:
         passed_checks = sum(1 for r in validation_results if r.is_valid)
         
         # Calculate scores by severity
-        severity_weights = {
-            ValidationSeverity.CRITICAL: 1.0,
-            ValidationSeverity.ERROR: 0.8,
-            ValidationSeverity.WARNING: 0.5,
-            ValidationSeverity.INFO: 0.2
-        }
+        severity_weights = self.SEVERITY_WEIGHTS
         
         weighted_score = 0.0
         total_weight = 0.0
@@ -279,6 +470,47 @@ class DataValidator:
             "validity_score": overall_score
         }
     
+    def get_batch_quality_metrics(self, batch_result: BatchValidationResult) -> Dict[str, float]:
+        """Calculate data quality metrics from the per-rule summary counts
+        
+        Gives the same scores as get_quality_metrics but works for both
+        validation modes, since it never looks at individual results.
+        """
+        severities = {rule.name: rule.severity for rule in self.rules + self.custom_rules + self.consistency_rules}
+        
+        total_checks = 0
+        passed_checks = 0
+        weighted_score = 0.0
+        total_weight = 0.0
+        consistency_checks = 0
+        consistency_passed = 0
+        
+        for rule_name, counts in batch_result.summary_by_rule.items():
+            checks = counts.get("valid", 0) + counts.get("invalid", 0)
+            weight = self.SEVERITY_WEIGHTS.get(severities.get(rule_name), 0.5)
+            
+            total_checks += checks
+            passed_checks += counts.get("valid", 0)
+            total_weight += weight * checks
+            weighted_score += weight * counts.get("valid", 0)
+            
+            if "consistency" in rule_name.lower():
+                consistency_checks += checks
+                consistency_passed += counts.get("valid", 0)
+        
+        if total_checks == 0:
+            return {"overall_score": 0.0}
+        
+        overall_score = (weighted_score / total_weight * 100) if total_weight > 0 else 0
+        
+        return {
+            "overall_score": overall_score,
+            "completeness_score": self._calculate_completeness([]),
+            "accuracy_score": (passed_checks / total_checks) * 100,
+            "consistency_score": (consistency_passed / consistency_checks) * 100 if consistency_checks else 100.0,
+            "validity_score": overall_score
+        }
+    
     def _calculate_completeness(self, results: List[ValidationResult]) -> float:
         """Calculate data completeness score"""
         # This would check for missing required fields
@@ -293,3 +525,11 @@ class DataValidator:
         
         passed = sum(1 for r in consistency_results if r.is_valid)
         return (passed / len(consistency_results)) * 100
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """float() conversion that returns None instead of raising"""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
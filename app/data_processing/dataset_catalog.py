@@ -0,0 +1,244 @@
+"""
+Durable dataset catalog: SQLite metadata plus one columnar file per dataset version
+"""
+
+import json
+import shutil
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from ..config import Config
+from ..models.validation import ValidationFailureTable
+from .dataset_store import dataframe_bytes, write_frame
+from .dataset_versions import own_columns
+
+DATASET_STATUSES = ["parsing", "ready", "failed"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    dataset_id TEXT PRIMARY KEY,
+    filename TEXT,
+    format TEXT,
+    upload_path TEXT,
+    size_bytes INTEGER,
+    status TEXT NOT NULL,
+    error TEXT,
+    current_version TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dataset_versions (
+    dataset_id TEXT NOT NULL REFERENCES datasets(dataset_id) ON DELETE CASCADE,
+    version TEXT NOT NULL,
+    data_path TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    columns TEXT NOT NULL,
+    memory_bytes INTEGER,
+    compaction TEXT,
+    parent_version TEXT,
+    inherited_columns TEXT,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (dataset_id, version)
+);
+CREATE TABLE IF NOT EXISTS validation_failures (
+    dataset_id TEXT NOT NULL REFERENCES datasets(dataset_id) ON DELETE CASCADE,
+    version TEXT NOT NULL,
+    data_path TEXT NOT NULL,
+    rules TEXT NOT NULL,
+    failures INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (dataset_id, version)
+);
+"""
+
+# Columns added after the first release of the catalog, with their definitions
+_ADDED_COLUMNS = {
+    "dataset_versions": {"compaction": "TEXT", "parent_version": "TEXT", "inherited_columns": "TEXT"}
+}
+
+
+class DatasetCatalog:
+    """Registered datasets and their versions, surviving API restarts
+
+    Each dataset row records the upload (file name, format, spooled path)
+    and its parse status; each version row points at an uncompressed
+    Feather file under ``data_dir`` that can be memory-mapped on demand.
+    A version derived from another one (see dataset_versions) stores only
+    the columns it does not inherit from its ``parent_version``. The
+    validation failures found in a version are kept next to it.
+    Opening the catalog reads nothing but the SQLite header, so startup
+    cost does not grow with the number of datasets.
+    """
+
+    def __init__(self, path: Optional[str] = None, data_dir: Optional[str] = None):
+        self.path = Path(path or Config.DATASET_CATALOG_PATH)
+        self.data_dir = Path(data_dir or Config.DATASET_DATA_DIR)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        # WAL lets several API worker processes read while one writes
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        self._connection.executescript(_SCHEMA)
+        self._migrate()
+
+    def register(self, dataset_id: str, filename: str, format: str, upload_path: Optional[str] = None,
+                 size_bytes: Optional[int] = None, status: str = "parsing") -> None:
+        """Add a dataset, or reset an existing one to a fresh upload"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO datasets (dataset_id, filename, format, upload_path, size_bytes, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(dataset_id) DO UPDATE SET filename = excluded.filename, format = excluded.format, "
+                "upload_path = excluded.upload_path, size_bytes = excluded.size_bytes, status = excluded.status, "
+                "error = NULL, updated_at = excluded.updated_at",
+                (dataset_id, filename, format, upload_path, size_bytes, status, now, now))
+
+    def set_status(self, dataset_id: str, status: str, error: Optional[str] = None) -> None:
+        if status not in DATASET_STATUSES:
+            raise ValueError(f"Unsupported dataset status: {status}. Supported statuses: {DATASET_STATUSES}")
+        with self._lock:
+            self._connection.execute("UPDATE datasets SET status = ?, error = ?, updated_at = ? WHERE dataset_id = ?",
+                                     (status, error, datetime.now().isoformat(), dataset_id))
+
+    def save_version(self, dataset_id: str, version: str, data: pd.DataFrame, make_current: bool = True,
+                     compaction: Optional[Dict[str, Any]] = None, parent_version: Optional[str] = None,
+                     inherited_columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Write one version's data file and record it; the file replaces any earlier one atomically
+
+        ``compaction`` is the report of compact_dataframe for this version, if
+        it was compacted. ``inherited_columns`` are shared with ``parent_version``
+        and left out of this version's file.
+        """
+        inherited_columns = list(inherited_columns or []) if parent_version else []
+        stored = own_columns(data, inherited_columns) if inherited_columns else data
+        data_path = write_frame(stored, str(self.data_dir / dataset_id / version))
+        record = {
+            "dataset_id": dataset_id,
+            "version": version,
+            "data_path": str(data_path),
+            "rows": int(data.shape[0]),
+            "cols": int(data.shape[1]),
+            "columns": [str(column) for column in data.columns],
+            "memory_bytes": dataframe_bytes(data),
+            "compaction": compaction,
+            "parent_version": parent_version if inherited_columns else None,
+            "inherited_columns": inherited_columns,
+            "created_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO dataset_versions "
+                "(dataset_id, version, data_path, rows, cols, columns, memory_bytes, compaction, "
+                "parent_version, inherited_columns, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (dataset_id, version, record["data_path"], record["rows"], record["cols"],
+                 json.dumps(record["columns"]), record["memory_bytes"],
+                 json.dumps(compaction) if compaction is not None else None,
+                 record["parent_version"], json.dumps(inherited_columns), record["created_at"]))
+            if make_current:
+                self._connection.execute(
+                    "UPDATE datasets SET current_version = ?, updated_at = ? WHERE dataset_id = ?",
+                    (version, record["created_at"], dataset_id))
+        return record
+
+    def save_validation_failures(self, dataset_id: str, version: str,
+                                 failures: Optional[ValidationFailureTable]) -> None:
+        """Keep the validation failures of one version; ``None`` forgets earlier ones"""
+        if failures is None:
+            with self._lock:
+                self._connection.execute("DELETE FROM validation_failures WHERE dataset_id = ? AND version = ?",
+                                         (dataset_id, version))
+            (self.data_dir / dataset_id / f"{version}.failures.feather").unlink(missing_ok=True)
+            (self.data_dir / dataset_id / f"{version}.failures.pkl").unlink(missing_ok=True)
+            return
+
+        data_path = write_frame(failures.to_frame(), str(self.data_dir / dataset_id / f"{version}.failures"))
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO validation_failures (dataset_id, version, data_path, rules, failures, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (dataset_id, version, str(data_path), json.dumps(failures.rules, default=str), len(failures),
+                 datetime.now().isoformat()))
+
+    def get_validation_failures(self, dataset_id: str, version: str) -> Optional[Dict[str, Any]]:
+        """Where a version's failures are stored and their rules; rebuild with ValidationFailureTable.from_frame"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM validation_failures WHERE dataset_id = ? AND version = ?",
+                (dataset_id, version)).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record["rules"] = json.loads(record["rules"])
+        return record
+
+    def get(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        """The dataset row, or None if it was never registered"""
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM datasets WHERE dataset_id = ?", (dataset_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def get_version(self, dataset_id: str, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """One version's metadata; ``None`` picks the dataset's current version"""
+        with self._lock:
+            if version is None:
+                row = self._connection.execute(
+                    "SELECT v.* FROM dataset_versions v JOIN datasets d "
+                    "ON v.dataset_id = d.dataset_id AND v.version = d.current_version WHERE d.dataset_id = ?",
+                    (dataset_id,)).fetchone()
+            else:
+                row = self._connection.execute(
+                    "SELECT * FROM dataset_versions WHERE dataset_id = ? AND version = ?",
+                    (dataset_id, version)).fetchone()
+        return self._version_record(row) if row is not None else None
+
+    def list_versions(self, dataset_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM dataset_versions WHERE dataset_id = ? ORDER BY created_at", (dataset_id,)).fetchall()
+        return [self._version_record(row) for row in rows]
+
+    def delete(self, dataset_id: str) -> None:
+        """Forget a dataset and remove its version files (the spooled upload is left alone)"""
+        with self._lock:
+            self._connection.execute("DELETE FROM datasets WHERE dataset_id = ?", (dataset_id,))
+        shutil.rmtree(self.data_dir / dataset_id, ignore_errors=True)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _migrate(self) -> None:
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {row["name"] for row in self._connection.execute(f"PRAGMA table_info({table})")}
+            for column, definition in columns.items():
+                if column not in existing:
+                    self._connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _version_record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        record["columns"] = json.loads(record["columns"])
+        record["compaction"] = json.loads(record["compaction"]) if record["compaction"] else None
+        record["inherited_columns"] = json.loads(record["inherited_columns"]) if record["inherited_columns"] else []
+        return record
+
+
+_DATASET_CATALOG: Optional[DatasetCatalog] = None
+_DATASET_CATALOG_LOCK = threading.Lock()
+
+
+def get_dataset_catalog() -> DatasetCatalog:
+    """Process-wide dataset catalog stored at Config.DATASET_CATALOG_PATH"""
+    global _DATASET_CATALOG
+    with _DATASET_CATALOG_LOCK:
+        if _DATASET_CATALOG is None:
+            _DATASET_CATALOG = DatasetCatalog()
+        return _DATASET_CATALOG
@@ -0,0 +1,341 @@
+"""
+Server-side dataset queries: projection, filters, sorting and cursor pagination over lazily indexed columns
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import Config
+
+# Same operators as the SQL and columnar importers, plus case-insensitive substring matching
+QUERY_OPERATORS = ["=", "==", "!=", "<", "<=", ">", ">=", "in", "not in", "contains"]
+
+# Hot filter columns that get a sorted index the first time a query filters or sorts on them
+INDEXED_COLUMNS = ["donation_date", "blood_type", "location", "donor_id"]
+
+
+class ColumnIndex:
+    """Row positions of one column sorted by value, for range lookups by binary search
+
+    Null values are kept apart: like the importers' SQL filters, no
+    predicate matches them except ``= None``.
+    """
+
+    def __init__(self, values: pd.Series):
+        self.dtype = values.dtype
+        keys = _index_keys(values)
+        valid = ~pd.isna(keys)
+        order = np.argsort(keys[valid], kind="stable")
+        self.positions = np.flatnonzero(valid)[order]
+        self.keys = keys[valid][order]
+        self.null_positions = np.flatnonzero(~valid)
+        self.size = len(values)
+        self._descending: Optional[np.ndarray] = None
+
+    def lookup(self, operator: str, value: Any) -> np.ndarray:
+        """Ascending row positions matching ``column <operator> value``"""
+        if operator in ("=", "==") and value is None:
+            return self.null_positions
+        if operator == "!=" and value is None:
+            return np.sort(self.positions)
+        if operator in ("in", "not in"):
+            # Numbers keep their own type: 1.5 must not be truncated to match an integer key of 1
+            keys = np.array([self._key(item) for item in value if item is not None],
+                            dtype=self.keys.dtype if self.keys.dtype.kind in "OM" else None)
+            starts = np.searchsorted(self.keys, keys, side="left")
+            ends = np.searchsorted(self.keys, keys, side="right")
+            # Duplicate values in the list would match the same rows twice
+            runs = np.unique(np.stack([starts, ends], axis=1), axis=0) if len(keys) else np.empty((0, 2), dtype=np.intp)
+            matches = [self.positions[start:end] for start, end in runs if end > start]
+            matched = np.sort(np.concatenate(matches)) if matches else np.empty(0, dtype=np.intp)
+            if operator == "in":
+                return matched
+            return np.sort(np.setdiff1d(self.positions, matched, assume_unique=True))
+
+        key = self._key(value)
+        if operator == "!=":
+            return np.sort(np.setdiff1d(self.positions, self.positions[self._bounds("=", key)], assume_unique=True))
+        return np.sort(self.positions[self._bounds(operator, key)])
+
+    def order(self, positions: Optional[np.ndarray], descending: bool = False) -> np.ndarray:
+        """``positions`` (all rows if None) in value order, nulls last, ties in row order"""
+        ordered = self._descending_positions() if descending else self.positions
+        ordered = np.concatenate([ordered, self.null_positions])
+        if positions is None:
+            return ordered
+        selected = np.zeros(self.size, dtype=bool)
+        selected[positions] = True
+        return ordered[selected[ordered]]
+
+    def _descending_positions(self) -> np.ndarray:
+        # Runs of equal values in reverse, each still in row order
+        if self._descending is None:
+            runs = np.cumsum(np.r_[True, self.keys[1:] != self.keys[:-1]]) if len(self.keys) else np.empty(0, dtype=np.intp)
+            self._descending = self.positions[np.lexsort((self.positions, -runs))]
+        return self._descending
+
+    def _bounds(self, operator: str, key: Any) -> slice:
+        if operator in ("=", "=="):
+            return slice(np.searchsorted(self.keys, key, side="left"), np.searchsorted(self.keys, key, side="right"))
+        if operator == "<":
+            return slice(0, np.searchsorted(self.keys, key, side="left"))
+        if operator == "<=":
+            return slice(0, np.searchsorted(self.keys, key, side="right"))
+        if operator == ">":
+            return slice(np.searchsorted(self.keys, key, side="right"), len(self.keys))
+        if operator == ">=":
+            return slice(np.searchsorted(self.keys, key, side="left"), len(self.keys))
+        raise ValueError(f"Unsupported indexed operator: {operator}")
+
+    def _key(self, value: Any) -> Any:
+        if pd.api.types.is_datetime64_any_dtype(self.dtype):
+            # Keys of tz-aware columns are naive UTC
+            timestamp = _column_timestamp(value, self.dtype)
+            return (timestamp.tz_convert(None) if timestamp.tzinfo else timestamp).to_datetime64()
+        if self.keys.dtype == object and not isinstance(value, str):
+            raise TypeError(f"Expected a string, got {type(value).__name__}")
+        if self.keys.dtype != object and isinstance(value, str):
+            raise TypeError("Expected a number, got a string")
+        return value
+
+
+class DatasetIndexes:
+    """Column indexes per dataset version, built on first use and kept for the most recent versions
+
+    Keys are the store keys of dataset versions. Versions are immutable, so
+    an index stays valid until the version is replaced; call ``discard``
+    when that happens. Frames reloaded after eviction keep their row order,
+    so their indexes survive eviction.
+    """
+
+    def __init__(self, max_versions: Optional[int] = None, indexed_columns: Optional[List[str]] = None):
+        self.max_versions = Config.QUERY_INDEX_CACHE_VERSIONS if max_versions is None else max_versions
+        self.indexed_columns = list(INDEXED_COLUMNS if indexed_columns is None else indexed_columns)
+        self._lock = threading.Lock()
+        self._indexes: "OrderedDict[str, Dict[str, Optional[ColumnIndex]]]" = OrderedDict()
+
+    def get(self, key: str, data: pd.DataFrame, column: str) -> Optional[ColumnIndex]:
+        """The index of ``column`` in version ``key``, or None if the column is not indexable"""
+        if column not in self.indexed_columns or column not in data.columns:
+            return None
+        with self._lock:
+            indexes = self._indexes.setdefault(key, {})
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.max_versions:
+                self._indexes.popitem(last=False)
+            if column not in indexes:
+                # Mixed-type columns cannot be sorted; remember that and scan them instead
+                try:
+                    indexes[column] = ColumnIndex(data[column])
+                except TypeError:
+                    indexes[column] = None
+            return indexes[column]
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._indexes.pop(key, None)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {key: sorted(column for column, index in indexes.items() if index is not None)
+                    for key, indexes in self._indexes.items()}
+
+
+def query_dataframe(data: pd.DataFrame, columns: Optional[Sequence[str]] = None,
+                    filters: Optional[Sequence[Tuple[str, str, Any]]] = None,
+                    sort: Optional[Sequence[Tuple[str, bool]]] = None, limit: int = 100,
+                    cursor: Optional[str] = None, indexes: Optional[DatasetIndexes] = None,
+                    index_key: Optional[str] = None) -> Dict[str, Any]:
+    """One page of a dataset matching ``filters``, sorted and projected
+
+    ``filters`` are ``(column, op, value)`` tuples (see QUERY_OPERATORS),
+    all of which must match; ``sort`` is ``(column, descending)`` pairs,
+    with nulls last and ties kept in row order so pages never overlap.
+    Filters on indexed columns are answered by binary search and evaluated
+    first, so the remaining filters only scan the rows still in play.
+    ``cursor`` is the ``next_cursor`` of the previous page of the same query.
+    Raises ValueError for unknown columns, operators or a cursor that
+    belongs to another query.
+    """
+    filters = [(column, operator.lower(), value) for column, operator, value in (filters or [])]
+    sort = list(sort or [])
+    columns = list(columns) if columns else list(data.columns)
+    unknown = [column for column in dict.fromkeys(columns + [f[0] for f in filters] + [s[0] for s in sort])
+               if column not in data.columns]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown}")
+    for _, operator, value in filters:
+        if operator not in QUERY_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {operator}. Supported operators: {QUERY_OPERATORS}")
+        if operator in ("in", "not in") and not isinstance(value, (list, tuple, set)):
+            raise ValueError(f"Operator '{operator}' needs a list of values")
+
+    signature = _query_signature(columns, filters, sort)
+    offset = _decode_cursor(cursor, signature) if cursor else 0
+
+    def index_of(column: str) -> Optional[ColumnIndex]:
+        if indexes is None or index_key is None:
+            return None
+        return indexes.get(index_key, data, column)
+
+    # Indexed filters first: each narrows the candidate rows by binary search
+    positions: Optional[np.ndarray] = None
+    indexes_used = []
+    scanned = []
+    for column, operator, value in filters:
+        index = index_of(column) if operator != "contains" else None
+        if index is None:
+            scanned.append((column, operator, value))
+            continue
+        try:
+            matched = index.lookup(operator, value)
+        except (TypeError, ValueError):
+            # The value does not compare with the indexed keys; let pandas decide
+            scanned.append((column, operator, value))
+            continue
+        positions = matched if positions is None else np.intersect1d(positions, matched, assume_unique=True)
+        indexes_used.append(column)
+
+    for column, operator, value in scanned:
+        values = data[column] if positions is None else data[column].iloc[positions]
+        mask = _filter_mask(values, operator, value)
+        positions = np.flatnonzero(mask) if positions is None else positions[mask]
+
+    total = len(data) if positions is None else len(positions)
+    positions = _sorted_positions(data, positions, sort, index_of, indexes_used)
+
+    page = positions[offset:offset + limit] if positions is not None else np.arange(offset, min(offset + limit, total))
+    next_offset = offset + len(page)
+    return {
+        "columns": columns,
+        "rows": frame_records(data.iloc[page][columns]),
+        "total": int(total),
+        "offset": int(offset),
+        "limit": int(limit),
+        "next_cursor": _encode_cursor(next_offset, signature) if next_offset < total else None,
+        "indexes_used": list(dict.fromkeys(indexes_used))
+    }
+
+
+def frame_records(data: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Rows as JSON-safe dicts: NaN and NaT become None, timestamps ISO strings, numpy scalars Python ones"""
+    return json.loads(data.to_json(orient="records", date_format="iso"))
+
+
+def _index_keys(values: pd.Series) -> np.ndarray:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        if getattr(values.dtype, "tz", None) is not None:
+            values = values.dt.tz_convert(None)
+        return values.to_numpy(dtype="datetime64[ns]")
+    if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+        # 64-bit keys, so searching for a Python number never converts the whole array
+        if pd.api.types.is_integer_dtype(values.dtype) and not pd.api.types.is_extension_array_dtype(values.dtype):
+            return values.to_numpy(dtype=np.int64)
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    if pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):
+        raise TypeError(f"Column {values.name} holds mixed types and cannot be indexed")
+    return values.to_numpy(dtype=object)
+
+
+def _column_timestamp(value: Any, dtype: Any) -> pd.Timestamp:
+    """``value`` as a timestamp comparable with a datetime column of ``dtype``
+
+    Like the importers' filters, naive values on a tz-aware column are local
+    times in the column's zone, and aware values on a naive column are
+    converted to naive UTC.
+    """
+    timestamp = pd.Timestamp(value)
+    tz = getattr(dtype, "tz", None)
+    if tz is not None:
+        return timestamp.tz_convert(tz) if timestamp.tzinfo else timestamp.tz_localize(tz)
+    return timestamp.tz_convert(None) if timestamp.tzinfo else timestamp
+
+
+def _filter_mask(values: pd.Series, operator: str, value: Any) -> np.ndarray:
+    if operator in ("=", "==") and value is None:
+        return values.isna().to_numpy()
+    if operator == "!=" and value is None:
+        return values.notna().to_numpy()
+    if operator == "contains":
+        return values.astype(str).str.contains(str(value), case=False, regex=False).to_numpy() & values.notna().to_numpy()
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Unordered categoricals do not support ordering comparisons
+        values = values.astype(object)
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        value = [_column_timestamp(item, values.dtype) for item in value if item is not None] \
+            if operator in ("in", "not in") else _column_timestamp(value, values.dtype)
+
+    if operator in ("=", "=="):
+        mask = values == value
+    elif operator == "!=":
+        mask = values != value
+    elif operator == "<":
+        mask = values < value
+    elif operator == "<=":
+        mask = values <= value
+    elif operator == ">":
+        mask = values > value
+    elif operator == ">=":
+        mask = values >= value
+    elif operator == "in":
+        mask = values.isin(list(value))
+    else:
+        mask = ~values.isin(list(value))
+    # Nulls match no comparison, as in SQL
+    return (mask & values.notna()).to_numpy(dtype=bool)
+
+
+def _sorted_positions(data: pd.DataFrame, positions: Optional[np.ndarray], sort: List[Tuple[str, bool]],
+                      index_of: Any, indexes_used: List[str]) -> Optional[np.ndarray]:
+    if not sort:
+        return positions
+    if len(sort) == 1:
+        column, descending = sort[0]
+        index = index_of(column)
+        if index is not None:
+            indexes_used.append(column)
+            return index.order(positions, descending=descending)
+
+    subset = data[[column for column, _ in sort]]
+    if positions is not None:
+        subset = subset.iloc[positions]
+    subset = subset.reset_index(drop=True)
+    for column in subset.columns:
+        if isinstance(subset[column].dtype, pd.CategoricalDtype):
+            # Categoricals sort by category order; queries sort by value
+            subset[column] = subset[column].astype(object)
+    order = subset.sort_values([column for column, _ in sort], ascending=[not descending for _, descending in sort],
+                               kind="stable", na_position="last").index.to_numpy()
+    return order if positions is None else positions[order]
+
+
+def _query_signature(columns: List[str], filters: List[Tuple[str, str, Any]], sort: List[Tuple[str, bool]]) -> str:
+    payload = json.dumps([columns, filters, sort], default=str, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _encode_cursor(offset: int, signature: str) -> str:
+    payload = json.dumps({"offset": offset, "query": signature}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def _decode_cursor(cursor: str, signature: str) -> int:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        offset = int(payload["offset"])
+        query = payload["query"]
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+        raise ValueError("Invalid cursor")
+    if query != signature or offset < 0:
+        raise ValueError("Cursor belongs to a different query")
+    return offset
@@ -0,0 +1,233 @@
+"""
+Memory-budgeted dataset store with LRU eviction and spill-to-disk
+"""
+
+import logging
+import os
+import pickle
+import shutil
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from ..config import Config
+
+_MB = 1024 * 1024
+
+
+def dataframe_bytes(data: pd.DataFrame) -> int:
+    """In-memory size of a DataFrame, including the Python objects in object columns"""
+    return int(data.memory_usage(index=True, deep=True).sum())
+
+
+def write_frame(data: pd.DataFrame, path_stem: str) -> Path:
+    """Write a frame as uncompressed Feather (``<stem>.feather``), or pickle (``<stem>.pkl``) if Arrow cannot hold it
+
+    The file is written under a temporary name and moved into place, so
+    readers never see a partial file and frames still memory-mapped from a
+    previous file keep their data.
+    """
+    path_stem = Path(path_stem)
+    path_stem.parent.mkdir(parents=True, exist_ok=True)
+    if PYARROW_AVAILABLE:
+        path = path_stem.with_name(f"{path_stem.name}.feather")
+        temporary_path = path.with_name(f"{path.name}.tmp")
+        try:
+            table = pa.Table.from_pandas(data, preserve_index=None)
+            # Uncompressed, so reads can memory-map the column buffers
+            feather.write_feather(table, str(temporary_path), compression="uncompressed")
+            os.replace(temporary_path, path)
+            path_stem.with_name(f"{path_stem.name}.pkl").unlink(missing_ok=True)
+            return path
+        except (pa.ArrowException, TypeError, ValueError):
+            # Mixed-type object columns cannot be represented in Arrow
+            temporary_path.unlink(missing_ok=True)
+
+    path = path_stem.with_name(f"{path_stem.name}.pkl")
+    temporary_path = path.with_name(f"{path.name}.tmp")
+    with open(temporary_path, "wb") as handle:
+        pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, path)
+    path_stem.with_name(f"{path_stem.name}.feather").unlink(missing_ok=True)
+    return path
+
+
+def read_frame(path: Path) -> pd.DataFrame:
+    """Read a file written by write_frame; Feather files are memory-mapped"""
+    path = Path(path)
+    if path.suffix == ".pkl":
+        with open(path, "rb") as handle:
+            return pickle.load(handle)
+
+    data = feather.read_table(str(path), memory_map=True).to_pandas(split_blocks=True)
+    # Arrow nulls come back as None in object columns; the frame was stored with NaN
+    for column in data.columns[data.dtypes == object]:
+        if data[column].isna().any():
+            data[column] = data[column].where(data[column].notna(), np.nan)
+    return data
+
+
+class DatasetStore(MutableMapping):
+    """Datasets by id, kept in memory up to a byte budget
+
+    Behaves like a dict of DataFrames. When the resident datasets exceed
+    ``memory_budget_mb``, the least recently used ones are written to an
+    uncompressed Feather file in ``spill_dir`` and dropped from memory; the
+    next lookup memory-maps the file back, so numeric columns are read
+    without copying. Frames that Arrow cannot represent (mixed-type object
+    columns) are pickled instead. The most recently stored dataset is never
+    spilled, so one dataset larger than the budget stays resident.
+
+    Datasets that already have a durable source (a file written by
+    write_frame, see DatasetCatalog, or a function that rebuilds the frame)
+    are registered with ``store(..., source=...)`` or ``attach``: they are
+    evicted without writing anything and their files are never deleted.
+
+    Frames handed out are shared, not copied: replace a dataset by storing
+    a new frame rather than modifying the returned one in place.
+    """
+
+    def __init__(self, memory_budget_mb: Optional[float] = None, spill_dir: Optional[str] = None):
+        budget_mb = Config.DATASET_MEMORY_BUDGET_MB if memory_budget_mb is None else memory_budget_mb
+        self.memory_budget_bytes = int(budget_mb * _MB)
+        # One directory per process, so API workers never read each other's spill files
+        self.spill_dir = Path(spill_dir or Config.DATASET_SPILL_DIR) / str(os.getpid())
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.RLock()
+        self._resident: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        # How to get each evicted dataset back; a reloaded dataset keeps its source until it is replaced
+        self._sources: Dict[str, Callable[[], pd.DataFrame]] = {}
+        # Spill files written by this store, as opposed to durable sources owned elsewhere
+        self._spill_files: Dict[str, Path] = {}
+        self._resident_bytes = 0
+        self._evictions = 0
+        self._reloads = 0
+
+    def __getitem__(self, dataset_id: str) -> pd.DataFrame:
+        with self._lock:
+            data = self._resident.get(dataset_id)
+            if data is not None:
+                self._resident.move_to_end(dataset_id)
+                return data
+            if dataset_id not in self._sources:
+                raise KeyError(dataset_id)
+
+            data = self._sources[dataset_id]()
+            self._add_resident(dataset_id, data)
+            self._reloads += 1
+            return data
+
+    def __setitem__(self, dataset_id: str, data: pd.DataFrame) -> None:
+        self.store(dataset_id, data)
+
+    def store(self, dataset_id: str, data: pd.DataFrame,
+              source: Union[str, Path, Callable[[], pd.DataFrame], None] = None) -> None:
+        """Store a dataset; ``source`` (a write_frame file or a loader) reproduces it after eviction"""
+        with self._lock:
+            self._discard(dataset_id)
+            if source is not None:
+                self._sources[dataset_id] = _as_loader(source)
+            self._add_resident(dataset_id, data)
+
+    def attach(self, dataset_id: str, source: Union[str, Path, Callable[[], pd.DataFrame]]) -> None:
+        """Register a dataset by its durable source only; it is loaded on first access"""
+        with self._lock:
+            self._discard(dataset_id)
+            self._sources[dataset_id] = _as_loader(source)
+
+    def __delitem__(self, dataset_id: str) -> None:
+        with self._lock:
+            if dataset_id not in self:
+                raise KeyError(dataset_id)
+            self._discard(dataset_id)
+
+    def __contains__(self, dataset_id: object) -> bool:
+        with self._lock:
+            return dataset_id in self._resident or dataset_id in self._sources
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._resident) + self._spilled_ids())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._resident) + len(self._spilled_ids())
+
+    def is_resident(self, dataset_id: str) -> bool:
+        with self._lock:
+            return dataset_id in self._resident
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "datasets": len(self),
+                "resident": len(self._resident),
+                "spilled": len(self._spilled_ids()),
+                "resident_mb": round(self._resident_bytes / _MB, 3),
+                "memory_budget_mb": round(self.memory_budget_bytes / _MB, 3),
+                "evictions": self._evictions,
+                "reloads": self._reloads
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._resident.clear()
+            self._sizes.clear()
+            self._sources.clear()
+            self._spill_files.clear()
+            self._resident_bytes = 0
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def _spilled_ids(self) -> List[str]:
+        return [dataset_id for dataset_id in self._sources if dataset_id not in self._resident]
+
+    def _add_resident(self, dataset_id: str, data: pd.DataFrame) -> None:
+        size = dataframe_bytes(data)
+        self._resident[dataset_id] = data
+        self._sizes[dataset_id] = size
+        self._resident_bytes += size
+        self._evict()
+
+    def _discard(self, dataset_id: str) -> None:
+        if dataset_id in self._resident:
+            del self._resident[dataset_id]
+            self._resident_bytes -= self._sizes.pop(dataset_id)
+        self._sources.pop(dataset_id, None)
+        spill_path = self._spill_files.pop(dataset_id, None)
+        if spill_path is not None:
+            spill_path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Spill least recently used datasets until the resident ones fit the budget"""
+        while self._resident_bytes > self.memory_budget_bytes and len(self._resident) > 1:
+            dataset_id, data = self._resident.popitem(last=False)
+            size = self._sizes.pop(dataset_id)
+            self._resident_bytes -= size
+            if dataset_id not in self._sources:
+                spill_path = write_frame(data, str(self.spill_dir / dataset_id))
+                self._spill_files[dataset_id] = spill_path
+                self._sources[dataset_id] = _as_loader(spill_path)
+                self.logger.info(f"Spilled dataset {dataset_id} ({size / _MB:.1f} MB) to {spill_path}")
+            self._evictions += 1
+
+
+def _as_loader(source: Union[str, Path, Callable[[], pd.DataFrame]]) -> Callable[[], pd.DataFrame]:
+    if callable(source):
+        return source
+    path = Path(source)
+    return lambda: read_frame(path)
@@ -0,0 +1,49 @@
+"""
+Copy-on-write dataset versions that share unchanged columns with their parent version
+"""
+
+from typing import List, Tuple
+
+import pandas as pd
+
+# Pipeline stages kept as dataset versions, each derived from the one before it
+DATASET_VERSIONS = ["raw", "cleaned", "transformed"]
+
+
+def share_unchanged_columns(data: pd.DataFrame, parent: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+    """Rebuild ``data`` so columns identical to ``parent``'s reuse the parent's arrays
+
+    Columns are shared only when the rows are the same (equal indexes) and
+    the column has the same dtype and values. Returns the rebuilt frame and
+    the shared column names; frames with different rows come back as is.
+    """
+    if data.columns.has_duplicates or not data.index.equals(parent.index):
+        return data, []
+
+    shared = [column for column in data.columns
+              if column in parent.columns and data[column].dtype == parent[column].dtype
+              and data[column].equals(parent[column])]
+    if not shared:
+        return data, []
+    return assemble_version(parent, data, list(data.columns), shared), shared
+
+
+def own_columns(data: pd.DataFrame, inherited_columns: List[str]) -> pd.DataFrame:
+    """The columns a version stores itself: everything not inherited from its parent"""
+    inherited = set(inherited_columns)
+    columns = [data[column] for column in data.columns if column not in inherited]
+    if not columns:
+        return pd.DataFrame(index=data.index)
+    return pd.concat(columns, axis=1, copy=False)
+
+
+def assemble_version(parent: pd.DataFrame, own: pd.DataFrame, columns: List[str],
+                     inherited_columns: List[str]) -> pd.DataFrame:
+    """A version's frame from its parent's inherited columns and its own, without copying either"""
+    inherited = set(inherited_columns)
+    if not columns:
+        return pd.DataFrame(index=parent.index)
+    parts = [parent[column] if column in inherited else own[column] for column in columns]
+    # Own columns read back from disk carry an equal but separate index object
+    parts = [part if part.index is parent.index else part.set_axis(parent.index, copy=False) for part in parts]
+    return pd.concat(parts, axis=1, copy=False)
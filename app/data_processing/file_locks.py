@@ -0,0 +1,78 @@
+"""
+Atomic replacement and cross-process locking for state files shared by workers
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    # Windows
+    import msvcrt
+    FCNTL_AVAILABLE = False
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Exclusive lock on ``{path}.lock``, held across threads and processes until the block exits
+
+    Callers re-read the state file inside the lock before changing it, so
+    concurrent writers merge their changes instead of overwriting each other.
+    """
+    lock_path = Path(f"{path}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as handle:
+        _acquire(handle)
+        try:
+            yield
+        finally:
+            _release(handle)
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "w", encoding: Optional[str] = None) -> Iterator[IO]:
+    """Write to a unique temporary file next to ``path``, moved into place only when the block succeeds
+
+    Readers never see a torn file, and concurrent writers never share a
+    temporary file.
+    """
+    directory = Path(path).absolute().parent
+    directory.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=f".{Path(path).name}.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, mode, encoding=encoding) as handle:
+            yield handle
+        os.replace(temporary_path, path)
+    except BaseException:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        raise
+
+
+def _acquire(handle: IO) -> None:
+    if FCNTL_AVAILABLE:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        return
+    handle.seek(0)
+    while True:
+        try:
+            # LK_LOCK gives up after about 10 seconds; keep waiting like flock does
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _release(handle: IO) -> None:
+    if FCNTL_AVAILABLE:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
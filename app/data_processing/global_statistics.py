@@ -0,0 +1,185 @@
+"""
+Dataset-wide statistics for deterministic chunked processing
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Fields derived from dates during transformation, with the values the transformer uses
+DERIVED_DAY_FIELDS = {
+    "days_since_last_donation": ("donation_date", "last_donation_date", 365),
+    "days_since_registration": ("donation_date", "registration_date", None)
+}
+
+
+class GlobalStatistics:
+    """Streaming statistics over a whole dataset, collected chunk by chunk
+
+    Numeric fields keep merged value counts, so quantiles are exact until a
+    field exceeds ``max_distinct`` distinct values. After that the values
+    are rounded to fewer significant digits and the quantiles become
+    approximate. Categorical fields keep value counts for the mode.
+
+    Once ``freeze()`` is called the statistics are read-only, and
+    DataCleaner/DataTransformer use them instead of per-chunk values.
+    """
+
+    def __init__(self, numeric_fields: List[str], categorical_fields: List[str],
+                 max_distinct: int = 100000):
+        self.numeric_fields = list(numeric_fields)
+        self.categorical_fields = list(categorical_fields)
+        self.max_distinct = max_distinct
+        self.total_records = 0
+        self.missing_counts: Dict[str, int] = {}
+        self.value_counts: Dict[str, pd.Series] = {}
+        self.minimums: Dict[str, float] = {}
+        self.maximums: Dict[str, float] = {}
+        self.approximate_fields = set()
+        self.frozen = False
+        self._quantile_cache: Dict[tuple, Optional[float]] = {}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Fold one chunk into the statistics"""
+        if self.frozen:
+            raise RuntimeError("Cannot update frozen statistics")
+
+        self.total_records += len(chunk)
+
+        for field in self.numeric_fields + self.categorical_fields:
+            if field not in chunk.columns:
+                continue
+            self.missing_counts[field] = self.missing_counts.get(field, 0) + int(chunk[field].isna().sum())
+
+        for field in self.numeric_fields:
+            if field in chunk.columns:
+                self._update_numeric(field, pd.to_numeric(chunk[field], errors="coerce"))
+
+        for field, (end_field, start_field, fill_value) in DERIVED_DAY_FIELDS.items():
+            if end_field in chunk.columns and start_field in chunk.columns:
+                days = (pd.to_datetime(chunk[end_field], errors="coerce") -
+                        pd.to_datetime(chunk[start_field], errors="coerce")).dt.days
+                if fill_value is not None:
+                    days = days.fillna(fill_value)
+                self._update_range(field, days)
+
+        for field in self.categorical_fields:
+            if field in chunk.columns:
+                self._merge_counts(field, chunk[field].value_counts())
+
+    def freeze(self) -> "GlobalStatistics":
+        """Mark the statistics as final"""
+        self.frozen = True
+        return self
+
+    def missing_ratio(self, field: str) -> Optional[float]:
+        if field not in self.missing_counts or self.total_records == 0:
+            return None
+        return self.missing_counts[field] / self.total_records
+
+    def has_field(self, field: str) -> bool:
+        return field in self.value_counts or field in self.minimums
+
+    def quantile(self, field: str, q: float) -> Optional[float]:
+        """Quantile with pandas' default linear interpolation"""
+        key = (field, q)
+        if key not in self._quantile_cache:
+            self._quantile_cache[key] = self._compute_quantile(field, q)
+        return self._quantile_cache[key]
+
+    def median(self, field: str) -> Optional[float]:
+        return self.quantile(field, 0.5)
+
+    def mode(self, field: str) -> Any:
+        """Most frequent value; ties resolve to the smallest value like Series.mode()[0]"""
+        counts = self.value_counts.get(field)
+        if counts is None or counts.empty:
+            return None
+        top = counts[counts == counts.max()].index
+        try:
+            return sorted(top)[0]
+        except TypeError:
+            return top[0]
+
+    def min(self, field: str) -> Optional[float]:
+        return self.minimums.get(field)
+
+    def max(self, field: str) -> Optional[float]:
+        return self.maximums.get(field)
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-safe overview of the collected statistics"""
+        return {
+            "total_records": self.total_records,
+            "fields": {
+                field: {
+                    "missing_ratio": self.missing_ratio(field),
+                    "min": self.min(field),
+                    "max": self.max(field),
+                    "q1": self.quantile(field, 0.25) if field in self.numeric_fields else None,
+                    "median": self.median(field) if field in self.numeric_fields else None,
+                    "q3": self.quantile(field, 0.75) if field in self.numeric_fields else None
+                }
+                for field in self.numeric_fields if self.has_field(field)
+            },
+            "modes": {field: str(self.mode(field)) for field in self.categorical_fields if field in self.value_counts},
+            "approximate_fields": sorted(self.approximate_fields)
+        }
+
+    def _update_numeric(self, field: str, values: pd.Series) -> None:
+        values = values.dropna().astype("float64")
+        self._update_range(field, values)
+        self._merge_counts(field, values.value_counts())
+
+        if len(self.value_counts[field]) > self.max_distinct:
+            self.value_counts[field] = self._compress(self.value_counts[field])
+            self.approximate_fields.add(field)
+
+    def _update_range(self, field: str, values: pd.Series) -> None:
+        values = values.dropna()
+        if values.empty:
+            return
+        low, high = float(values.min()), float(values.max())
+        self.minimums[field] = min(low, self.minimums.get(field, low))
+        self.maximums[field] = max(high, self.maximums.get(field, high))
+
+    def _merge_counts(self, field: str, counts: pd.Series) -> None:
+        if field in self.value_counts:
+            counts = self.value_counts[field].add(counts, fill_value=0)
+        self.value_counts[field] = counts.astype("int64")
+
+    def _compress(self, counts: pd.Series) -> pd.Series:
+        """Round values to fewer significant digits until few enough remain"""
+        for digits in range(6, 0, -1):
+            values = counts.index.to_numpy(dtype="float64")
+            magnitude = np.where(values == 0, 1.0, 10.0 ** (np.floor(np.log10(np.abs(values))) - digits + 1))
+            rounded = counts.groupby(np.round(values / magnitude) * magnitude).sum()
+            if len(rounded) <= self.max_distinct:
+                return rounded
+            counts = rounded
+        return counts
+
+    def _compute_quantile(self, field: str, q: float) -> Optional[float]:
+        counts = self.value_counts.get(field)
+        if counts is None or counts.empty:
+            return None
+
+        counts = counts.sort_index()
+        values = counts.index.to_numpy(dtype="float64")
+        cumulative = np.cumsum(counts.to_numpy())
+
+        position = (cumulative[-1] - 1) * q
+        lower_rank, upper_rank = int(np.floor(position)), int(np.ceil(position))
+        lower = values[np.searchsorted(cumulative, lower_rank, side="right")]
+        upper = values[np.searchsorted(cumulative, upper_rank, side="right")]
+        return float(lower + (upper - lower) * (position - lower_rank))
+
+
+def collect_global_statistics(chunks: Iterable[pd.DataFrame], numeric_fields: List[str],
+                              categorical_fields: List[str]) -> GlobalStatistics:
+    """First pass over a chunked dataset: fold every chunk into frozen statistics"""
+    statistics = GlobalStatistics(numeric_fields, categorical_fields)
+    for chunk in chunks:
+        statistics.update(chunk)
+    return statistics.freeze()
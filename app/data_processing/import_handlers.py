@@ -5,21 +5,112 @@ Data import handlers for various file formats and sources
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple, Iterator
 from pathlib import Path
 import json
 import sqlite3
+from contextlib import contextmanager
+import threading
 import asyncio
+import multiprocessing
+import os
+import random
+import weakref
 import aiohttp
-from sqlalchemy import create_engine, text
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import and_, create_engine, or_, select, text
+from sqlalchemy import column as sql_column, table as sql_table
+from sqlalchemy.engine import Engine, make_url
+from yarl import URL
 import logging
 
+# Incremental JSON parser for streaming API responses
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Read-only streaming reader for .xlsx/.xlsm workbooks
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+# Multithreaded streaming CSV parser and columnar (Parquet/Feather/Arrow IPC) readers
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    from pyarrow import csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from .compression import detect_compression, open_decompressed, read_decompressed, split_compression
+from .data_transformer import DataTransformer
+from .schema_inference import SchemaCache, apply_schema, get_schema_cache, infer_schema
+from .watermarks import (FileRegion, complete_lines_end, decode_watermark_value, encode_watermark_value,
+                         offset_watermark, resume_offset)
+from ..config import Config
+
+EXCEL_NA_VALUES = ["", "NULL", "null", "N/A", "n/a", "None", "none"]
+
+# One engine (and connection pool) per connection string for the whole process
+_ENGINES: Dict[str, Engine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(connection_string: str, **engine_options) -> Engine:
+    """Shared SQLAlchemy engine for a connection string, created on first use"""
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(connection_string)
+        if engine is None:
+            engine = create_engine(connection_string, pool_pre_ping=True, **engine_options)
+            _ENGINES[connection_string] = engine
+        return engine
+
+
+def dispose_engines() -> None:
+    """Close the pooled connections of every shared engine"""
+    with _ENGINES_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+
+
+# One pooled HTTP session per event loop (aiohttp sessions are bound to their loop)
+_HTTP_SESSIONS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Shared aiohttp session for the running event loop, created on first use"""
+    loop = asyncio.get_running_loop()
+    session = _HTTP_SESSIONS.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=Config.API_CONNECTION_LIMIT, ttl_dns_cache=300)
+        session = aiohttp.ClientSession(connector=connector)
+        _HTTP_SESSIONS[loop] = session
+    return session
+
+
+async def close_http_session() -> None:
+    """Close the shared session of the running event loop"""
+    session = _HTTP_SESSIONS.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
 class BaseImportHandler:
     """Base class for all import handlers"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.supported_formats = []
+        self.schema_cache: SchemaCache = get_schema_cache()
+        self.sample_rows = Config.SCHEMA_SAMPLE_ROWS
+        # Set by incremental iter_chunks once the source is exhausted
+        self.last_watermark: Optional[Dict[str, Any]] = None
     
     async def import_data(self, source: str, **kwargs) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Import data from source"""
@@ -29,6 +120,51 @@ class BaseImportHandler:
         """Validate if source is accessible and valid"""
         raise NotImplementedError("Subclasses must implement validate_source method")
     
+    def iter_chunks(self, source: str, chunksize: int = 10000, **kwargs) -> Iterator[pd.DataFrame]:
+        """Yield the source as a sequence of DataFrame chunks"""
+        raise NotImplementedError(f"{type(self).__name__} does not support chunked import")
+    
+    @contextmanager
+    def open_input(self, file_path: str) -> Iterator[Any]:
+        """The file path, or a streaming decompressor over it for compressed inputs"""
+        compression = detect_compression(file_path)
+        if compression is None:
+            yield file_path
+            return
+        with open_decompressed(file_path, compression) as stream:
+            yield stream
+    
+    def watermark_source_id(self, source: str, **kwargs) -> str:
+        """Key under which the incremental watermark of ``source`` is stored"""
+        return kwargs.get("source_id") or str(Path(source).resolve())
+    
+    def set_schema_override(self, source_id: str, schema: Dict[str, str]) -> None:
+        """Pin column types for a source; they win over inferred and cached types"""
+        self.schema_cache.set_override(source_id, schema)
+    
+    def resolve_schema(self, columns: List[str], sample_loader: Callable[[], pd.DataFrame],
+                       source_id: Optional[str] = None, schema: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Column types for a source: cached or inferred from a sample, then overrides
+        
+        ``sample_loader`` is only called on a cache miss, so repeated loads with
+        the same source and header skip reading a sample at all.
+        """
+        resolved = self.schema_cache.get(source_id, columns) if source_id else None
+        if resolved is None:
+            resolved = infer_schema(sample_loader())
+            if source_id:
+                self.schema_cache.put(source_id, columns, resolved)
+        
+        overrides = {**self.schema_cache.get_override(source_id), **(schema or {})}
+        resolved.update({column: dtype for column, dtype in overrides.items() if column in resolved})
+        return resolved
+    
+    def _auto_infer_types(self, data: pd.DataFrame, source_id: Optional[str] = None,
+                          schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Infer types on a bounded sample and convert the full columns accordingly"""
+        column_schema = self.resolve_schema(list(data.columns), lambda: data.head(self.sample_rows), source_id, schema)
+        return apply_schema(data, column_schema, stringify=True)
+    
     def get_import_stats(self, data: pd.DataFrame, source: str) -> Dict[str, Any]:
         """Generate import statistics"""
         return {
@@ -50,24 +186,16 @@ class CSVImporter(BaseImportHandler):
     async def import_data(self, file_path: str, **kwargs) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Import data from CSV file"""
         try:
-            # Default CSV parameters
-            csv_params = {
-                "encoding": "utf-8",
-                "delimiter": ",",
-                "header": 0,
-                "na_values": ["", "NULL", "null", "N/A", "n/a", "None", "none"],
-                "low_memory": False,
-                "dtype": str  # Read all as string first, then convert types
-            }
-            
-            # Override with user parameters
-            csv_params.update(kwargs)
+            source_id = kwargs.pop("source_id", None) or str(Path(file_path).resolve())
+            schema = kwargs.pop("schema", None)
+            csv_params = self._csv_params(**kwargs)
             
             # Read CSV file
-            data = pd.read_csv(file_path, **csv_params)
+            with self.open_input(file_path) as source:
+                data = pd.read_csv(source, **csv_params)
             
             # Automatic type inference
-            data = self._auto_infer_types(data)
+            data = self._auto_infer_types(data, source_id, schema)
             
             # Generate statistics
             stats = self.get_import_stats(data, file_path)
@@ -80,35 +208,159 @@ class CSVImporter(BaseImportHandler):
             self.logger.error(f"Error importing CSV file {file_path}: {str(e)}")
             raise
     
+    def iter_chunks(self, file_path: str, chunksize: int = 10000, schema: Optional[Dict[str, str]] = None,
+                    engine: Optional[str] = None, sample_rows: Optional[int] = None, block_size: int = 4 * 1024 * 1024,
+                    source_id: Optional[str] = None, incremental: bool = False,
+                    watermark: Optional[Dict[str, Any]] = None, **kwargs) -> Iterator[pd.DataFrame]:
+        """Read a CSV file as a stream of typed chunks
+        
+        Column types come from ``schema`` (column -> one of SCHEMA_TYPES), then
+        source overrides, then the schema cache for ``source_id`` (the file path
+        by default) and this header; only on a cache miss are they inferred from
+        the first ``sample_rows`` rows. With the
+        Arrow engine (the default when pyarrow is installed) the types are applied
+        by the multithreaded parser itself. If a value does not fit its declared
+        type, the rest of the file is read with pandas and converted leniently.
+        
+        With ``incremental`` the file is treated as an append-only log: only
+        complete lines after the ``watermark`` byte offset are read, and
+        ``last_watermark`` holds the new offset once the chunks are exhausted.
+        """
+        csv_params = self._csv_params(**kwargs)
+        csv_params.pop("low_memory", None)
+        
+        if engine is None:
+            engine = "arrow" if PYARROW_AVAILABLE and self._arrow_compatible(kwargs) else "pandas"
+        if engine not in ("arrow", "pandas"):
+            raise ValueError(f"Unsupported CSV engine: {engine}")
+        if engine == "arrow" and not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for the arrow CSV engine")
+        
+        header_params = {**csv_params, "nrows": 0}
+        header_params.pop("usecols", None)
+        with self.open_input(file_path) as source:
+            header = list(pd.read_csv(source, **header_params).columns)
+        columns = [column for column in header if column in csv_params.get("usecols", header)]
+        
+        def read_sample() -> pd.DataFrame:
+            with self.open_input(file_path) as source:
+                return pd.read_csv(source, **{**header_params, "nrows": sample_rows or self.sample_rows})[columns]
+        
+        # The cache is keyed by the full header, so projected reads share it
+        column_schema = self.resolve_schema(header, read_sample, source_id or str(Path(file_path).resolve()), schema)
+        column_schema = {column: column_schema[column] for column in columns}
+        
+        compression = detect_compression(file_path)
+        open_source = lambda: file_path
+        if compression is not None:
+            if incremental:
+                raise ValueError(f"Incremental imports need an uncompressed append-only file: {file_path}")
+            # Decompressed as the parsers read, so no uncompressed copy is written anywhere
+            open_source = lambda: open_decompressed(file_path, compression, native=True)
+        if incremental:
+            start, previous_rows = resume_offset(file_path, watermark)
+            end = complete_lines_end(file_path)
+            header_line = self._read_header_line(file_path) if start > 0 else b""
+            if end <= start:
+                self.last_watermark = offset_watermark(file_path, start, previous_rows)
+                return
+            open_source = lambda: FileRegion(file_path, start, end, prefix=header_line)
+        
+        rows_read = 0
+        if engine == "pandas":
+            for chunk in self._iter_pandas_chunks(open_source(), chunksize, column_schema, csv_params):
+                rows_read += len(chunk)
+                yield chunk
+        else:
+            try:
+                for chunk in self._iter_arrow_chunks(open_source(), chunksize, column_schema, csv_params, block_size):
+                    rows_read += len(chunk)
+                    yield chunk
+            except pa.ArrowInvalid as e:
+                self.logger.warning(f"Arrow could not parse {file_path} with the inferred schema after row {rows_read} ({e}); "
+                                    f"reading the remaining rows with pandas")
+                for chunk in self._iter_pandas_chunks(open_source(), chunksize, column_schema, csv_params,
+                                                      skip_rows=rows_read):
+                    rows_read += len(chunk)
+                    yield chunk
+        
+        if incremental:
+            self.last_watermark = offset_watermark(file_path, end, previous_rows + rows_read)
+    
+    def _read_header_line(self, file_path: str) -> bytes:
+        with open(file_path, "rb") as handle:
+            return handle.readline()
+    
+    def _arrow_compatible(self, kwargs: Dict[str, Any]) -> bool:
+        """Whether every user read_csv parameter has an Arrow equivalent"""
+        return set(kwargs) <= {"encoding", "delimiter", "sep", "na_values", "usecols"} and kwargs.get("header", 0) == 0
+    
+    def _iter_arrow_chunks(self, source: Any, chunksize: int, schema: Dict[str, str],
+                           csv_params: Dict[str, Any], block_size: int) -> Iterator[pd.DataFrame]:
+        """Stream record batches from the Arrow CSV reader, regrouped into chunks of ``chunksize`` rows"""
+        arrow_types = {"string": pa.string(), "int": pa.int64(), "float": pa.float64(), "datetime": pa.timestamp("ns")}
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(use_threads=True, block_size=block_size,
+                                            encoding=csv_params.get("encoding", "utf-8")),
+            parse_options=pa_csv.ParseOptions(delimiter=csv_params.get("sep", csv_params.get("delimiter", ","))),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={column: arrow_types[dtype] for column, dtype in schema.items()},
+                include_columns=list(schema),
+                null_values=list(csv_params.get("na_values", [])),
+                strings_can_be_null=True
+            )
+        )
+        
+        buffered, buffered_rows = [], 0
+        for batch in reader:
+            buffered.append(batch)
+            buffered_rows += batch.num_rows
+            while buffered_rows >= chunksize:
+                table = pa.Table.from_batches(buffered)
+                yield self._arrow_to_pandas(table.slice(0, chunksize))
+                rest = table.slice(chunksize)
+                buffered, buffered_rows = rest.to_batches(), rest.num_rows
+        if buffered_rows:
+            yield self._arrow_to_pandas(pa.Table.from_batches(buffered))
+    
+    def _arrow_to_pandas(self, table: "pa.Table") -> pd.DataFrame:
+        data = table.to_pandas()
+        # Arrow nulls come back as None in string columns; read_csv uses NaN
+        for column in data.columns[data.dtypes == object]:
+            data[column] = data[column].where(data[column].notna(), np.nan)
+        return data
+    
+    def _iter_pandas_chunks(self, source: Any, chunksize: int, schema: Dict[str, str],
+                            csv_params: Dict[str, Any], skip_rows: int = 0) -> Iterator[pd.DataFrame]:
+        """String-first pandas reader with the schema applied to each chunk"""
+        params = {**csv_params, "dtype": str}
+        if skip_rows:
+            params["skiprows"] = range(1, skip_rows + 1)
+        with pd.read_csv(source, chunksize=chunksize, **params) as reader:
+            for chunk in reader:
+                yield apply_schema(chunk.reset_index(drop=True), schema)
+    
+    def _csv_params(self, **kwargs) -> Dict[str, Any]:
+        """Default read_csv parameters, overridden by user parameters"""
+        csv_params = {
+            "encoding": "utf-8",
+            "delimiter": ",",
+            "header": 0,
+            "na_values": ["", "NULL", "null", "N/A", "n/a", "None", "none"],
+            "low_memory": False,
+            "dtype": str  # Read all as string first, then convert types
+        }
+        csv_params.update(kwargs)
+        return csv_params
+    
     def validate_source(self, file_path: str) -> bool:
         """Validate CSV file"""
         try:
             path = Path(file_path)
-            return path.exists() and path.is_file() and path.suffix.lower() in [".csv", ".tsv"]
+            return path.exists() and path.is_file() and split_compression(file_path)[0] in [".csv", ".tsv"]
         except:
             return False
-    
-    def _auto_infer_types(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Automatically infer and convert data types"""
-        for column in data.columns:
-            # Try to convert to datetime
-            if any(keyword in column.lower() for keyword in ["date", "time", "created", "updated"]):
-                data[column] = pd.to_datetime(data[column], errors='coerce')
-                continue
-            
-            # Try to convert to numeric
-            try:
-                numeric_data = pd.to_numeric(data[column], errors='coerce')
-                if not numeric_data.isna().all():
-                    data[column] = numeric_data
-                    continue
-            except:
-                pass
-            
-            # Keep as string if other conversions fail
-            data[column] = data[column].astype(str)
-        
-        return data
 
 class ExcelImporter(BaseImportHandler):
     """Excel file import handler"""
@@ -118,29 +370,53 @@ class ExcelImporter(BaseImportHandler):
         self.supported_formats = ["xlsx", "xls", "xlsm"]
     
     async def import_data(self, file_path: str, **kwargs) -> Tuple[pd.DataFrame, Dict[str, Any]]:
-        """Import data from Excel file"""
+        """Import data from Excel file
+        
+        .xlsx/.xlsm sheets are streamed row by row with openpyxl in read-only
+        mode. With ``sheet_name`` set to a list of sheets, or None for all
+        sheets, each sheet is read in its own worker process (at most
+        ``max_workers``) and the sheets are merged with
+        ``DataTransformer.create_unified_schema``, tagged by sheet name.
+        """
         try:
+            source_id = kwargs.pop("source_id", None) or str(Path(file_path).resolve())
+            schema = kwargs.pop("schema", None)
+            max_workers = kwargs.pop("max_workers", None)
+            
             # Default Excel parameters
             excel_params = {
                 "sheet_name": 0,  # First sheet
                 "header": 0,
-                "na_values": ["", "NULL", "null", "N/A", "n/a", "None", "none"],
+                "na_values": list(EXCEL_NA_VALUES),
                 "dtype": str
             }
             
             # Override with user parameters
             excel_params.update(kwargs)
+            sheet_name = excel_params["sheet_name"]
+            multi_sheet = sheet_name is None or isinstance(sheet_name, list)
+            
+            if self._streaming_compatible(file_path, kwargs):
+                sheet_names = self._sheet_names(file_path, sheet_name)
+                frames = await self._load_sheets(file_path, sheet_names, excel_params["na_values"], max_workers)
+            else:
+                # Read Excel file
+                loaded = pd.read_excel(_workbook_source(file_path), **excel_params)
+                sheet_names, frames = (list(loaded), list(loaded.values())) if multi_sheet else ([sheet_name], [loaded])
             
-            # Read Excel file
-            data = pd.read_excel(file_path, **excel_params)
+            if multi_sheet:
+                data = DataTransformer().create_unified_schema(frames, [str(name) for name in sheet_names])
+            else:
+                data = frames[0]
             
             # Automatic type inference
-            data = self._auto_infer_types(data)
+            data = self._auto_infer_types(data, source_id, schema)
             
             # Generate statistics
             stats = self.get_import_stats(data, file_path)
             stats["file_size_mb"] = Path(file_path).stat().st_size / (1024 * 1024)
-            stats["sheet_name"] = excel_params.get("sheet_name", 0)
+            stats["sheet_name"] = sheet_name
+            stats["sheets_loaded"] = [str(name) for name in sheet_names]
             
             return data, stats
             
@@ -148,18 +424,63 @@ class ExcelImporter(BaseImportHandler):
             self.logger.error(f"Error importing Excel file {file_path}: {str(e)}")
             raise
     
+    def iter_chunks(self, file_path: str, chunksize: int = 10000, sheet_name: Any = 0,
+                    na_values: Optional[List[str]] = None, source_id: Optional[str] = None,
+                    schema: Optional[Dict[str, str]] = None, **kwargs) -> Iterator[pd.DataFrame]:
+        """Stream one sheet in chunks of ``chunksize`` rows without loading the workbook
+        
+        Types are inferred on the first chunk and reused from the schema cache
+        for the rest, so every chunk gets the same types.
+        """
+        source_id = source_id or f"{Path(file_path).resolve()}#{sheet_name}"
+        na_values = EXCEL_NA_VALUES if na_values is None else na_values
+        if not self._streaming_compatible(file_path, kwargs):
+            data = pd.read_excel(_workbook_source(file_path), sheet_name=sheet_name, na_values=na_values, dtype=str, **kwargs)
+            chunks = (data.iloc[start:start + chunksize].reset_index(drop=True) for start in range(0, len(data), chunksize))
+        else:
+            chunks = _iter_sheet_chunks(file_path, sheet_name, chunksize, na_values)
+        
+        for chunk in chunks:
+            yield self._auto_infer_types(chunk, source_id, schema)
+    
+    def _streaming_compatible(self, file_path: str, kwargs: Dict[str, Any]) -> bool:
+        """Whether the read-only openpyxl reader can honour the read_excel parameters"""
+        return (OPENPYXL_AVAILABLE and split_compression(file_path)[0] in [".xlsx", ".xlsm"] and
+                set(kwargs) <= {"sheet_name", "na_values", "header", "dtype"} and
+                kwargs.get("header", 0) == 0 and kwargs.get("dtype", str) is str)
+    
+    def _sheet_names(self, file_path: str, sheet_name: Any) -> List[Any]:
+        """Resolve ``sheet_name`` (index, name, list of either, or None for all) to sheet names"""
+        workbook = openpyxl.load_workbook(_workbook_source(file_path), read_only=True)
+        try:
+            available = workbook.sheetnames
+        finally:
+            workbook.close()
+        requested = available if sheet_name is None else sheet_name if isinstance(sheet_name, list) else [sheet_name]
+        return [available[name] if isinstance(name, int) else name for name in requested]
+    
+    async def _load_sheets(self, file_path: str, sheet_names: List[str], na_values: List[str],
+                           max_workers: Optional[int] = None) -> List[pd.DataFrame]:
+        """Read sheets concurrently, one worker process per sheet"""
+        if max_workers is None:
+            max_workers = min(len(sheet_names), os.cpu_count() or 1)
+        if len(sheet_names) == 1 or max_workers <= 1:
+            return [_read_sheet(file_path, name, na_values) for name in sheet_names]
+        
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            return list(await asyncio.gather(*[
+                loop.run_in_executor(executor, _read_sheet, file_path, name, na_values) for name in sheet_names
+            ]))
+    
     def validate_source(self, file_path: str) -> bool:
         """Validate Excel file"""
         try:
             path = Path(file_path)
-            return path.exists() and path.is_file() and path.suffix.lower() in [".xlsx", ".xls", ".xlsm"]
+            return path.exists() and path.is_file() and split_compression(file_path)[0] in [".xlsx", ".xls", ".xlsm"]
         except:
             return False
     
-    def _auto_infer_types(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Same auto-inference logic as CSV"""
-        csv_importer = CSVImporter()
-        return csv_importer._auto_infer_types(data)
 
 class JSONImporter(BaseImportHandler):
     """JSON file import handler"""
@@ -171,7 +492,9 @@ class JSONImporter(BaseImportHandler):
     async def import_data(self, file_path: str, **kwargs) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Import data from JSON file"""
         try:
-            file_extension = Path(file_path).suffix.lower()
+            source_id = kwargs.pop("source_id", None) or str(Path(file_path).resolve())
+            schema = kwargs.pop("schema", None)
+            file_extension = split_compression(file_path)[0]
             
             if file_extension == ".jsonl" or file_extension == ".ndjson":
                 # Handle JSON Lines format
@@ -185,10 +508,11 @@ class JSONImporter(BaseImportHandler):
                 }
                 json_params.update(kwargs)
                 
-                data = pd.read_json(file_path, **json_params)
+                with self.open_input(file_path) as source:
+                    data = pd.read_json(source, **json_params)
             
             # Automatic type inference
-            data = self._auto_infer_types(data)
+            data = self._auto_infer_types(data, source_id, schema)
             
             # Generate statistics
             stats = self.get_import_stats(data, file_path)
@@ -205,14 +529,74 @@ class JSONImporter(BaseImportHandler):
         """Validate JSON file"""
         try:
             path = Path(file_path)
-            return path.exists() and path.is_file() and path.suffix.lower() in [".json", ".jsonl", ".ndjson"]
+            return path.exists() and path.is_file() and split_compression(file_path)[0] in [".json", ".jsonl", ".ndjson"]
         except:
             return False
     
+    def iter_chunks(self, file_path: str, chunksize: int = 10000, incremental: bool = False,
+                    watermark: Optional[Dict[str, Any]] = None, **kwargs) -> Iterator[pd.DataFrame]:
+        """Read a JSON file chunk by chunk
+        
+        JSON Lines files are streamed line by line. Regular JSON documents
+        have to be parsed whole, and are then yielded in slices. Types are
+        inferred on the first chunk and reused from the schema cache for the
+        rest, so every chunk gets the same types.
+        
+        With ``incremental`` only records after the ``watermark`` are read: a
+        byte offset for JSON Lines (a trailing line without its newline is
+        left for the next load) and a record count for regular JSON.
+        ``last_watermark`` holds the new position once the chunks are exhausted.
+        """
+        source_id = kwargs.pop("source_id", None) or str(Path(file_path).resolve())
+        schema = kwargs.pop("schema", None)
+        file_extension, compression = split_compression(file_path)
+        if incremental and compression is not None:
+            raise ValueError(f"Incremental imports need an uncompressed append-only file: {file_path}")
+        
+        if file_extension in [".jsonl", ".ndjson"]:
+            offset, rows = resume_offset(file_path, watermark) if incremental else (0, 0)
+            records = []
+            with open_decompressed(file_path, compression) as f:
+                if offset:
+                    f.seek(offset)
+                for line in f:
+                    if incremental and not line.endswith(b"\n"):
+                        break
+                    offset += len(line)
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+                    if len(records) >= chunksize:
+                        rows += len(records)
+                        yield self._auto_infer_types(pd.DataFrame(records), source_id, schema)
+                        records = []
+            if records:
+                rows += len(records)
+                yield self._auto_infer_types(pd.DataFrame(records), source_id, schema)
+            if incremental:
+                self.last_watermark = offset_watermark(file_path, offset, rows)
+        else:
+            json_params = {"orient": "records", "lines": False, "encoding": "utf-8"}
+            json_params.update(kwargs)
+            with self.open_input(file_path) as source:
+                data = pd.read_json(source, **json_params)
+            
+            start = 0
+            if incremental and watermark and watermark.get("mode") == "rows" and watermark["rows"] <= len(data):
+                start = watermark["rows"]
+            for offset in range(start, len(data), chunksize):
+                yield self._auto_infer_types(data.iloc[offset:offset + chunksize].reset_index(drop=True), source_id, schema)
+            if incremental:
+                self.last_watermark = {"mode": "rows", "rows": len(data)}
+    
     def _read_json_lines(self, file_path: str) -> pd.DataFrame:
         """Read JSON Lines format"""
         records = []
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open_decompressed(file_path) as f:
             for line in f:
                 line = line.strip()
                 if line:
@@ -224,14 +608,12 @@ class JSONImporter(BaseImportHandler):
         
         return pd.DataFrame(records)
     
-    def _auto_infer_types(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Same auto-inference logic as CSV"""
-        csv_importer = CSVImporter()
-        return csv_importer._auto_infer_types(data)
 
 class SQLImporter(BaseImportHandler):
     """SQL database import handler"""
     
+    FILTER_OPERATORS = ["=", "==", "!=", "<", "<=", ">", ">=", "in", "not in"]
+    
     def __init__(self):
         super().__init__()
         self.supported_formats = ["sql", "database", "db"]
@@ -241,24 +623,25 @@ class SQLImporter(BaseImportHandler):
         try:
             # Default SQL parameters
             sql_params = {
-                "query": kwargs.get("query", "SELECT * FROM donors LIMIT 1000000"),
-                "chunksize": None
+                "query": kwargs.get("query"),
+                "table": kwargs.get("table", "donors"),
+                "columns": kwargs.get("columns"),
+                "filters": kwargs.get("filters"),
+                # The default cap only applies to the built-in table query, never to a caller's own query
+                "limit": kwargs.get("limit", None if kwargs.get("query") is not None else 1000000),
+                "chunksize": kwargs.get("chunksize") or 50000
             }
             
-            # Create database engine
-            engine = create_engine(connection_string)
-            
-            # Execute query
-            data = pd.read_sql(sql_params["query"], engine, chunksize=sql_params["chunksize"])
-            
-            # If chunksize is specified, combine chunks
-            if sql_params["chunksize"]:
-                data = pd.concat(data, ignore_index=True)
+            chunks = list(self.iter_chunks(connection_string, chunksize=sql_params["chunksize"],
+                                           source_id=kwargs.get("source_id"), schema=kwargs.get("schema"),
+                                           **{key: sql_params[key] for key in ("query", "table", "columns", "filters", "limit")}))
+            data = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=sql_params["columns"] or [])
             
             # Generate statistics
-            stats = self.get_import_stats(data, connection_string)
-            stats["query"] = sql_params["query"]
+            stats = self.get_import_stats(data, self._safe_url(connection_string))
+            stats["query"] = str(self._build_query(**{key: sql_params[key] for key in ("query", "table", "columns", "filters", "limit")}))
             stats["database_type"] = self._get_database_type(connection_string)
+            stats["chunks_fetched"] = len(chunks)
             
             return data, stats
             
@@ -266,16 +649,205 @@ class SQLImporter(BaseImportHandler):
             self.logger.error(f"Error importing from SQL database: {str(e)}")
             raise
     
+    def iter_chunks(self, connection_string: str, chunksize: int = 10000, query: Optional[str] = None,
+                    table: str = "donors", columns: Optional[List[str]] = None,
+                    filters: Optional[List[Tuple[str, str, Any]]] = None, limit: Optional[int] = None,
+                    source_id: Optional[str] = None, schema: Optional[Dict[str, str]] = None,
+                    incremental: bool = False, watermark: Optional[Dict[str, Any]] = None,
+                    watermark_column: Optional[str] = None, watermark_key: Optional[str] = None,
+                    **kwargs) -> Iterator[pd.DataFrame]:
+        """Stream query results as DataFrame chunks through a server-side cursor
+        
+        Only ``columns`` are selected and ``filters`` (``(column, op, value)``
+        tuples, as for ``pd.read_parquet``) become a bound WHERE clause, so the
+        database does the projection and filtering. ``query`` replaces the
+        ``table`` and is wrapped as a subquery. Types are resolved on the first
+        chunk and applied to every chunk, so all chunks share one schema.
+        
+        With ``incremental`` only rows whose ``watermark_column`` (e.g.
+        donation_date or an updated timestamp) is greater than the stored
+        ``watermark`` are fetched, and ``last_watermark`` holds the highest
+        value seen once the chunks are exhausted. ``watermark_key`` names a
+        unique, non-null column (e.g. the primary key) that breaks ties: the
+        watermark becomes the pair of both values, so rows sharing the last
+        watermark value are picked up by the next load. With a ``limit`` the
+        rows are fetched in watermark order and rows without a watermark
+        value are skipped; without a ``watermark_key`` the rows sharing the
+        last value of a full page are left for the next load, unless the
+        whole page shares one value, in which case all rows with that value
+        are fetched even beyond the limit.
+        """
+        filters = list(filters or [])
+        clauses = []
+        high_water = high_key = None
+        if incremental:
+            if not watermark_column:
+                raise ValueError("Incremental SQL imports require a watermark_column")
+            if columns:
+                columns = list(columns) + [name for name in (watermark_column, watermark_key)
+                                           if name and name not in columns]
+            if watermark and watermark.get("column") == watermark_column and watermark.get("value"):
+                high_water = decode_watermark_value(watermark["value"])
+                if watermark_key and watermark.get("key_column") == watermark_key and watermark.get("key"):
+                    high_key = decode_watermark_value(watermark["key"])
+                    clauses.append(self._after_watermark_clause(watermark_column, high_water, watermark_key, high_key))
+                else:
+                    filters.append((watermark_column, ">", high_water))
+        
+        # A limited incremental load must take the lowest rows above the watermark; otherwise rows
+        # below the new high-water mark but outside the returned subset would be skipped for good
+        order_by = None
+        if incremental and limit is not None:
+            order_by = [watermark_column] + ([watermark_key] if watermark_key else [])
+            filters.append((watermark_column, "!=", None))
+        # Without a tie-breaking key, rows sharing the last value of a full page wait for the next load
+        trim_last_group = order_by is not None and not watermark_key
+        statement = self._build_query(query, table, columns, filters, limit, order_by=order_by, clauses=clauses)
+        source_id = source_id or f"{self._safe_url(connection_string)}#{query or table}"
+        
+        column_schema = None
+        
+        def prepare(chunk: pd.DataFrame) -> pd.DataFrame:
+            nonlocal column_schema, high_water, high_key
+            if incremental:
+                # Raw driver values, so the next load compares like with like in the database
+                valid = chunk.dropna(subset=[name for name in (watermark_column, watermark_key) if name])
+                if not valid.empty:
+                    chunk_max = valid[watermark_column].max()
+                    chunk_key = valid.loc[valid[watermark_column] == chunk_max, watermark_key].max() \
+                        if watermark_key else None
+                    if high_water is None or chunk_max > high_water or \
+                            (watermark_key and chunk_max == high_water and (high_key is None or chunk_key > high_key)):
+                        high_water, high_key = chunk_max, chunk_key
+            if column_schema is None:
+                column_schema = self.resolve_schema(list(chunk.columns), lambda: chunk.head(self.sample_rows),
+                                                    source_id, schema)
+            return apply_schema(chunk, column_schema)
+        
+        engine = get_engine(connection_string)
+        with engine.connect() as conn:
+            # yield_per turns on stream_results: a server-side cursor where the driver supports one
+            result = conn.execution_options(yield_per=chunksize).execute(statement)
+            result_columns = list(result.keys())
+            fetched = returned = 0
+            last_group = None
+            for rows in result.partitions():
+                chunk = pd.DataFrame.from_records(rows, columns=result_columns)
+                fetched += len(chunk)
+                if trim_last_group:
+                    # Rows arrive in watermark order, so the rows sharing the last value come last
+                    if last_group is not None:
+                        chunk = pd.concat([last_group, chunk], ignore_index=True)
+                    ties = (chunk[watermark_column] == chunk[watermark_column].iloc[-1]).to_numpy()
+                    last_group, chunk = chunk.iloc[ties.argmax():], chunk.iloc[:ties.argmax()]
+                    if chunk.empty:
+                        continue
+                returned += len(chunk)
+                yield prepare(chunk)
+            
+            if last_group is not None:
+                if fetched < limit:
+                    # The page ended before the limit, so the last group is complete
+                    yield prepare(last_group)
+                elif not returned:
+                    # One value fills the whole page: fetch all of its rows, so the load moves on
+                    boundary = last_group[watermark_column].iloc[-1]
+                    group_statement = self._build_query(query, table, columns,
+                                                        filters + [(watermark_column, "=", boundary)], clauses=clauses)
+                    group_result = conn.execution_options(yield_per=chunksize).execute(group_statement)
+                    for rows in group_result.partitions():
+                        yield prepare(pd.DataFrame.from_records(rows, columns=result_columns))
+        
+        if incremental:
+            self.last_watermark = {
+                "mode": "column",
+                "column": watermark_column,
+                "value": encode_watermark_value(high_water) if high_water is not None else None,
+                "key_column": watermark_key,
+                "key": encode_watermark_value(high_key) if high_key is not None else None
+            }
+    
+    def watermark_source_id(self, connection_string: str, **kwargs) -> str:
+        """Watermarks are kept per database, table or query, and watermark column"""
+        if kwargs.get("source_id"):
+            return kwargs["source_id"]
+        return f"{self._safe_url(connection_string)}#{kwargs.get('query') or kwargs.get('table', 'donors')}" \
+               f"#{kwargs.get('watermark_column')}"
+    
     def validate_source(self, connection_string: str) -> bool:
         """Validate database connection"""
         try:
-            engine = create_engine(connection_string)
+            engine = get_engine(connection_string)
             with engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
             return True
         except:
             return False
     
+    def _build_query(self, query: Optional[str] = None, table: str = "donors", columns: Optional[List[str]] = None,
+                     filters: Optional[List[Tuple[str, str, Any]]] = None, limit: Optional[int] = None,
+                     order_by: Optional[List[str]] = None, clauses: Optional[List[Any]] = None):
+        """SELECT with projection and predicates pushed down to the database
+        
+        ``clauses`` are further WHERE clauses already built as expressions.
+        """
+        filters = list(filters or [])
+        if query is not None:
+            referenced = list(dict.fromkeys(list(columns or []) + [field for field, _, _ in filters]
+                                            + list(order_by or [])))
+            source = text(query).columns(*[sql_column(name) for name in referenced]).subquery("source")
+        else:
+            source = sql_table(table)
+        
+        if columns:
+            statement = select(*[sql_column(name) for name in columns]).select_from(source)
+        else:
+            statement = select(text("*")).select_from(source)
+        
+        for field, operator, value in filters:
+            statement = statement.where(self._filter_clause(field, operator, value))
+        for clause in clauses or []:
+            statement = statement.where(clause)
+        if order_by:
+            statement = statement.order_by(*[sql_column(name) for name in order_by])
+        if limit is not None:
+            statement = statement.limit(int(limit))
+        return statement
+    
+    def _filter_clause(self, field: str, operator: str, value: Any):
+        """WHERE clause for one ``(column, op, value)`` filter with the value as a bound parameter"""
+        target = sql_column(field)
+        operator = operator.lower()
+        if operator in ("=", "=="):
+            return target.is_(None) if value is None else target == value
+        if operator == "!=":
+            return target.is_not(None) if value is None else target != value
+        if operator == "<":
+            return target < value
+        if operator == "<=":
+            return target <= value
+        if operator == ">":
+            return target > value
+        if operator == ">=":
+            return target >= value
+        if operator == "in":
+            return target.in_(list(value))
+        if operator == "not in":
+            return target.not_in(list(value))
+        raise ValueError(f"Unsupported filter operator: {operator}. Supported operators: {self.FILTER_OPERATORS}")
+    
+    def _after_watermark_clause(self, column: str, value: Any, key_column: str, key: Any):
+        """Rows after the composite watermark ``(value, key)``: a later value, or the same value and a later key"""
+        target = sql_column(column)
+        return or_(target > value, and_(target == value, sql_column(key_column) > key))
+    
+    def _safe_url(self, connection_string: str) -> str:
+        """Connection string with the password masked, for stats and cache keys"""
+        try:
+            return make_url(connection_string).render_as_string(hide_password=True)
+        except Exception:
+            return self._get_database_type(connection_string)
+    
     def _get_database_type(self, connection_string: str) -> str:
         """Extract database type from connection string"""
         connection_string_lower = connection_string.lower()
@@ -290,20 +862,35 @@ class SQLImporter(BaseImportHandler):
         else:
             return "Unknown"
     
-    def _auto_infer_types(self, data: pd.DataFrame) -> pd.DataFrame:
-        """SQL already provides proper types, but we can still do additional inference"""
-        csv_importer = CSVImporter()
-        return csv_importer._auto_infer_types(data)
 
 class APIImporter(BaseImportHandler):
     """API endpoint import handler"""
     
+    PAGINATION_MODES = ["offset", "page", "cursor", "link"]
+    # Keys holding the records of a paginated response, in order of preference
+    RECORD_KEYS = ["data", "results", "items", "records"]
+    TOTAL_FIELDS = ["total", "count", "total_count", "meta.total", "meta.total_count", "pagination.total"]
+    TOTAL_PAGES_FIELDS = ["total_pages", "meta.total_pages", "pagination.total_pages"]
+    CURSOR_FIELDS = ["next_cursor", "meta.next_cursor", "pagination.next_cursor", "cursor"]
+    NEXT_LINK_FIELDS = ["next", "links.next", "meta.next", "pagination.next"]
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    
     def __init__(self):
         super().__init__()
         self.supported_formats = ["api", "rest", "endpoint"]
     
     async def import_data(self, api_url: str, **kwargs) -> Tuple[pd.DataFrame, Dict[str, Any]]:
-        """Import data from REST API"""
+        """Import data from REST API
+        
+        Without ``pagination`` one response is fetched, as before. Offset and
+        page pagination compute the page addresses, so once the first page
+        reveals the total, the remaining pages are fetched concurrently (up to
+        ``max_concurrency`` at once); without a total they are fetched in waves
+        until a short page. Cursor and link pagination follow the next cursor
+        or URL page by page. All requests share one pooled session, retry
+        transient failures with exponential backoff, and decode the JSON
+        incrementally as it arrives when ijson is installed.
+        """
         try:
             # Default API parameters
             api_params = {
@@ -311,49 +898,53 @@ class APIImporter(BaseImportHandler):
                 "headers": {"Content-Type": "application/json"},
                 "params": {},
                 "timeout": 30,
-                "auth": None
+                "auth": None,
+                "pagination": None,
+                "page_size": 100,
+                "offset_param": "offset",
+                "limit_param": "limit",
+                "page_param": "page",
+                "cursor_param": "cursor",
+                "records_path": None,
+                "max_pages": None,
+                "max_concurrency": Config.API_MAX_CONCURRENCY,
+                "max_retries": Config.API_MAX_RETRIES,
+                "backoff_seconds": Config.API_BACKOFF_SECONDS
             }
             
+            source_id = kwargs.pop("source_id", None) or api_url
+            schema = kwargs.pop("schema", None)
+            
             # Override with user parameters
             api_params.update(kwargs)
+            if api_params["pagination"] is not None and api_params["pagination"] not in self.PAGINATION_MODES:
+                raise ValueError(f"Unsupported pagination: {api_params['pagination']}. "
+                                 f"Supported modes: {self.PAGINATION_MODES}")
             
-            # Make API request
-            async with aiohttp.ClientSession() as session:
-                async with session.request(
-                    api_params["method"],
-                    api_url,
-                    headers=api_params["headers"],
-                    params=api_params["params"],
-                    timeout=aiohttp.ClientTimeout(total=api_params["timeout"]),
-                    auth=api_params["auth"]
-                ) as response:
-                    if response.status != 200:
-                        raise Exception(f"API request failed with status {response.status}")
-                    
-                    data_json = await response.json()
+            fetch_stats = {"pages_fetched": 0, "retries": 0, "bytes_received": 0, "response_status": None}
+            pagination = api_params["pagination"]
+            if pagination in ("offset", "page"):
+                pages = await self._fetch_numbered_pages(api_url, api_params, fetch_stats)
+            elif pagination in ("cursor", "link"):
+                pages = await self._fetch_linked_pages(api_url, api_params, fetch_stats)
+            else:
+                records, metadata, _ = await self._fetch_page(api_url, api_params["params"], api_params, fetch_stats)
+                pages = [records if records is not None else [self._unflatten(metadata)]]
             
             # Convert to DataFrame
-            if isinstance(data_json, list):
-                data = pd.DataFrame(data_json)
-            elif isinstance(data_json, dict):
-                # Handle paginated responses or nested structures
-                if "data" in data_json:
-                    data = pd.DataFrame(data_json["data"])
-                elif "results" in data_json:
-                    data = pd.DataFrame(data_json["results"])
-                else:
-                    data = pd.DataFrame([data_json])
-            else:
-                raise ValueError("Unsupported API response format")
+            data = pd.DataFrame([record for page in pages for record in page])
             
             # Automatic type inference
-            data = self._auto_infer_types(data)
+            data = self._auto_infer_types(data, source_id, schema)
             
             # Generate statistics
             stats = self.get_import_stats(data, api_url)
             stats["api_url"] = api_url
-            stats["response_status"] = response.status
-            stats["response_size_mb"] = len(str(data_json)) / (1024 * 1024)
+            stats["pagination"] = pagination
+            stats["pages_fetched"] = fetch_stats["pages_fetched"]
+            stats["retries"] = fetch_stats["retries"]
+            stats["response_status"] = fetch_stats["response_status"]
+            stats["response_size_mb"] = fetch_stats["bytes_received"] / (1024 * 1024)
             
             return data, stats
             
@@ -361,6 +952,207 @@ class APIImporter(BaseImportHandler):
             self.logger.error(f"Error importing from API {api_url}: {str(e)}")
             raise
     
+    async def _fetch_numbered_pages(self, api_url: str, api_params: Dict[str, Any],
+                                    fetch_stats: Dict[str, Any]) -> List[List[Any]]:
+        """Offset or page-number pagination, with later pages fetched concurrently"""
+        page_size = api_params["page_size"]
+        by_offset = api_params["pagination"] == "offset"
+        first_index = 0 if by_offset else 1
+        semaphore = asyncio.Semaphore(api_params["max_concurrency"])
+        
+        def page_params(index: int) -> Dict[str, Any]:
+            if by_offset:
+                return {**api_params["params"], api_params["offset_param"]: index * page_size,
+                        api_params["limit_param"]: page_size}
+            return {**api_params["params"], api_params["page_param"]: index, api_params["limit_param"]: page_size}
+        
+        async def fetch(index: int) -> List[Any]:
+            async with semaphore:
+                records, _, _ = await self._fetch_page(api_url, page_params(index), api_params, fetch_stats)
+                return records or []
+        
+        first_records, metadata, _ = await self._fetch_page(api_url, page_params(first_index), api_params, fetch_stats)
+        pages = [first_records or []]
+        if len(pages[0]) < page_size:
+            return pages
+        
+        max_pages = api_params["max_pages"]
+        total_pages = self._total_pages(metadata, page_size)
+        if total_pages is not None:
+            last_page = total_pages if max_pages is None else min(total_pages, max_pages)
+            pages.extend(await asyncio.gather(*[fetch(first_index + page) for page in range(1, last_page)]))
+            return pages
+        
+        # Unknown total: fetch a wave of pages at a time until one comes back short
+        next_page = 1
+        while max_pages is None or next_page < max_pages:
+            wave_size = api_params["max_concurrency"] if max_pages is None else min(api_params["max_concurrency"],
+                                                                                    max_pages - next_page)
+            wave = await asyncio.gather(*[fetch(first_index + page) for page in range(next_page, next_page + wave_size)])
+            for records in wave:
+                if records:
+                    pages.append(records)
+                if len(records) < page_size:
+                    return pages
+            next_page += wave_size
+        return pages
+    
+    async def _fetch_linked_pages(self, api_url: str, api_params: Dict[str, Any],
+                                  fetch_stats: Dict[str, Any]) -> List[List[Any]]:
+        """Cursor or next-link pagination; each page names the next, so pages are fetched in order"""
+        pages = []
+        url, params = api_url, dict(api_params["params"])
+        while api_params["max_pages"] is None or len(pages) < api_params["max_pages"]:
+            records, metadata, next_link = await self._fetch_page(url, params, api_params, fetch_stats)
+            if records:
+                pages.append(records)
+            if not records:
+                break
+            
+            if api_params["pagination"] == "cursor":
+                cursor = self._first_field(metadata, self.CURSOR_FIELDS)
+                if cursor in (None, ""):
+                    break
+                params = {**params, api_params["cursor_param"]: cursor}
+            else:
+                next_link = next_link or self._first_field(metadata, self.NEXT_LINK_FIELDS)
+                if not next_link:
+                    break
+                # The next link carries its own query string
+                url, params = str(URL(url).join(URL(next_link))), {}
+        return pages
+    
+    async def _fetch_page(self, url: str, params: Dict[str, Any], api_params: Dict[str, Any],
+                          fetch_stats: Dict[str, Any]) -> Tuple[Optional[List[Any]], Dict[str, Any], Optional[str]]:
+        """One request with retries: (records, flattened metadata, next link from the Link header)"""
+        session = get_http_session()
+        attempt = 0
+        while True:
+            try:
+                async with session.request(
+                    api_params["method"],
+                    url,
+                    headers=api_params["headers"],
+                    params=params,
+                    timeout=aiohttp.ClientTimeout(total=api_params["timeout"]),
+                    auth=api_params["auth"]
+                ) as response:
+                    if response.status in self.RETRY_STATUSES and attempt < api_params["max_retries"]:
+                        delay = self._retry_delay(attempt, api_params["backoff_seconds"], response.headers.get("Retry-After"))
+                        self.logger.warning(f"Request to {url} returned {response.status}; retrying in {delay:.2f}s")
+                    elif response.status != 200:
+                        raise Exception(f"API request failed with status {response.status}")
+                    else:
+                        records, metadata = await self._decode_response(response, api_params["records_path"])
+                        fetch_stats["pages_fetched"] += 1
+                        fetch_stats["bytes_received"] += response.content.total_bytes
+                        fetch_stats["response_status"] = response.status
+                        next_link = response.links.get("next", {}).get("url")
+                        return records, metadata, str(next_link) if next_link else None
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                if attempt >= api_params["max_retries"]:
+                    raise
+                delay = self._retry_delay(attempt, api_params["backoff_seconds"])
+                self.logger.warning(f"Request to {url} failed ({type(e).__name__}: {e}); retrying in {delay:.2f}s")
+            
+            attempt += 1
+            fetch_stats["retries"] += 1
+            await asyncio.sleep(delay)
+    
+    def _retry_delay(self, attempt: int, backoff_seconds: float, retry_after: Optional[str] = None) -> float:
+        """Exponential backoff with jitter; a numeric Retry-After header wins"""
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return backoff_seconds * (2 ** attempt) * (0.5 + random.random() / 2)
+    
+    async def _decode_response(self, response: aiohttp.ClientResponse,
+                               records_path: Optional[str] = None) -> Tuple[Optional[List[Any]], Dict[str, Any]]:
+        """Records and scalar metadata of a JSON response, decoded incrementally with ijson when available"""
+        if not IJSON_AVAILABLE:
+            return self._split_document(json.loads(await response.read()), records_path)
+        
+        records_prefix = f"{records_path}.item" if records_path else None
+        records, metadata = None, {}
+        builder, depth = None, 0
+        async for prefix, event, value in ijson.parse_async(response.content, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                depth += 1 if event in ("start_map", "start_array") else -1 if event in ("end_map", "end_array") else 0
+                if depth == 0:
+                    records.append(builder.value)
+                    builder = None
+                continue
+            
+            if event == "start_array" and (prefix == records_path or
+                                           (records_path is None and records_prefix is None and
+                                            (prefix == "" or prefix in self.RECORD_KEYS))):
+                records_prefix = f"{prefix}.item" if prefix else "item"
+                records = []
+            elif records is not None and prefix == records_prefix and event != "end_array":
+                if event in ("start_map", "start_array"):
+                    builder, depth = ijson.ObjectBuilder(), 1
+                    builder.event(event, value)
+                else:
+                    records.append(value)
+            elif event in ("string", "number", "boolean", "null"):
+                metadata[prefix] = value
+        return records, metadata
+    
+    def _split_document(self, document: Any, records_path: Optional[str] = None) -> Tuple[Optional[List[Any]], Dict[str, Any]]:
+        """Records and scalar metadata of an already decoded JSON document"""
+        if isinstance(document, list):
+            return document, {}
+        if not isinstance(document, dict):
+            raise ValueError("Unsupported API response format")
+        
+        metadata = {}
+        def flatten(node: Dict[str, Any], prefix: str) -> None:
+            for key, value in node.items():
+                path = f"{prefix}.{key}" if prefix else key
+                if isinstance(value, dict):
+                    flatten(value, path)
+                elif not isinstance(value, list):
+                    metadata[path] = value
+        flatten(document, "")
+        
+        keys = [records_path] if records_path else self.RECORD_KEYS
+        for key in keys:
+            node = document
+            for part in key.split("."):
+                node = node.get(part) if isinstance(node, dict) else None
+            if isinstance(node, list):
+                return node, metadata
+        return None, metadata
+    
+    def _unflatten(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild a single-record response from its scalar fields"""
+        record: Dict[str, Any] = {}
+        for path, value in metadata.items():
+            node = record
+            *parents, key = path.split(".")
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[key] = value
+        return record
+    
+    def _first_field(self, metadata: Dict[str, Any], fields: List[str]) -> Any:
+        for field in fields:
+            if metadata.get(field) is not None:
+                return metadata[field]
+        return None
+    
+    def _total_pages(self, metadata: Dict[str, Any], page_size: int) -> Optional[int]:
+        total_pages = self._first_field(metadata, self.TOTAL_PAGES_FIELDS)
+        if total_pages is not None:
+            return int(total_pages)
+        total = self._first_field(metadata, self.TOTAL_FIELDS)
+        if total is not None:
+            return -(-int(total) // page_size)
+        return None
+    
     def validate_source(self, api_url: str) -> bool:
         """Validate API endpoint accessibility"""
         try:
@@ -372,10 +1164,208 @@ class APIImporter(BaseImportHandler):
         except Exception:
             return False
     
-    def _auto_infer_types(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Same auto-inference logic as CSV"""
-        csv_importer = CSVImporter()
-        return csv_importer._auto_infer_types(data)
+
+class ColumnarImporter(BaseImportHandler):
+    """Parquet, Feather and Arrow IPC file import handler
+    
+    Reads only the requested ``columns``. ``filters`` are ``(column, op, value)``
+    tuples as for the SQL importer; ``start_date``/``end_date`` add filters on
+    ``date_column`` (donation_date by default). Parquet row groups whose
+    statistics rule a filter out are skipped without being read. Feather and
+    Arrow IPC files are memory-mapped, so uncompressed files are read without
+    copying the column buffers.
+    """
+    
+    PARQUET_EXTENSIONS = [".parquet", ".pq"]
+    FILTER_OPERATORS = ["=", "==", "!=", "<", "<=", ">", ">=", "in", "not in"]
+    
+    def __init__(self):
+        super().__init__()
+        self.supported_formats = ["parquet", "pq", "feather", "arrow", "ipc"]
+    
+    async def import_data(self, file_path: str, **kwargs) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Import data from a Parquet, Feather or Arrow IPC file"""
+        try:
+            read_stats = {}
+            chunks = list(self._iter_tables(file_path, read_stats=read_stats, **kwargs))
+            if chunks:
+                data = self._to_pandas(pa.concat_tables(chunks), kwargs.get("schema"))
+            else:
+                data = self._to_pandas(self._empty_table(file_path, kwargs.get("columns")), kwargs.get("schema"))
+            
+            # Generate statistics
+            stats = self.get_import_stats(data, file_path)
+            stats["file_size_mb"] = Path(file_path).stat().st_size / (1024 * 1024)
+            stats.update(read_stats)
+            
+            return data, stats
+            
+        except Exception as e:
+            self.logger.error(f"Error importing columnar file {file_path}: {str(e)}")
+            raise
+    
+    def iter_chunks(self, file_path: str, chunksize: int = 10000, **kwargs) -> Iterator[pd.DataFrame]:
+        """Yield the selected rows and columns per row group (or record batch), in slices of at most ``chunksize`` rows"""
+        for table in self._iter_tables(file_path, **kwargs):
+            for start in range(0, table.num_rows, chunksize):
+                yield self._to_pandas(table.slice(start, chunksize), kwargs.get("schema"))
+    
+    def validate_source(self, file_path: str) -> bool:
+        """Validate columnar file"""
+        try:
+            path = Path(file_path)
+            return (PYARROW_AVAILABLE and path.exists() and path.is_file() and
+                    path.suffix.lower() in self.PARQUET_EXTENSIONS + [".feather", ".arrow", ".ipc", ".arrows"])
+        except:
+            return False
+    
+    def _iter_tables(self, file_path: str, columns: Optional[List[str]] = None,
+                     filters: Optional[List[Tuple[str, str, Any]]] = None, date_column: str = "donation_date",
+                     start_date: Any = None, end_date: Any = None, read_stats: Optional[Dict[str, Any]] = None,
+                     **kwargs) -> Iterator["pa.Table"]:
+        """Projected, filtered Arrow tables, one per row group or record batch"""
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to import Parquet, Feather and Arrow files")
+        
+        filters = list(filters or [])
+        if start_date is not None:
+            filters.append((date_column, ">=", start_date))
+        if end_date is not None:
+            filters.append((date_column, "<=", end_date))
+        for _, operator, _ in filters:
+            if operator.lower() not in self.FILTER_OPERATORS:
+                raise ValueError(f"Unsupported filter operator: {operator}. Supported operators: {self.FILTER_OPERATORS}")
+        
+        read_stats = read_stats if read_stats is not None else {}
+        if Path(file_path).suffix.lower() in self.PARQUET_EXTENSIONS:
+            yield from self._iter_parquet(file_path, columns, filters, read_stats)
+        else:
+            yield from self._iter_ipc(file_path, columns, filters, read_stats)
+    
+    def _iter_parquet(self, file_path: str, columns: Optional[List[str]], filters: List[Tuple[str, str, Any]],
+                      read_stats: Dict[str, Any]) -> Iterator["pa.Table"]:
+        parquet_file = pq.ParquetFile(file_path, memory_map=True)
+        schema = parquet_file.schema_arrow
+        metadata = parquet_file.metadata
+        # Filter columns are read too, and dropped again after filtering
+        read_columns = None if columns is None else list(dict.fromkeys(list(columns) + [f[0] for f in filters]))
+        
+        selected = [group for group in range(metadata.num_row_groups)
+                    if self._row_group_may_match(metadata.row_group(group), schema, filters)]
+        read_stats.update({"file_format": "parquet", "row_groups_total": metadata.num_row_groups,
+                           "row_groups_read": len(selected)})
+        
+        for group in selected:
+            table = self._filter_table(parquet_file.read_row_group(group, columns=read_columns), filters)
+            yield table.select(columns) if columns is not None else table
+    
+    def _iter_ipc(self, file_path: str, columns: Optional[List[str]], filters: List[Tuple[str, str, Any]],
+                  read_stats: Dict[str, Any]) -> Iterator["pa.Table"]:
+        source = pa.memory_map(file_path, "r")
+        try:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+            read_stats.update({"file_format": "arrow_ipc_file", "record_batches": reader.num_record_batches})
+        except pa.ArrowInvalid:
+            # Not the random-access file format: read it as an IPC stream
+            source.seek(0)
+            batches = iter(pa.ipc.open_stream(source))
+            read_stats.update({"file_format": "arrow_ipc_stream"})
+        read_stats["memory_mapped"] = True
+        
+        for batch in batches:
+            table = self._filter_table(pa.Table.from_batches([batch]), filters)
+            yield table.select(columns) if columns is not None else table
+    
+    def _row_group_may_match(self, row_group: Any, schema: "pa.Schema", filters: List[Tuple[str, str, Any]]) -> bool:
+        """Whether a row group's min/max statistics allow rows matching every filter"""
+        statistics = {}
+        for index in range(row_group.num_columns):
+            column = row_group.column(index)
+            if column.statistics is not None and column.statistics.has_min_max:
+                statistics[column.path_in_schema] = (column.statistics.min, column.statistics.max)
+        
+        for field, operator, value in filters:
+            if field not in statistics or schema.get_field_index(field) == -1:
+                continue
+            low, high = statistics[field]
+            field_type = schema.field(field).type
+            try:
+                if operator.lower() in ("in", "not in"):
+                    values = [self._filter_scalar(item, field_type).as_py() for item in value]
+                else:
+                    value = self._filter_scalar(value, field_type).as_py()
+                operator = operator.lower()
+                if operator in ("=", "==") and not (low <= value <= high):
+                    return False
+                if operator == "!=" and low == high == value:
+                    return False
+                if (operator == "<" and not low < value) or (operator == "<=" and not low <= value):
+                    return False
+                if (operator == ">" and not high > value) or (operator == ">=" and not high >= value):
+                    return False
+                if operator == "in" and not any(low <= item <= high for item in values):
+                    return False
+            except (pa.ArrowException, TypeError, ValueError):
+                # Statistics that cannot be compared never exclude a row group
+                continue
+        return True
+    
+    def _filter_table(self, table: "pa.Table", filters: List[Tuple[str, str, Any]]) -> "pa.Table":
+        """Keep the rows matching every filter; as in SQL, nulls match nothing but ``= None``"""
+        for field, operator, value in filters:
+            column = table.column(field)
+            operator = operator.lower()
+            if value is None and operator in ("=", "==", "!="):
+                mask = pc.is_null(column) if operator != "!=" else pc.is_valid(column)
+            elif operator in ("in", "not in"):
+                values = pa.array([self._filter_scalar(item, column.type).as_py() for item in value], type=column.type)
+                mask = pc.is_in(column, value_set=values)
+                if operator == "not in":
+                    # invert() is true for nulls; SQL's NOT IN never matches them
+                    mask = pc.and_(pc.invert(mask), pc.is_valid(column))
+            else:
+                scalar = self._filter_scalar(value, column.type)
+                mask = {"=": pc.equal, "==": pc.equal, "!=": pc.not_equal, "<": pc.less, "<=": pc.less_equal,
+                        ">": pc.greater, ">=": pc.greater_equal}[operator](column, scalar)
+            table = table.filter(mask)
+        return table
+    
+    def _filter_scalar(self, value: Any, field_type: "pa.DataType") -> "pa.Scalar":
+        """A filter value as an Arrow scalar of the column's type, e.g. '2024-01-31' for a timestamp column
+        
+        Dates for a timezone-aware column are read in that timezone when they
+        carry none, and converted to it when they do.
+        """
+        if pa.types.is_timestamp(field_type) and isinstance(value, (str, datetime, pd.Timestamp)):
+            value = pd.Timestamp(value)
+            if field_type.tz is not None:
+                value = value.tz_localize(field_type.tz) if value.tzinfo is None else value.tz_convert(field_type.tz)
+            elif value.tzinfo is not None:
+                value = value.tz_convert(None)
+            return pa.scalar(value, type=field_type)
+        if isinstance(value, pd.Timestamp):
+            value = value.to_pydatetime()
+        return pa.scalar(value).cast(field_type)
+    
+    def _empty_table(self, file_path: str, columns: Optional[List[str]]) -> "pa.Table":
+        if Path(file_path).suffix.lower() in self.PARQUET_EXTENSIONS:
+            schema = pq.read_schema(file_path)
+        else:
+            with pa.memory_map(file_path, "r") as source:
+                try:
+                    schema = pa.ipc.open_file(source).schema
+                except pa.ArrowInvalid:
+                    source.seek(0)
+                    schema = pa.ipc.open_stream(source).schema
+        table = schema.empty_table()
+        return table.select(columns) if columns is not None else table
+    
+    def _to_pandas(self, table: "pa.Table", schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        # One block per column avoids consolidating (copying) columns into 2-D blocks
+        data = table.to_pandas(split_blocks=True)
+        return apply_schema(data, schema) if schema else data
+    
 
 class ImportHandlerFactory:
     """Factory for creating appropriate import handlers"""
@@ -395,7 +1385,12 @@ class ImportHandlerFactory:
             "db": SQLImporter,
             "api": APIImporter,
             "rest": APIImporter,
-            "endpoint": APIImporter
+            "endpoint": APIImporter,
+            "parquet": ColumnarImporter,
+            "pq": ColumnarImporter,
+            "feather": ColumnarImporter,
+            "arrow": ColumnarImporter,
+            "ipc": ColumnarImporter
         }
     
     def get_handler(self, format_type: str) -> BaseImportHandler:
@@ -417,3 +1412,52 @@ class ImportHandlerFactory:
             raise ValueError("Handler must inherit from BaseImportHandler")
         
         self.handlers[format_type.lower()] = handler_class
+
+
+def _iter_sheet_chunks(file_path: str, sheet_name: Any, chunksize: int,
+                       na_values: List[str]) -> Iterator[pd.DataFrame]:
+    """Rows of one sheet as untyped DataFrame chunks, read with openpyxl in read-only mode"""
+    workbook = openpyxl.load_workbook(_workbook_source(file_path), read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(name) if name is not None else f"Unnamed: {position}" for position, name in enumerate(header)]
+        
+        buffered = []
+        for row in rows:
+            # Blank rows are skipped, like read_excel does
+            if all(value is None for value in row):
+                continue
+            buffered.append(row[:len(columns)])
+            if len(buffered) >= chunksize:
+                yield _sheet_frame(buffered, columns, na_values)
+                buffered = []
+        if buffered:
+            yield _sheet_frame(buffered, columns, na_values)
+    finally:
+        workbook.close()
+
+
+def _workbook_source(file_path: str) -> Any:
+    """Path of a workbook, or its decompressed bytes in memory for zipped/compressed workbooks
+
+    Workbooks are zip containers that need random access, so they cannot be
+    streamed; the in-memory copy is still the (internally compressed) .xlsx.
+    """
+    if detect_compression(file_path) is None:
+        return file_path
+    return read_decompressed(file_path)
+
+
+def _sheet_frame(rows: List[tuple], columns: List[str], na_values: List[str]) -> pd.DataFrame:
+    data = pd.DataFrame.from_records(rows, columns=columns)
+    return data.mask(data.isin(na_values))
+
+
+def _read_sheet(file_path: str, sheet_name: Any, na_values: List[str]) -> pd.DataFrame:
+    """Whole sheet as one untyped DataFrame; runs in a worker process for parallel sheet loading"""
+    chunks = list(_iter_sheet_chunks(file_path, sheet_name, 50000, na_values))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
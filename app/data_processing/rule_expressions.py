@@ -0,0 +1,366 @@
+"""
+Compiler for ConsistencyRule expressions
+
+Rule expressions are small SQL-like predicates over record fields, e.g.
+``donation_date - last_donation_date >= 56 days OR last_donation_date IS NULL``.
+They are parsed once into a tree of column operations that is evaluated over
+whole DataFrame columns.
+
+Evaluation follows SQL CHECK semantics: comparisons involving a null operand
+are *unknown*, and a record only fails a rule when the expression is known
+to be false.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+_TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<number>\d+(?:\.\d+)?)
+      | (?P<string>'(?:[^']|'')*')
+      | (?P<operator>>=|<=|!=|<>|==|=|>|<|\+|-|\*|/|\(|\)|,)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )""", re.VERBOSE)
+
+_KEYWORDS = {"AND", "OR", "NOT", "IS", "NULL", "IN", "TRUE", "FALSE"}
+
+_DURATION_UNITS = {
+    "day": "D", "days": "D",
+    "week": "W", "weeks": "W",
+    "hour": "h", "hours": "h",
+    "minute": "min", "minutes": "min"
+}
+
+_COMPARISONS = {
+    ">=": lambda left, right: left >= right,
+    "<=": lambda left, right: left <= right,
+    ">": lambda left, right: left > right,
+    "<": lambda left, right: left < right,
+    "=": lambda left, right: left == right,
+    "==": lambda left, right: left == right,
+    "!=": lambda left, right: left != right,
+    "<>": lambda left, right: left != right
+}
+
+_ARITHMETIC = {
+    "+": lambda left, right: left + right,
+    "-": lambda left, right: left - right,
+    "*": lambda left, right: left * right,
+    "/": lambda left, right: left / right
+}
+
+# A boolean result is a pair of arrays: (value, known)
+Truth = Tuple[np.ndarray, np.ndarray]
+
+
+class ExpressionSyntaxError(ValueError):
+    """Raised when a rule expression cannot be parsed"""
+
+
+class CompiledExpression:
+    """A rule expression compiled into vectorized column operations"""
+
+    def __init__(self, expression: str, evaluator: Callable[[pd.DataFrame], Truth], columns: Set[str]):
+        self.expression = expression
+        self.columns = frozenset(columns)
+        self._evaluator = evaluator
+
+    def evaluate(self, data: pd.DataFrame) -> Truth:
+        """Evaluate over all rows, returning (value, known) boolean arrays"""
+        return self._evaluator(data)
+
+    def failure_mask(self, data: pd.DataFrame) -> np.ndarray:
+        """True for rows where the expression is known to be false"""
+        value, known = self.evaluate(data)
+        return known & ~value
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.expression!r})"
+
+
+@lru_cache(maxsize=256)
+def compile_rule_expression(expression: str) -> CompiledExpression:
+    """Parse a rule expression once; results are cached per expression string"""
+    parser = _Parser(expression)
+    node = parser.parse()
+    return CompiledExpression(expression, _as_truth(node), parser.columns)
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_PATTERN.match(expression, position)
+        if match is None or match.end() == position:
+            raise ExpressionSyntaxError(f"Unexpected character at position {position} in {expression!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "name" and text.upper() in _KEYWORDS:
+            kind, text = "keyword", text.upper()
+        tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing evaluator closures"""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.columns: Set[str] = set()
+
+    def parse(self) -> Callable:
+        node = self._or()
+        if self.position != len(self.tokens):
+            raise ExpressionSyntaxError(f"Unexpected token {self._peek()[1]!r} in {self.expression!r}")
+        return node
+
+    def _peek(self) -> Tuple[Optional[str], Optional[str]]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None, None
+
+    def _accept(self, kind: str, text: Optional[str] = None) -> Optional[str]:
+        token_kind, token_text = self._peek()
+        if token_kind == kind and (text is None or token_text == text):
+            self.position += 1
+            return token_text
+        return None
+
+    def _expect(self, kind: str, text: Optional[str] = None) -> str:
+        token = self._accept(kind, text)
+        if token is None:
+            raise ExpressionSyntaxError(f"Expected {text or kind} in {self.expression!r}")
+        return token
+
+    def _or(self) -> Callable:
+        node = self._and()
+        while self._accept("keyword", "OR"):
+            node = _or_node(node, self._and())
+        return node
+
+    def _and(self) -> Callable:
+        node = self._not()
+        while self._accept("keyword", "AND"):
+            node = _and_node(node, self._not())
+        return node
+
+    def _not(self) -> Callable:
+        if self._accept("keyword", "NOT"):
+            return _not_node(self._not())
+        return self._predicate()
+
+    def _predicate(self) -> Callable:
+        left = self._arithmetic()
+
+        kind, text = self._peek()
+        if kind == "operator" and text in _COMPARISONS:
+            self.position += 1
+            return _comparison_node(_COMPARISONS[text], left, self._arithmetic())
+
+        if self._accept("keyword", "IS"):
+            negate = bool(self._accept("keyword", "NOT"))
+            self._expect("keyword", "NULL")
+            node = _is_null_node(left)
+            return _not_node(node) if negate else node
+
+        negate = bool(self._accept("keyword", "NOT"))
+        if self._accept("keyword", "IN"):
+            self._expect("operator", "(")
+            values = [self._literal()]
+            while self._accept("operator", ","):
+                values.append(self._literal())
+            self._expect("operator", ")")
+            node = _in_node(left, values)
+            return _not_node(node) if negate else node
+        if negate:
+            raise ExpressionSyntaxError(f"Expected IN after NOT in {self.expression!r}")
+
+        return left
+
+    def _arithmetic(self) -> Callable:
+        node = self._term()
+        while True:
+            kind, text = self._peek()
+            if kind == "operator" and text in ("+", "-"):
+                self.position += 1
+                node = _arithmetic_node(_ARITHMETIC[text], node, self._term())
+            else:
+                return node
+
+    def _term(self) -> Callable:
+        node = self._factor()
+        while True:
+            kind, text = self._peek()
+            if kind == "operator" and text in ("*", "/"):
+                self.position += 1
+                node = _arithmetic_node(_ARITHMETIC[text], node, self._factor())
+            else:
+                return node
+
+    def _factor(self) -> Callable:
+        if self._accept("operator", "("):
+            node = self._or()
+            self._expect("operator", ")")
+            return node
+        if self._accept("operator", "-"):
+            operand = self._factor()
+            return lambda data: -operand(data)
+
+        kind, text = self._peek()
+        if kind == "name":
+            self.position += 1
+            self.columns.add(text)
+            return _column_node(text)
+
+        value = self._literal()
+        return lambda data: value
+
+    def _literal(self) -> Any:
+        kind, text = self._peek()
+        if kind == "number":
+            self.position += 1
+            number = float(text) if "." in text else int(text)
+            unit_kind, unit = self._peek()
+            if unit_kind == "name" and unit.lower() in _DURATION_UNITS:
+                self.position += 1
+                return pd.Timedelta(number, unit=_DURATION_UNITS[unit.lower()])
+            return number
+        if kind == "string":
+            self.position += 1
+            return text[1:-1].replace("''", "'")
+        if kind == "keyword" and text in ("TRUE", "FALSE"):
+            self.position += 1
+            return text == "TRUE"
+        if kind == "keyword" and text == "NULL":
+            self.position += 1
+            return None
+        if kind is None:
+            raise ExpressionSyntaxError(f"Unexpected end of expression in {self.expression!r}")
+        raise ExpressionSyntaxError(f"Unexpected token {text!r} in {self.expression!r}")
+
+
+def _column_node(name: str) -> Callable:
+    def evaluate(data: pd.DataFrame):
+        if name in data.columns:
+            return data[name]
+        # Missing fields behave as null, like record.get() in row validation
+        return pd.Series(np.nan, index=data.index)
+    return evaluate
+
+
+def _notna(value: Any, length: int) -> np.ndarray:
+    if isinstance(value, pd.Series):
+        return value.notna().to_numpy()
+    return np.full(length, not pd.isna(value))
+
+
+def _to_bool_array(value: Any, length: int) -> np.ndarray:
+    if isinstance(value, pd.Series):
+        return value.fillna(False).to_numpy(dtype=bool)
+    return np.full(length, bool(value))
+
+
+def _is_datetime_like(value: Any) -> bool:
+    if isinstance(value, pd.Series):
+        return pd.api.types.is_datetime64_any_dtype(value.dtype) or pd.api.types.is_timedelta64_dtype(value.dtype)
+    return isinstance(value, (pd.Timestamp, pd.Timedelta))
+
+
+def _coerce_datetime(value: Any) -> Any:
+    # Object columns may hold date strings; all-null columns (e.g. missing fields) become NaT
+    if isinstance(value, pd.Series) and not _is_datetime_like(value) and (value.dtype == object or value.isna().all()):
+        return pd.to_datetime(value, errors="coerce")
+    return value
+
+
+def _apply_binary(operation: Callable, left: Any, right: Any) -> Any:
+    """Apply an operator, parsing string date columns when the plain operation fails"""
+    if _is_datetime_like(left) or _is_datetime_like(right):
+        left, right = _coerce_datetime(left), _coerce_datetime(right)
+    try:
+        return operation(left, right)
+    except TypeError:
+        return operation(_coerce_datetime(left), _coerce_datetime(right))
+
+
+def _arithmetic_node(operation: Callable, left_node: Callable, right_node: Callable) -> Callable:
+    return lambda data: _apply_binary(operation, left_node(data), right_node(data))
+
+
+def _comparison_node(operation: Callable, left_node: Callable, right_node: Callable) -> Callable:
+    def evaluate(data: pd.DataFrame) -> Truth:
+        left, right = left_node(data), right_node(data)
+        known = _notna(left, len(data)) & _notna(right, len(data))
+        value = _to_bool_array(_apply_binary(operation, left, right), len(data))
+        return value & known, known
+    return evaluate
+
+
+def _is_null_node(operand_node: Callable) -> Callable:
+    def evaluate(data: pd.DataFrame) -> Truth:
+        value = ~_notna(operand_node(data), len(data))
+        return value, np.ones(len(data), dtype=bool)
+    return evaluate
+
+
+def _in_node(operand_node: Callable, values: List[Any]) -> Callable:
+    def evaluate(data: pd.DataFrame) -> Truth:
+        operand = operand_node(data)
+        known = _notna(operand, len(data))
+        if isinstance(operand, pd.Series):
+            value = operand.isin(values).to_numpy()
+        else:
+            value = np.full(len(data), operand in values)
+        return value & known, known
+    return evaluate
+
+
+def _as_truth(node: Callable) -> Callable:
+    """Wrap a value node so it can be used where a boolean is expected"""
+    def evaluate(data: pd.DataFrame) -> Truth:
+        result = node(data)
+        if isinstance(result, tuple):
+            return result
+        known = _notna(result, len(data))
+        return _to_bool_array(result, len(data)) & known, known
+    return evaluate
+
+
+def _and_node(left_node: Callable, right_node: Callable) -> Callable:
+    left_node, right_node = _as_truth(left_node), _as_truth(right_node)
+
+    def evaluate(data: pd.DataFrame) -> Truth:
+        left_value, left_known = left_node(data)
+        right_value, right_known = right_node(data)
+        known_false = (left_known & ~left_value) | (right_known & ~right_value)
+        value = left_value & right_value & left_known & right_known
+        return value, value | known_false
+    return evaluate
+
+
+def _or_node(left_node: Callable, right_node: Callable) -> Callable:
+    left_node, right_node = _as_truth(left_node), _as_truth(right_node)
+
+    def evaluate(data: pd.DataFrame) -> Truth:
+        left_value, left_known = left_node(data)
+        right_value, right_known = right_node(data)
+        value = (left_known & left_value) | (right_known & right_value)
+        return value, value | (left_known & right_known)
+    return evaluate
+
+
+def _not_node(operand_node: Callable) -> Callable:
+    operand_node = _as_truth(operand_node)
+
+    def evaluate(data: pd.DataFrame) -> Truth:
+        value, known = operand_node(data)
+        return ~value & known, known
+    return evaluate
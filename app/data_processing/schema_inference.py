@@ -0,0 +1,196 @@
+"""
+Sample-based schema inference and schema cache for import handlers
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .file_locks import atomic_write, file_lock
+from ..config import Config
+
+# Logical column types for import schemas
+SCHEMA_TYPES = ["string", "int", "float", "datetime", "bool"]
+
+_DATETIME_KEYWORDS = ["date", "time", "created", "updated"]
+
+
+def infer_schema(sample: pd.DataFrame) -> Dict[str, str]:
+    """Infer column types from a sample with the importers' auto-inference rules
+
+    Columns named like dates are datetimes; typed sources keep their numeric
+    and boolean dtypes; other columns with any numeric value are numbers
+    (int when every value is written as a whole number); everything else is
+    a string.
+    """
+    schema = {}
+    for column in sample.columns:
+        values = sample[column]
+        if any(keyword in str(column).lower() for keyword in _DATETIME_KEYWORDS):
+            schema[column] = "datetime"
+            continue
+
+        if pd.api.types.is_bool_dtype(values.dtype):
+            schema[column] = "bool"
+            continue
+        if pd.api.types.is_integer_dtype(values.dtype):
+            schema[column] = "int"
+            continue
+        if pd.api.types.is_float_dtype(values.dtype):
+            schema[column] = "float"
+            continue
+
+        numeric = pd.to_numeric(values, errors="coerce")
+        if numeric.isna().all():
+            schema[column] = "string"
+        elif values.dropna().astype(str).str.fullmatch(r"[+-]?\d+").all():
+            schema[column] = "int"
+        else:
+            schema[column] = "float"
+
+    return schema
+
+
+def apply_schema(data: pd.DataFrame, schema: Dict[str, str], stringify: bool = False) -> pd.DataFrame:
+    """Convert columns to their schema types; unparseable values become nulls
+
+    With ``stringify`` string columns are cast with ``astype(str)`` like the
+    original whole-column inference did.
+    """
+    for column, dtype in schema.items():
+        if column not in data.columns:
+            continue
+        if dtype == "datetime":
+            data[column] = pd.to_datetime(data[column], errors="coerce")
+        elif dtype in ("int", "float"):
+            data[column] = pd.to_numeric(data[column], errors="coerce")
+        elif dtype == "string" and stringify:
+            data[column] = data[column].astype(str)
+    return data
+
+
+def header_fingerprint(columns: List[str]) -> str:
+    """Stable fingerprint of a column header (names and order)"""
+    return hashlib.sha1("\x1f".join(map(str, columns)).encode("utf-8")).hexdigest()[:16]
+
+
+class SchemaCache:
+    """Inferred schemas keyed by source and header fingerprint, persisted as JSON
+
+    A source is whatever identifies one feed, e.g. a blood center id or a
+    file path. Overrides set for a source take precedence over inferred
+    types for every header that source sends. Without a ``path`` the cache
+    is never read from or written to disk.
+
+    Importers fall back to the file path as source, so every newly named
+    file adds a schema; only the ``max_entries`` most recently used ones
+    are kept. Overrides are never evicted. Changes are made under a file
+    lock on the latest stored state, so worker processes sharing the file
+    keep each other's schemas.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.path = path
+        self.max_entries = Config.SCHEMA_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self._lock = threading.Lock()
+        self._schemas: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._overrides: Dict[str, Dict[str, str]] = {}
+        if path and Path(path).exists():
+            self._load()
+
+    def get(self, source_id: str, columns: List[str]) -> Optional[Dict[str, str]]:
+        key = self._key(source_id, columns)
+        with self._lock:
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self._schemas.move_to_end(key)
+        return dict(schema) if schema is not None else None
+
+    def put(self, source_id: str, columns: List[str], schema: Dict[str, str]) -> None:
+        key = self._key(source_id, columns)
+        with self._lock:
+            if self._schemas.get(key) == schema:
+                self._schemas.move_to_end(key)
+                return
+        with self._lock, self._file_lock():
+            self._reload()
+            self._schemas[key] = dict(schema)
+            self._schemas.move_to_end(key)
+            while len(self._schemas) > self.max_entries:
+                self._schemas.popitem(last=False)
+            self._save()
+
+    def set_override(self, source_id: str, schema: Dict[str, str]) -> None:
+        """Pin column types for a source, replacing any previous override"""
+        invalid = {column: dtype for column, dtype in schema.items() if dtype not in SCHEMA_TYPES}
+        if invalid:
+            raise ValueError(f"Unsupported schema types: {invalid}. Supported types: {SCHEMA_TYPES}")
+        with self._lock, self._file_lock():
+            self._reload()
+            self._overrides[source_id] = dict(schema)
+            self._save()
+
+    def get_override(self, source_id: Optional[str]) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._overrides.get(source_id, {})) if source_id else {}
+
+    def clear(self, source_id: Optional[str] = None) -> None:
+        """Forget cached schemas (and overrides) for one source, or for all sources"""
+        with self._lock, self._file_lock():
+            self._reload()
+            if source_id is None:
+                self._schemas.clear()
+                self._overrides.clear()
+            else:
+                prefix = f"{source_id}|"
+                self._schemas = OrderedDict((key, value) for key, value in self._schemas.items() if not key.startswith(prefix))
+                self._overrides.pop(source_id, None)
+            self._save()
+
+    def _key(self, source_id: str, columns: List[str]) -> str:
+        return f"{source_id}|{header_fingerprint(columns)}"
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as handle:
+            stored = json.load(handle)
+        # Stored least recently used first
+        self._schemas = OrderedDict(stored.get("schemas", {}))
+        while len(self._schemas) > self.max_entries:
+            self._schemas.popitem(last=False)
+        self._overrides = stored.get("overrides", {})
+
+    def _file_lock(self):
+        return file_lock(self.path) if self.path else nullcontext()
+
+    def _reload(self) -> None:
+        if self.path and Path(self.path).exists():
+            self._load()
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        with atomic_write(self.path, encoding="utf-8") as handle:
+            json.dump({"schemas": self._schemas, "overrides": self._overrides}, handle, indent=2)
+
+
+_SCHEMA_CACHE: Optional[SchemaCache] = None
+_SCHEMA_CACHE_LOCK = threading.Lock()
+
+
+def get_schema_cache() -> SchemaCache:
+    """Process-wide schema cache, persisted at Config.SCHEMA_CACHE_PATH when one is configured
+
+    Without a configured path the cache lives in memory only, so importing
+    files never writes state next to the caller's working directory.
+    """
+    global _SCHEMA_CACHE
+    with _SCHEMA_CACHE_LOCK:
+        if _SCHEMA_CACHE is None:
+            _SCHEMA_CACHE = SchemaCache(Config.SCHEMA_CACHE_PATH)
+        return _SCHEMA_CACHE
@@ -0,0 +1,94 @@
+"""
+Per-stage peak memory tracking for processing pipelines
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_MB = 1024 * 1024
+
+# tracemalloc is process-wide, so its start/stop and peak resets are shared by
+# every tracker, including those of chunks running in other threads
+_tracing_lock = Lock()
+_tracing_users = 0
+_started_tracing = False
+_open_frames: Dict[int, Dict[str, int]] = {}
+
+
+def _enter_frame(frame: Dict[str, int]) -> None:
+    """Start tracing if no stage is open yet, then reset the peak for a new stage"""
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_users += 1
+
+        current, peak = tracemalloc.get_traced_memory()
+        # Resetting the peak below would hide the peak so far of every open stage
+        for open_frame in _open_frames.values():
+            open_frame["carried_peak"] = max(open_frame["carried_peak"], peak)
+        tracemalloc.reset_peak()
+
+        frame["baseline"] = current
+        _open_frames[id(frame)] = frame
+
+
+def _exit_frame(frame: Dict[str, int]) -> Tuple[int, int]:
+    """Current and peak traced memory for a closing stage; stops tracing after the last open stage"""
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        current, peak = tracemalloc.get_traced_memory()
+        del _open_frames[id(frame)]
+
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+    return current, max(peak, frame["carried_peak"])
+
+
+class StageMemoryTracker:
+    """Record the peak traced memory of each pipeline stage
+
+    Uses tracemalloc, which sees NumPy (and therefore pandas) buffers. Stages
+    may nest: an outer stage's peak includes the peaks of its inner stages.
+    Tracing is started once for as long as any tracker has a stage open, and
+    trackers running concurrently in other threads never lower each other's
+    peaks. Their allocations are counted in each other's stages though;
+    measure one dataset at a time for exact numbers.
+    """
+
+    def __init__(self):
+        self.stages: List[Dict[str, Any]] = []
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        frame = {"baseline": 0, "carried_peak": 0}
+        _enter_frame(frame)
+        record = {"stage": name, "depth": self._depth}
+        self.stages.append(record)
+        self._depth += 1
+        start_time = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            after, peak = _exit_frame(frame)
+            self._depth -= 1
+            record["peak_mb"] = round((peak - frame["baseline"]) / _MB, 3)
+            record["retained_mb"] = round((after - frame["baseline"]) / _MB, 3)
+            record["seconds"] = round(time.perf_counter() - start_time, 4)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Stages in the order they started, with peak and retained memory in MB"""
+        return [dict(record) for record in self.stages]
+
+
+def track_stage(tracker: Optional[StageMemoryTracker], name: str):
+    """Context manager for a stage; does nothing without a tracker"""
+    return tracker.stage(name) if tracker is not None else nullcontext()
@@ -0,0 +1,284 @@
+"""
+Incremental exporters for streaming batch processing
+"""
+
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from .dedup_index import hash_key_fields
+
+STREAMING_EXPORT_FORMATS = ["csv", "parquet"]
+
+
+class StreamingExporter:
+    """Append processed chunks to a single CSV or Parquet file
+
+    The first chunk fixes the output columns. Later chunks are aligned to
+    them: missing columns are written as nulls and extra columns are dropped
+    with a warning, except columns starting with one of
+    ``protected_prefixes`` (one-hot columns), which raise ValueError rather
+    than lose the rows that set them. Parquet output gets one row group per
+    chunk; when a later chunk needs a wider column type (int to float,
+    numbers to text) the schema is widened and the row groups already
+    written are rewritten with it. Values that fit no common type raise
+    TypeError.
+    """
+
+    def __init__(self, output_path: str, format: str = "parquet", protected_prefixes: Optional[List[str]] = None):
+        format = format.lower()
+        if format not in STREAMING_EXPORT_FORMATS:
+            raise ValueError(f"Unsupported streaming export format: {format}. Supported formats: {STREAMING_EXPORT_FORMATS}")
+        if format == "parquet" and not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for streaming Parquet export")
+
+        self.output_path = output_path
+        self.format = format
+        self.columns: Optional[List[str]] = None
+        self.records_exported = 0
+        self.chunks_written = 0
+        self.dropped_columns = set()
+        self.protected_prefixes = tuple(protected_prefixes or ())
+        self.logger = logging.getLogger(__name__)
+        self._schema = None
+        self._writer = None
+        # Where Parquet output is being written; a widened copy until close() moves it into place
+        self._write_path = output_path
+        self._rewrites = 0
+
+    def write(self, data: pd.DataFrame) -> None:
+        """Append one chunk to the output file"""
+        if self.columns is None:
+            self.columns = list(data.columns)
+        else:
+            data = self._align_columns(data)
+
+        if self.format == "csv":
+            data.to_csv(self.output_path, mode="w" if self.chunks_written == 0 else "a",
+                        header=self.chunks_written == 0, index=False)
+        else:
+            self._write_parquet(data)
+
+        self.records_exported += len(data)
+        self.chunks_written += 1
+
+    def close(self) -> Dict[str, Any]:
+        """Finish the file and return export statistics"""
+        self._finish_parquet()
+
+        path = Path(self.output_path)
+        return {
+            "success": True,
+            "output_path": self.output_path,
+            "format": self.format,
+            "records_exported": self.records_exported,
+            "chunks_written": self.chunks_written,
+            "dropped_columns": sorted(self.dropped_columns),
+            "file_size_mb": path.stat().st_size / (1024 * 1024) if path.exists() else 0,
+            "exported_at": datetime.now().isoformat()
+        }
+
+    def __enter__(self) -> "StreamingExporter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self._finish_parquet()
+
+    def _align_columns(self, data: pd.DataFrame) -> pd.DataFrame:
+        extra = [column for column in data.columns if column not in self.columns]
+        protected = [column for column in extra if str(column).startswith(self.protected_prefixes)]
+        if protected:
+            raise ValueError(f"Columns not present in the first chunk would be dropped: {sorted(protected)}. "
+                             f"Encode categories with the stable vocabulary (encoding 'uint8') "
+                             f"so every chunk has the same one-hot columns")
+        new_extra = set(extra) - self.dropped_columns
+        if new_extra:
+            self.logger.warning(f"Dropping columns not present in the first chunk: {sorted(new_extra)}")
+            self.dropped_columns.update(new_extra)
+        if extra or list(data.columns) != self.columns:
+            data = data.reindex(columns=self.columns)
+        return data
+
+    def _write_parquet(self, data: pd.DataFrame) -> None:
+        if self._writer is None:
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            self._schema = table.schema
+            self._write_path = self.output_path
+            self._writer = pq.ParquetWriter(self._write_path, self._schema)
+        else:
+            table = self._to_schema(data)
+        self._writer.write_table(table)
+
+    def _to_schema(self, data: pd.DataFrame) -> "pa.Table":
+        """Convert a chunk to the file schema, widening the schema (and what was written) when the chunk needs it
+
+        Raises TypeError if a column's values cannot be represented in a
+        common type with the values already written.
+        """
+        try:
+            return pa.Table.from_pandas(data, schema=self._schema, preserve_index=False)
+        except (pa.ArrowException, TypeError, ValueError):
+            pass
+
+        arrays = []
+        widened = []
+        for field in self._schema:
+            array = _column_array(data[field.name], field.type)
+            column_type = _widen_type(field.name, field.type, array.type)
+            if not column_type.equals(field.type):
+                widened.append(field.with_type(column_type))
+            else:
+                widened.append(field)
+            arrays.append(array)
+
+        schema = pa.schema(widened)
+        if not schema.equals(self._schema):
+            self.logger.info(f"Widening streaming export schema: {[(f.name, str(f.type)) for f in schema if not f.type.equals(self._schema.field(f.name).type)]}")
+            self._rewrite(schema)
+        return pa.Table.from_arrays([_cast(array, field) for array, field in zip(arrays, schema)], schema=self._schema)
+
+    def _rewrite(self, schema: "pa.Schema") -> None:
+        """Copy the row groups written so far into a new file with the widened schema"""
+        self._writer.close()
+        source = self._write_path
+        self._rewrites += 1
+        target = f"{self.output_path}.widened{self._rewrites}"
+        writer = pq.ParquetWriter(target, schema)
+        parquet_file = pq.ParquetFile(source)
+        try:
+            for group in range(parquet_file.num_row_groups):
+                table = parquet_file.read_row_group(group)
+                writer.write_table(pa.Table.from_arrays(
+                    [_cast(column, field) for column, field in zip(table.columns, schema)], schema=schema))
+        except BaseException:
+            writer.close()
+            Path(target).unlink(missing_ok=True)
+            raise
+        finally:
+            parquet_file.close()
+        if source != self.output_path:
+            Path(source).unlink(missing_ok=True)
+        self._writer = writer
+        self._write_path = target
+        self._schema = schema
+
+    def _finish_parquet(self) -> None:
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        # A widened file was written next to the output; it only replaces it once complete
+        if self._write_path != self.output_path:
+            os.replace(self._write_path, self.output_path)
+            self._write_path = self.output_path
+
+
+def _column_array(values: pd.Series, current_type: "pa.DataType") -> "pa.Array":
+    """A chunk column as Arrow; all-null columns (e.g. added by alignment) are typed as null"""
+    if values.isna().all():
+        return pa.nulls(len(values))
+    try:
+        return pa.Array.from_pandas(values)
+    except (pa.ArrowException, TypeError, ValueError):
+        # Mixed Python objects: only usable if they convert to the type already written
+        try:
+            return pa.Array.from_pandas(values, type=current_type)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            raise TypeError(f"Column '{values.name}' holds values that cannot be written as {current_type}: {e}")
+
+
+def _widen_type(column: str, current: "pa.DataType", incoming: "pa.DataType") -> "pa.DataType":
+    """The narrowest type holding values of both types: int8 -> int64 -> double, anything with text -> string"""
+    if current.equals(incoming) or pa.types.is_null(incoming):
+        return current
+    try:
+        return pa.unify_schemas([pa.schema([(column, current)]), pa.schema([(column, incoming)])],
+                                promote_options="permissive").field(column).type
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        pass
+    if any(pa.types.is_string(t) or pa.types.is_large_string(t) or pa.types.is_dictionary(t) for t in (current, incoming)):
+        return pa.large_string() if pa.types.is_large_string(current) or pa.types.is_large_string(incoming) else pa.string()
+    raise TypeError(f"Column '{column}' cannot be written as both {current} and {incoming}")
+
+
+def _cast(array: Any, field: "pa.Field") -> Any:
+    """Safe cast: raises instead of truncating or rounding values"""
+    if array.type.equals(field.type):
+        return array
+    try:
+        return array.cast(field.type, safe=True)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        raise TypeError(f"Column '{field.name}' cannot be widened from {array.type} to {field.type}: {e}")
+
+
+def iter_exported_chunks(path: str, format: str = "parquet", chunksize: int = 50000) -> Iterator[pd.DataFrame]:
+    """Read a file written by StreamingExporter back in chunks"""
+    if format.lower() == "csv":
+        # As text, so values are written back exactly as they were
+        with pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False) as reader:
+            yield from reader
+    else:
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+
+
+def count_exported_rows(path: str, format: str = "parquet") -> int:
+    if format.lower() == "csv":
+        return sum(len(chunk) for chunk in iter_exported_chunks(path, format))
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def merge_streaming_output(output_path: str, delta_path: str, format: str = "parquet",
+                           key_fields: Optional[List[str]] = None, chunksize: int = 50000) -> Dict[str, Any]:
+    """Merge a processed delta file into an existing processed output, chunk by chunk
+
+    Without ``key_fields`` the delta rows are appended. With them, existing
+    rows whose key appears in the delta are replaced by the delta rows. The
+    output is rewritten to a temporary file and swapped in atomically, so
+    it is never left half-merged.
+    """
+    if not Path(output_path).exists():
+        os.replace(delta_path, output_path)
+        records = count_exported_rows(output_path, format)
+        return {"records_added": records, "records_replaced": 0, "total_records": records}
+
+    delta_keys = None
+    if key_fields:
+        hashes = [hash_key_fields(chunk, key_fields) for chunk in iter_exported_chunks(delta_path, format, chunksize)]
+        delta_keys = np.unique(np.concatenate(hashes)) if hashes else np.empty(0, dtype=np.uint64)
+
+    temporary_path = f"{output_path}.merging"
+    records_replaced = 0
+    records_added = 0
+    with StreamingExporter(temporary_path, format) as exporter:
+        for chunk in iter_exported_chunks(output_path, format, chunksize):
+            if delta_keys is not None and len(delta_keys):
+                replaced = np.isin(hash_key_fields(chunk, key_fields), delta_keys)
+                records_replaced += int(replaced.sum())
+                chunk = chunk[~replaced]
+            if not chunk.empty:
+                exporter.write(chunk)
+        for chunk in iter_exported_chunks(delta_path, format, chunksize):
+            records_added += len(chunk)
+            exporter.write(chunk)
+        export_stats = exporter.close()
+
+    os.replace(temporary_path, output_path)
+    return {
+        "records_added": records_added,
+        "records_replaced": records_replaced,
+        "total_records": export_stats["records_exported"],
+        "dropped_columns": export_stats["dropped_columns"]
+    }
@@ -0,0 +1,184 @@
+"""
+High-water marks for incremental imports
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from contextlib import nullcontext
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .file_locks import atomic_write, file_lock
+from ..config import Config
+
+# Bytes of a file's head fingerprinted to detect a rewritten (not appended) file
+HEAD_DIGEST_BYTES = 64 * 1024
+
+
+def head_digest(file_path: str, length: int) -> str:
+    """SHA-1 of the first ``length`` bytes of a file"""
+    with open(file_path, "rb") as handle:
+        return hashlib.sha1(handle.read(length)).hexdigest()
+
+
+def complete_lines_end(file_path: str, block_size: int = 64 * 1024) -> int:
+    """Byte offset just past the last newline, so a line still being appended is left for the next load"""
+    with open(file_path, "rb") as handle:
+        position = handle.seek(0, os.SEEK_END)
+        while position > 0:
+            start = max(0, position - block_size)
+            handle.seek(start)
+            block = handle.read(position - start)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                return start + newline + 1
+            position = start
+    return 0
+
+
+def offset_watermark(file_path: str, byte_offset: int, rows: int) -> Dict[str, Any]:
+    """Watermark for an append-only file read up to ``byte_offset``"""
+    head_bytes = min(byte_offset, HEAD_DIGEST_BYTES)
+    return {
+        "mode": "offset",
+        "byte_offset": byte_offset,
+        "rows": rows,
+        "head_bytes": head_bytes,
+        "head_digest": head_digest(file_path, head_bytes)
+    }
+
+
+def resume_offset(file_path: str, watermark: Optional[Dict[str, Any]]) -> Tuple[int, int]:
+    """Byte offset and row count to resume from; (0, 0) when the file was truncated or rewritten"""
+    if not watermark or watermark.get("mode") != "offset":
+        return 0, 0
+    if os.path.getsize(file_path) < watermark["byte_offset"]:
+        return 0, 0
+    if head_digest(file_path, watermark["head_bytes"]) != watermark["head_digest"]:
+        return 0, 0
+    return watermark["byte_offset"], watermark["rows"]
+
+
+def encode_watermark_value(value: Any) -> Dict[str, Any]:
+    """JSON-safe form of a watermark column value"""
+    if isinstance(value, datetime):
+        return {"kind": "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {"kind": "date", "value": value.isoformat()}
+    if hasattr(value, "item"):
+        value = value.item()
+    if not isinstance(value, (int, float, str)):
+        value = str(value)
+    return {"kind": "value", "value": value}
+
+
+def decode_watermark_value(encoded: Dict[str, Any]) -> Any:
+    if encoded["kind"] == "datetime":
+        return datetime.fromisoformat(encoded["value"])
+    if encoded["kind"] == "date":
+        return date.fromisoformat(encoded["value"])
+    return encoded["value"]
+
+
+class FileRegion(io.RawIOBase):
+    """Readable view of ``prefix`` followed by bytes [start, end) of a file
+
+    Lets the CSV readers parse only the rows appended since a watermark,
+    with the header line passed as the prefix, without copying the file.
+    """
+
+    def __init__(self, file_path: str, start: int, end: int, prefix: bytes = b""):
+        super().__init__()
+        self._file = open(file_path, "rb")
+        self._file.seek(start)
+        self._remaining = end - start
+        self._prefix = prefix
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            size = min(len(buffer), len(self._prefix))
+            buffer[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        read = self._file.readinto(memoryview(buffer)[:size])
+        self._remaining -= read
+        return read
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+class WatermarkStore:
+    """Last imported position per source, persisted as JSON
+
+    A watermark is whatever the source's importer needs to resume: a byte
+    offset and row count for append-only files, or the highest value of a
+    watermark column for SQL tables. Changes are made under a file lock on
+    the latest stored state, so worker processes sharing the file keep each
+    other's watermarks.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._watermarks: Dict[str, Dict[str, Any]] = {}
+        self._reload()
+
+    def get(self, source_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            watermark = self._watermarks.get(source_id)
+        return dict(watermark) if watermark is not None else None
+
+    def set(self, source_id: str, watermark: Dict[str, Any]) -> None:
+        with self._lock, self._file_lock():
+            self._reload()
+            self._watermarks[source_id] = {**watermark, "updated_at": datetime.now().isoformat()}
+            self._save()
+
+    def clear(self, source_id: Optional[str] = None) -> None:
+        """Forget the watermark of one source, or of all sources, so the next load is a full one"""
+        with self._lock, self._file_lock():
+            self._reload()
+            if source_id is None:
+                self._watermarks.clear()
+            else:
+                self._watermarks.pop(source_id, None)
+            self._save()
+
+    def _file_lock(self):
+        return file_lock(self.path) if self.path else nullcontext()
+
+    def _reload(self) -> None:
+        if self.path and Path(self.path).exists():
+            with open(self.path, "r", encoding="utf-8") as handle:
+                self._watermarks = json.load(handle)
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        with atomic_write(self.path, encoding="utf-8") as handle:
+            json.dump(self._watermarks, handle, indent=2)
+
+
+_WATERMARK_STORE: Optional[WatermarkStore] = None
+_WATERMARK_STORE_LOCK = threading.Lock()
+
+
+def get_watermark_store() -> WatermarkStore:
+    """Process-wide watermark store at Config.WATERMARK_STORE_PATH"""
+    global _WATERMARK_STORE
+    with _WATERMARK_STORE_LOCK:
+        if _WATERMARK_STORE is None:
+            _WATERMARK_STORE = WatermarkStore(Config.WATERMARK_STORE_PATH)
+        return _WATERMARK_STORE
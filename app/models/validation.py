@@ -3,8 +3,10 @@ Data validation and rule management models
 """
 
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Union
-from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Union, Iterator
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
 class RuleType(str, Enum):
@@ -54,8 +56,131 @@ class ValidationResult(BaseModel):
     error_details: Optional[Dict[str, Any]] = None
     validation_date: datetime = Field(default_factory=datetime.now)
 
+class ValidationFailureTable:
+    """Failure-only, array-backed validation results
+    
+    Each failure is one position in three parallel arrays (rule code, row
+    position, severity code). Rule metadata is stored once in ``rules`` and
+    ValidationResult models are only built when failures are paged through.
+    """
+    
+    SEVERITIES = list(ValidationSeverity)
+    
+    def __init__(self, rules: List[Dict[str, Any]], rule_codes: np.ndarray,
+                 row_positions: np.ndarray, index: pd.Index):
+        self.rules = rules
+        self.index = index
+        
+        # Keep failures ordered by record, then rule, like row-mode validation
+        order = np.lexsort((rule_codes, row_positions))
+        self.rule_codes = np.asarray(rule_codes, dtype=np.int16)[order]
+        self.row_positions = np.asarray(row_positions, dtype=np.int64)[order]
+        
+        rule_severities = np.array([self.SEVERITIES.index(ValidationSeverity(rule["severity"])) for rule in rules], dtype=np.int8)
+        self.severity_codes = rule_severities[self.rule_codes] if len(rules) else np.zeros(0, dtype=np.int8)
+    
+    @classmethod
+    def from_masks(cls, rules: List[Dict[str, Any]], masks: List[np.ndarray], index: pd.Index) -> "ValidationFailureTable":
+        """Build the table from one boolean failure mask per rule"""
+        positions = [np.flatnonzero(mask) for mask in masks]
+        codes = [np.full(len(rule_positions), code, dtype=np.int16) for code, rule_positions in enumerate(positions)]
+        return cls(
+            rules,
+            np.concatenate(codes) if codes else np.zeros(0, dtype=np.int16),
+            np.concatenate(positions) if positions else np.zeros(0, dtype=np.int64),
+            index
+        )
+    
+    @classmethod
+    def from_frame(cls, rules: List[Dict[str, Any]], failures: pd.DataFrame, index: pd.Index) -> "ValidationFailureTable":
+        """Rebuild a table saved with ``to_frame``"""
+        return cls(rules, failures["rule_code"].to_numpy(), failures["row_position"].to_numpy(), index)
+    
+    def to_frame(self) -> pd.DataFrame:
+        """The failure arrays as a two-column frame; ``rules`` and ``index`` are kept separately"""
+        return pd.DataFrame({"rule_code": self.rule_codes, "row_position": self.row_positions})
+    
+    def __len__(self) -> int:
+        return len(self.row_positions)
+    
+    def counts_by_rule(self) -> Dict[str, int]:
+        """Number of failures per rule name"""
+        counts = np.bincount(self.rule_codes, minlength=len(self.rules))
+        summary = {}
+        for rule, count in zip(self.rules, counts):
+            summary[rule["rule_name"]] = summary.get(rule["rule_name"], 0) + int(count)
+        return summary
+    
+    def counts_by_severity(self) -> Dict[str, int]:
+        """Number of failures per severity"""
+        counts = np.bincount(self.severity_codes, minlength=len(self.SEVERITIES))
+        return {severity.value: int(count) for severity, count in zip(self.SEVERITIES, counts) if count}
+    
+    def failed_row_count(self) -> int:
+        """Number of distinct records with at least one failure"""
+        return int(len(np.unique(self.row_positions)))
+    
+    def row_indices_for(self, rule_name: str) -> pd.Index:
+        """Index labels of the records failing a given rule"""
+        codes = [code for code, rule in enumerate(self.rules) if rule["rule_name"] == rule_name]
+        return self.index[np.sort(self.row_positions[np.isin(self.rule_codes, codes)])]
+    
+    def iter_failures(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[ValidationResult]:
+        """Lazily build ValidationResult models for a slice of the failures"""
+        stop = len(self) if limit is None else min(len(self), offset + limit)
+        for position in range(offset, stop):
+            rule = self.rules[self.rule_codes[position]]
+            yield ValidationResult(
+                rule_id=rule["rule_id"],
+                rule_name=rule["rule_name"],
+                field_name=rule["field_name"],
+                record_id=str(self.index[self.row_positions[position]]),
+                is_valid=False,
+                severity=rule["severity"],
+                message=rule["message"]
+            )
+    
+    def page(self, offset: int = 0, limit: int = 100, rule_name: Optional[str] = None) -> Dict[str, Any]:
+        """Return one page of failures as plain dicts"""
+        selection = np.arange(len(self))
+        if rule_name is not None:
+            codes = [code for code, rule in enumerate(self.rules) if rule["rule_name"] == rule_name]
+            selection = selection[np.isin(self.rule_codes, codes)]
+        
+        window = selection[offset:offset + limit]
+        failures = []
+        for position in window:
+            rule = self.rules[self.rule_codes[position]]
+            failures.append({
+                "rule_id": rule["rule_id"],
+                "rule_name": rule["rule_name"],
+                "field_name": rule["field_name"],
+                "record_id": str(self.index[self.row_positions[position]]),
+                "row_position": int(self.row_positions[position]),
+                "severity": self.SEVERITIES[self.severity_codes[position]].value
+            })
+        
+        return {
+            "total": int(len(selection)),
+            "offset": offset,
+            "limit": limit,
+            "failures": failures
+        }
+    
+    def summary(self, preview: int = 20) -> Dict[str, Any]:
+        """Compact JSON-safe summary with a first page of failures"""
+        return {
+            "total_failures": len(self),
+            "failed_records": self.failed_row_count(),
+            "failures_by_rule": self.counts_by_rule(),
+            "failures_by_severity": self.counts_by_severity(),
+            "preview": self.page(0, preview)["failures"]
+        }
+
 class BatchValidationResult(BaseModel):
     """Batch validation results"""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
     batch_id: str
     total_records: int
     valid_records: int
@@ -65,6 +190,7 @@ class BatchValidationResult(BaseModel):
     summary_by_rule: Dict[str, Dict[str, int]] = Field(default_factory=dict)
     processing_time_seconds: float
     validation_date: datetime = Field(default_factory=datetime.now)
+    failures: Optional[ValidationFailureTable] = Field(default=None, exclude=True)  # Columnar mode only
 
 class DataQualityMetrics(BaseModel):
     """Data quality metrics dashboard"""
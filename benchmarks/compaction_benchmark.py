@@ -0,0 +1,134 @@
+"""
+Regression check for dataset compaction: analytics output on compacted frames
+
+Registered dataset versions are compacted (categoricals, narrow numbers).
+The analytics endpoints run on them with numbers widened again and
+categoricals kept, minus unused vocabulary categories (expand_dataframe
+with keep_categoricals). This runs the trends, forecast, pattern and
+association analyses the endpoints run, on the frames an upload and
+/process produce and on those analysis frames, checks that the output is
+identical, and reports the memory saved and the time of each analysis.
+Analyses on the compacted frames as stored are listed too, to show why the
+unused categories are dropped.
+
+Usage: python -m benchmarks.compaction_benchmark [--rows 5000]
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from app.analytics.demand_forecaster import DemandForecaster
+from app.analytics.trend_analyzer import TrendAnalyzer
+from app.data_mining.association_analyzer import AssociationAnalyzer
+from app.data_mining.pattern_mining import PatternMiningEngine
+from app.data_processing.batch_processor import BatchDataProcessor
+from app.data_processing.compaction import compact_dataframe, expand_dataframe
+
+# Keys holding the time an analysis ran, which differs between any two runs
+VOLATILE_KEYS = {"analysis_date", "forecast_date", "creation_date", "recommendation_date", "detection_date",
+                 "last_training_date", "report_generated"}
+
+
+def make_upload(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic donor upload as read_csv parses it, using only some of the known blood types"""
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        "donor_id": rng.integers(0, rows // 2, rows),
+        "name": [f"donor{i % (rows // 3)}" for i in range(rows)],
+        "age": rng.integers(18, 66, rows),
+        "gender": rng.choice(["male", "female"], rows),
+        "blood_type": rng.choice(["A+", "O+", "B+", "O-"], rows),
+        "contact_number": [f"+1-555-{i % (rows // 3):07d}" for i in range(rows)],
+        "donation_date": (pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")).strftime("%Y-%m-%d"),
+        "volume_ml": rng.normal(450, 40, rows).round(0),
+        "hemoglobin_level": rng.normal(14, 1.5, rows).round(1),
+        "donation_type": rng.choice(["whole_blood", "platelets"], rows),
+        "location": rng.choice(["Harare", "Bulawayo", "Mutare"], rows)
+    })
+    data.loc[rng.random(rows) < 0.03, "hemoglobin_level"] = np.nan
+    return pd.read_csv(io.StringIO(data.to_csv(index=False)))
+
+
+def analyses() -> Dict[str, Callable[[pd.DataFrame], Any]]:
+    """The calls made by /analyze/trends, /analyze/forecast, /mine/patterns and /mine/associations"""
+    return {
+        "trends": lambda data: {key: value.dict() for key, value in
+                                TrendAnalyzer().analyze_donation_trends(data, time_granularity="monthly",
+                                                                        time_period_days=365).items()},
+        "forecast": lambda data: {key: value.dict() for key, value in
+                                  DemandForecaster().forecast_demand(data, forecast_horizon_days=14,
+                                                                     granularity="daily").items()},
+        "patterns": lambda data: PatternMiningEngine().discover_donor_patterns(data),
+        "associations": lambda data: AssociationAnalyzer().discover_association_rules(data, min_support=0.1,
+                                                                                      min_confidence=0.5)
+    }
+
+
+def normalized(run: Callable[[pd.DataFrame], Any], data: pd.DataFrame) -> str:
+    """An analysis result as canonical JSON without run times; failures compare by exception type"""
+    try:
+        result = run(data)
+    except Exception as e:
+        return f"error: {type(e).__name__}"
+    return json.dumps(_drop_volatile(result), default=str, sort_keys=True)
+
+
+def _drop_volatile(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        value = value.dict()
+    if isinstance(value, dict):
+        return {str(key): _drop_volatile(item) for key, item in value.items() if key not in VOLATILE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_drop_volatile(item) for item in value]
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    raw = make_upload(args.rows)
+    transformed, _ = asyncio.run(BatchDataProcessor()._process_dataset(raw.copy(), {"validation_mode": "columnar"}))
+    failed = []
+
+    for version, data in (("raw", raw), ("transformed", transformed)):
+        compacted, report = compact_dataframe(data)
+        dtypes = {column: change["from"] for column, change in report["columns"].items()}
+        pd.testing.assert_frame_equal(data, expand_dataframe(compacted, dtypes=dtypes))
+        analysis = expand_dataframe(compacted, dtypes=dtypes, keep_categoricals=True)
+        print(f"{version}: {len(data)} rows, {report['bytes_before'] / 1e6:.1f} MB -> {report['bytes_after'] / 1e6:.1f} MB "
+              f"({report['compression_ratio']}x), {len(report['columns'])} columns compacted, "
+              f"analysis frame {analysis.memory_usage(index=True, deep=True).sum() / 1e6:.1f} MB")
+
+        for name, run in analyses().items():
+            start = time.perf_counter()
+            expected = normalized(run, data.copy(deep=False))
+            original_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            same = normalized(run, analysis.copy(deep=False)) == expected
+            analysis_seconds = time.perf_counter() - start
+            stored_same = normalized(run, compacted.copy(deep=False)) == expected
+            print(f"  {name:<13} analysis frame {'identical' if same else 'DIFFERENT'}"
+                  f" ({original_seconds:.2f}s -> {analysis_seconds:.2f}s)"
+                  f"   as stored {'identical' if stored_same else 'different'}"
+                  f"{'   (' + expected + ')' if expected.startswith('error') else ''}")
+            if not same:
+                failed.append(f"{version}/{name}")
+
+    if failed:
+        raise SystemExit(f"Analytics output changed by compaction: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Regression check for limited incremental SQL loads: every row exactly once
+
+Fills an SQLite table whose watermark column (a date-only donation_date) has
+many rows per value, then runs limited incremental loads through
+SQLImporter.iter_chunks, passing each load's watermark to the next, until a
+load returns nothing. Checks that every id is imported exactly once, with a
+tie-breaking watermark_key and without one, and reports the number of loads
+and the time taken. Also runs the five-row case where a limit of 2 cuts
+through a group of equal dates.
+
+Usage: python -m benchmarks.incremental_benchmark [--rows 100000] [--limit 5000]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.data_processing.import_handlers import SQLImporter
+
+
+def make_table(path: str, rows: int, seed: int = 0) -> None:
+    """Donations with about 1% of the rows on each day, inserted in random order"""
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        "id": rng.permutation(rows) + 1,
+        "donation_date": (pd.Timestamp("2024-01-01")
+                          + pd.to_timedelta(rng.integers(0, 100, rows), unit="D")).strftime("%Y-%m-%d"),
+        "volume_ml": rng.normal(450, 40, rows).round(0)
+    })
+    with sqlite3.connect(path) as conn:
+        data.to_sql("donors", conn, index=False)
+
+
+def load_all(url: str, limit: int, watermark_key: Optional[str], chunksize: int = 1000) -> List[List[int]]:
+    """Ids returned by each limited incremental load, until a load returns no rows"""
+    loads = []
+    watermark: Optional[Dict[str, Any]] = None
+    while True:
+        importer = SQLImporter()
+        chunks = list(importer.iter_chunks(url, chunksize=chunksize, limit=limit, incremental=True,
+                                           watermark=watermark, watermark_column="donation_date",
+                                           watermark_key=watermark_key))
+        ids = [int(value) for chunk in chunks for value in chunk["id"]]
+        if not ids:
+            return loads
+        loads.append(ids)
+        watermark = importer.last_watermark
+
+
+def check(url: str, rows: int, limit: int, watermark_key: Optional[str]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    loads = load_all(url, limit, watermark_key)
+    elapsed = time.perf_counter() - start
+    ids = [value for load in loads for value in load]
+    assert len(ids) == len(set(ids)), f"rows imported twice with watermark_key={watermark_key}"
+    assert sorted(ids) == list(range(1, rows + 1)), \
+        f"{rows - len(set(ids))} rows never imported with watermark_key={watermark_key}"
+    return {"loads": len(loads), "largest_load": max(len(load) for load in loads), "seconds": elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        small = os.path.join(directory, "small.db")
+        with sqlite3.connect(small) as conn:
+            pd.DataFrame({"id": [1, 2, 3, 4, 5],
+                          "donation_date": ["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-02", "2024-01-03"]
+                          }).to_sql("donors", conn, index=False)
+        for watermark_key in ("id", None):
+            loads = load_all(f"sqlite:///{small}", 2, watermark_key)
+            print(f"5 rows, limit 2, watermark_key={watermark_key}: loads {loads}")
+            assert sorted(value for load in loads for value in load) == [1, 2, 3, 4, 5]
+
+        large = os.path.join(directory, "large.db")
+        make_table(large, args.rows)
+        for watermark_key in ("id", None):
+            result = check(f"sqlite:///{large}", args.rows, args.limit, watermark_key)
+            print(f"{args.rows} rows, limit {args.limit}, watermark_key={watermark_key}: "
+                  f"{result['loads']} loads (largest {result['largest_load']} rows) in {result['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
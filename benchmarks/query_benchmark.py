@@ -0,0 +1,146 @@
+"""
+Regression check for dataset queries: indexed lookups against full scans
+
+Runs random filter/sort combinations over a synthetic compacted donor
+dataset through query_dataframe, once with column indexes and once without,
+pages through every result with the returned cursors, and checks that both
+paths return the same rows in the same order and the same totals. The
+dataset is queried with naive and with tz-aware (Europe/Berlin) donation
+dates, filtered by dates with an offset, in UTC and naive. Reports the time
+each path took.
+
+Usage: python -m benchmarks.query_benchmark [--rows 50000] [--queries 200]
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.data_processing.compaction import compact_dataframe
+from app.data_processing.dataset_query import INDEXED_COLUMNS, DatasetIndexes, query_dataframe
+
+FILTER_COLUMNS = INDEXED_COLUMNS + ["age", "volume_ml", "gender"]
+OPERATORS = ["=", "!=", "<", "<=", ">", ">=", "in", "not in"]
+
+
+def make_sample(rows: int, seed: int = 0, tz: Optional[str] = None) -> pd.DataFrame:
+    """Compacted donor rows with nulls in every indexed column, as registered versions are stored"""
+    rng = np.random.default_rng(seed)
+    donation_dates = pd.Series(pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24, rows), unit="h"))
+    if tz is not None:
+        donation_dates = donation_dates.dt.tz_localize(tz, ambiguous=False, nonexistent="shift_forward")
+    data = pd.DataFrame({
+        "donor_id": rng.integers(0, rows // 4, rows),
+        "donation_date": donation_dates,
+        "blood_type": rng.choice(["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"], rows).astype(object),
+        "location": rng.choice(["Harare", "Bulawayo", "Mutare", "Gweru"], rows).astype(object),
+        "gender": rng.choice(["male", "female"], rows).astype(object),
+        "age": rng.integers(18, 66, rows),
+        "volume_ml": rng.normal(450, 40, rows).round(0)
+    })
+    for column in ("donation_date", "blood_type", "location", "volume_ml"):
+        data.loc[rng.random(rows) < 0.02, column] = None
+    data["donor_id"] = data["donor_id"].astype(float).where(rng.random(rows) >= 0.02)
+    return compact_dataframe(data)[0]
+
+
+def random_query(data: pd.DataFrame, rng: np.random.Generator) -> Tuple[List[Tuple[str, str, Any]], List[Tuple[str, bool]]]:
+    """One to three filters on values taken from the data (or null), and zero to two sort keys"""
+    filters = []
+    for column in rng.choice(FILTER_COLUMNS, rng.integers(1, 4), replace=False):
+        values = data[column].dropna().to_numpy()
+        operator = OPERATORS[rng.integers(len(OPERATORS))]
+        if operator in ("in", "not in"):
+            value = [_plain(item, rng) for item in rng.choice(values, rng.integers(1, 4))]
+        elif operator in ("=", "!=") and rng.random() < 0.1:
+            value = None
+        else:
+            value = _plain(values[rng.integers(len(values))], rng)
+        filters.append((column, operator, value))
+    sort = [(column, bool(rng.integers(2))) for column in rng.choice(FILTER_COLUMNS, rng.integers(0, 3), replace=False)]
+    return filters, sort
+
+
+def _plain(value: Any, rng: np.random.Generator) -> Any:
+    # Filter values arrive as JSON: strings, numbers and ISO dates with the column's offset, in UTC or naive
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        timestamp = pd.Timestamp(value)
+        form = rng.integers(3)
+        if timestamp.tzinfo is not None and form == 1:
+            timestamp = timestamp.tz_convert("UTC")
+        elif timestamp.tzinfo is not None and form == 2:
+            timestamp = timestamp.tz_localize(None)
+        return timestamp.isoformat()
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def run_query(data: pd.DataFrame, filters: List[Tuple[str, str, Any]], sort: List[Tuple[str, bool]],
+              indexes: Optional[DatasetIndexes], limit: int) -> Dict[str, Any]:
+    """Every page of a query, followed through next_cursor"""
+    rows = []
+    cursor = None
+    while True:
+        page = query_dataframe(data, filters=filters, sort=sort, limit=limit, cursor=cursor,
+                               indexes=indexes, index_key="sample" if indexes is not None else None)
+        rows.extend(page["rows"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return {"total": page["total"], "rows": rows}
+
+
+def check_time_zones() -> None:
+    """Dates with an offset, in UTC and naive select the same rows of a tz-aware column on both paths"""
+    data = pd.DataFrame({"donation_date": pd.to_datetime(["2024-01-01 00:30", "2024-01-01 00:50", "2024-01-01 02:00",
+                                                          "2024-01-02 00:00"]).tz_localize("Europe/Berlin")})
+    for value in ("2024-01-01 00:45+01:00", "2023-12-31 23:45+00:00", "2024-01-01 00:45"):
+        for operator, expected in ((">=", [1, 2, 3]), ("<", [0]), ("!=", [0, 1, 2, 3]), ("in", [])):
+            filters = [("donation_date", operator, [value] if operator == "in" else value)]
+            results = [run_query(data, filters, [], query_indexes, 10) for query_indexes in (DatasetIndexes(), None)]
+            positions = [data.index[data["donation_date"] == pd.Timestamp(row["donation_date"])][0]
+                         for row in results[1]["rows"]]
+            assert results[0] == results[1], f"indexed and scanned rows differ for {filters}"
+            assert positions == expected, f"{filters} selected rows {positions}, expected {expected}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    check_time_zones()
+    rng = np.random.default_rng(args.seed)
+    timings = {"indexed": 0.0, "scan": 0.0}
+    failed = []
+
+    for tz in (None, "Europe/Berlin"):
+        data = make_sample(args.rows, args.seed, tz)
+        indexes = DatasetIndexes()
+        for _ in range(args.queries // 2):
+            filters, sort = random_query(data, rng)
+            # Several pages at most, with cursors crossing page boundaries, or everything at once
+            limit = int(rng.choice([max(args.rows // 8, 1), args.rows]))
+            results = {}
+            for name, query_indexes in (("indexed", indexes), ("scan", None)):
+                start = time.perf_counter()
+                results[name] = run_query(data, filters, sort, query_indexes, limit)
+                timings[name] += time.perf_counter() - start
+            if results["indexed"] != results["scan"]:
+                failed.append((filters, sort))
+        print(f"indexes ({tz or 'naive dates'}): {indexes.summary()}")
+
+    print(f"{args.queries} queries over {args.rows} rows: "
+          f"indexed {timings['indexed']:.2f}s, scan {timings['scan']:.2f}s "
+          f"({timings['scan'] / timings['indexed']:.1f}x)")
+    if failed:
+        for filters, sort in failed[:5]:
+            print(f"  mismatch: filters={filters} sort={sort}")
+        raise SystemExit(f"{len(failed)} of {args.queries} queries returned different rows with indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,23 @@ export const api = axios.create({
   timeout: 5000 // 5 second timeout to prevent hanging
 })
 
-export async function uploadDataset(file) {
+export async function uploadDataset(file, { pollIntervalMs = 500 } = {}) {
   const form = new FormData()
   form.append('file', file)
   const res = await api.post('/api/v1/datasets/upload', form, {
     headers: { 'Content-Type': 'multipart/form-data' }
   })
-  return res.data
+
+  // The file is parsed in the background; wait until the dataset is ready
+  let info = await getDataset(res.data.dataset_id)
+  while (info.status === 'parsing') {
+    await new Promise(resolve => setTimeout(resolve, pollIntervalMs))
+    info = await getDataset(res.data.dataset_id)
+  }
+  if (info.status === 'failed') {
+    throw new Error(info.error || 'Failed to parse file')
+  }
+  return { ...res.data, ...info }
 }
 
 export async function getDataset(datasetId) {
@@ -19,11 +29,60 @@ export async function getDataset(datasetId) {
   return res.data
 }
 
+// Filter, sort and page a dataset on the server; pass the returned nextCursor back for the next page
+export async function queryDataset(datasetId, { version = null, columns = null, filters = [], sort = [], limit = 100, cursor = null } = {}) {
+  const res = await api.post(`/api/v1/datasets/${datasetId}/query`, {
+    version,
+    columns,
+    filters,
+    sort,
+    limit,
+    cursor
+  })
+  return { ...res.data, nextCursor: res.data.next_cursor }
+}
+
+const QUERY_OPERATORS = { eq: '=', ne: '!=', gt: '>', lt: '<', contains: 'contains' }
+
+// Query filters ({ column, op, value }) for the selections made in AdvancedFilters
+export function toQueryFilters(filters = {}) {
+  const query = []
+  if (filters.dateRange?.length === 2) {
+    query.push({ column: 'donation_date', op: '>=', value: filters.dateRange[0] })
+    query.push({ column: 'donation_date', op: '<=', value: filters.dateRange[1] })
+  }
+  if (filters.bloodTypes?.length) query.push({ column: 'blood_type', op: 'in', value: filters.bloodTypes })
+  if (filters.donationTypes?.length) query.push({ column: 'donation_type', op: 'in', value: filters.donationTypes })
+  if (filters.ageRange?.length === 2) {
+    query.push({ column: 'age', op: '>=', value: filters.ageRange[0] })
+    query.push({ column: 'age', op: '<=', value: filters.ageRange[1] })
+  }
+  if (filters.volumeRange?.length === 2) {
+    query.push({ column: 'volume_ml', op: '>=', value: filters.volumeRange[0] })
+    query.push({ column: 'volume_ml', op: '<=', value: filters.volumeRange[1] })
+  }
+  if (filters.gender && filters.gender !== 'all') query.push({ column: 'gender', op: '=', value: filters.gender })
+  if (filters.location) query.push({ column: 'location', op: 'contains', value: filters.location })
+  for (const custom of filters.customFilters ?? []) {
+    if (custom.field && QUERY_OPERATORS[custom.operator]) {
+      query.push({ column: custom.field, op: QUERY_OPERATORS[custom.operator], value: custom.value })
+    }
+  }
+  return query
+}
+
 export async function runProcessing(datasetId) {
   const res = await api.post('/api/v1/process', { dataset_id: datasetId })
   return res.data
 }
 
+export async function getValidationFailures(datasetId, { offset = 0, limit = 100, ruleName = null } = {}) {
+  const res = await api.get(`/api/v1/datasets/${datasetId}/validation/failures`, {
+    params: { offset, limit, rule_name: ruleName ?? undefined }
+  })
+  return res.data
+}
+
 export async function runTrends(datasetId, granularity = 'monthly', timePeriodDays = 365) {
   try {
     const res = await api.post('/api/v1/analyze/trends', {